@@ -0,0 +1,186 @@
+"""Fixtures for the ToDo Manager benchmarks."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import json
+import logging
+from pathlib import Path
+import platform
+import random
+from typing import Any
+import uuid
+
+import pytest
+
+from homeassistant.const import __version__ as HA_VERSION
+
+from custom_components.todo_manager.const import (
+    STORAGE_KEY_PERSONS,
+    STORAGE_KEY_TODOS,
+    STORAGE_MINOR_VERSION,
+    STORAGE_VERSION,
+)
+from custom_components.todo_manager.models import (
+    Person,
+    RecurrenceUnit,
+    RecurringRule,
+    Todo,
+    TodoItem,
+    TodoType,
+)
+from custom_components.todo_manager.store import SHARD_COUNT, shard_of
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = "100,1000,10000,50000"
+MANIFEST = Path(__file__).parent.parent / "custom_components/todo_manager/manifest.json"
+
+_RESULTS: dict[str, dict[str, Any]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    parser.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma separated store sizes to benchmark (default {DEFAULT_SIZES})",
+    )
+    parser.addoption(
+        "--bench-json",
+        default="benchmark-results.json",
+        help="File the results are written to",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run every benchmark for every store size."""
+    if "size" in metafunc.fixturenames:
+        sizes = [
+            int(size) for size in metafunc.config.getoption("bench_sizes").split(",")
+        ]
+        metafunc.parametrize("size", sizes)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Write the collected results as JSON."""
+    if not _RESULTS:
+        return
+    path = Path(session.config.getoption("bench_json"))
+    path.write_text(
+        json.dumps(
+            {
+                "integration_version": json.loads(MANIFEST.read_text())["version"],
+                "home_assistant": HA_VERSION,
+                "python": platform.python_version(),
+                "created": datetime.now().isoformat(),
+                "results": _RESULTS,
+            },
+            indent=2,
+        )
+    )
+    _LOGGER.info("Benchmark results written to %s", path)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def record(size: int):
+    """Return a function recording a result for the current store size."""
+
+    def _record(name: str, value: Any) -> None:
+        _RESULTS.setdefault(str(size), {})[name] = value
+
+    return _record
+
+
+def generate_store(size: int) -> tuple[dict[str, Todo], dict[str, Person]]:
+    """Generate a reproducible store with lists and recurring todos.
+
+    About a third of the todos are completed, every fifth one recurs and
+    shopping and packing lists carry 5 to 15 items.
+    """
+    rng = random.Random(size)
+    now = datetime.now().replace(second=0, microsecond=0)
+    persons = {
+        person.id: person
+        for person in (
+            Person(str(uuid.UUID(int=rng.getrandbits(128))), f"Person {index}")
+            for index in range(5)
+        )
+    }
+    person_ids = list(persons)
+
+    todos: dict[str, Todo] = {}
+    for index in range(size):
+        todo_type = rng.choice(list(TodoType))
+        due = now + timedelta(hours=rng.randint(-30 * 24, 60 * 24))
+        completed = rng.random() < 0.33
+        recurring = index % 5 == 0
+        todo = Todo(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            title=f"Todo {index}",
+            description="Synthetic benchmark todo" if index % 2 else "",
+            due_date=due.date() if rng.random() < 0.9 else None,
+            due_time=due.time(),
+            todo_type=todo_type,
+            persons=rng.sample(person_ids, rng.randint(0, 2)),
+            recurring=recurring,
+            recurring_rule=(
+                RecurringRule(rng.randint(1, 3), rng.choice(list(RecurrenceUnit)))
+                if recurring
+                else None
+            ),
+            completed=completed,
+            completed_date=(
+                now - timedelta(days=rng.randint(0, 20)) if completed else None
+            ),
+            items=[
+                TodoItem(str(uuid.UUID(int=rng.getrandbits(128))), f"Item {item}")
+                for item in range(rng.randint(5, 15))
+            ]
+            if todo_type in (TodoType.SHOPPING, TodoType.PACKING)
+            else [],
+            created_at=now - timedelta(days=60),
+            series_id=str(uuid.UUID(int=rng.getrandbits(128))) if recurring else None,
+        )
+        todos[todo.id] = todo
+    return todos, persons
+
+
+def stored_layout(
+    todos: dict[str, Todo], persons: dict[str, Person]
+) -> dict[str, dict[str, Any]]:
+    """Return hass_storage entries of the sharded layout."""
+    shards: list[dict[str, Any]] = [{} for _ in range(SHARD_COUNT)]
+    for todo_id, todo in todos.items():
+        shards[shard_of(todo_id)][todo_id] = todo.as_dict()
+
+    def entry(key: str, data: dict[str, Any], minor_version: int = 1) -> dict:
+        return {
+            "version": STORAGE_VERSION,
+            "minor_version": minor_version,
+            "key": key,
+            "data": data,
+        }
+
+    layout = {
+        "todo_manager_storage": entry(
+            "todo_manager_storage",
+            {
+                STORAGE_KEY_PERSONS: {
+                    person_id: person.as_dict()
+                    for person_id, person in persons.items()
+                }
+            },
+            STORAGE_MINOR_VERSION,
+        )
+    }
+    for index, shard in enumerate(shards):
+        key = f"todo_manager_storage_shard_{index:02d}"
+        layout[key] = entry(key, {STORAGE_KEY_TODOS: shard})
+    return layout
@@ -0,0 +1,295 @@
+"""Benchmarks for ToDo Manager.
+
+Every benchmark runs against synthetic stores of each size given with
+--bench-sizes and records its results, which are written as JSON when the
+session ends. Compare the files of two versions to spot regressions.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import random
+import statistics
+import time
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from custom_components.todo_manager.const import CHANGE_UPDATED, DOMAIN
+from custom_components.todo_manager.coordinator import TodoCoordinator
+from custom_components.todo_manager.models import TodoType
+
+from conftest import generate_store, stored_layout
+
+SAMPLES = 50
+# Write every mutation right away and keep the hot set as generated
+OPTIONS = {"save_delay": 0, "archive_after_days": 0}
+
+
+def _stats(samples: list[float]) -> dict[str, Any]:
+    """Summarize durations in seconds as milliseconds."""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "samples": len(samples_ms),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "p95_ms": round(samples_ms[int(0.95 * (len(samples_ms) - 1))], 3),
+        "max_ms": round(samples_ms[-1], 3),
+    }
+
+
+async def _measure(
+    func: Callable[[], Awaitable[Any]], samples: int = SAMPLES
+) -> dict[str, Any]:
+    """Time an async function several times."""
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - start)
+    return _stats(durations)
+
+
+async def _setup(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int
+) -> tuple[TodoCoordinator, float]:
+    """Set up the integration with a synthetic store and wait for the todos."""
+    hass_storage.update(stored_layout(*generate_store(size)))
+    entry = MockConfigEntry(domain=DOMAIN, title="ToDo Manager", options=OPTIONS)
+    entry.add_to_hass(hass)
+    start = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator: TodoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_wait_hydrated()
+    await hass.async_block_till_done()
+    return coordinator, time.perf_counter() - start
+
+
+def _written_bytes(hass_storage: dict[str, Any], before: dict[str, int]) -> int:
+    """Return the bytes of all stores written since the snapshot."""
+    return sum(
+        len(json_bytes(value["data"]))
+        for key, value in hass_storage.items()
+        if before.get(key) != id(value)
+    )
+
+
+def _snapshot(hass_storage: dict[str, Any]) -> dict[str, int]:
+    """Remember which store versions exist."""
+    return {key: id(value) for key, value in hass_storage.items()}
+
+
+async def test_setup(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark loading the store and setting up the entities.
+
+    setup_ms is the time until the entry is set up and the summary sensors
+    exist, hydrated_ms the time until all todos are loaded.
+    """
+    coordinator, duration = await _setup(hass, hass_storage, size)
+    # Due recurrences are spawned by the first refresh
+    assert len(coordinator.todos) >= size
+    record("setup_ms", coordinator.startup_timings["setup"])
+    record("hydrated_ms", round(duration * 1000, 3))
+
+
+async def test_create_todo(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark the create_todo service."""
+    await _setup(hass, hass_storage, size)
+    counter = iter(range(SAMPLES))
+
+    async def create() -> None:
+        await hass.services.async_call(
+            DOMAIN,
+            "create_todo",
+            {"title": f"Benchmark {next(counter)}", "due_date": "2030-01-01"},
+            blocking=True,
+        )
+
+    record("create_todo", await _measure(create))
+
+
+async def test_toggle_item(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark the toggle_item service."""
+    coordinator, _ = await _setup(hass, hass_storage, size)
+    rng = random.Random(size)
+    lists = [
+        todo
+        for todo in coordinator.todos.values()
+        if todo.todo_type in (TodoType.SHOPPING, TodoType.PACKING) and todo.items
+    ]
+
+    async def toggle() -> None:
+        todo = rng.choice(lists)
+        await hass.services.async_call(
+            DOMAIN,
+            "toggle_item",
+            {"todo_id": todo.id, "item_id": rng.choice(todo.items).id},
+            blocking=True,
+        )
+
+    record("toggle_item", await _measure(toggle))
+
+
+async def test_save(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark async_save_data after one change and after changing all."""
+    coordinator, _ = await _setup(hass, hass_storage, size)
+    todo_id = next(iter(coordinator.todos))
+
+    before = _snapshot(hass_storage)
+    coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
+    start = time.perf_counter()
+    await coordinator.async_save_data()
+    record(
+        "save_one",
+        {
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "bytes": _written_bytes(hass_storage, before),
+        },
+    )
+
+    before = _snapshot(hass_storage)
+    for todo_id in list(coordinator.todos):
+        coordinator.store.async_mark_todo_dirty(todo_id)
+    start = time.perf_counter()
+    await coordinator.async_save_data()
+    record(
+        "save_all",
+        {
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "bytes": _written_bytes(hass_storage, before),
+        },
+    )
+
+
+async def test_check_recurring_todos(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark spawning due recurrences and the check without work."""
+    coordinator, _ = await _setup(hass, hass_storage, size)
+    # Make every pending recurrence due
+    pending = len(coordinator._pending_recurrences)
+    for todo_id in coordinator._pending_recurrences:
+        todo = coordinator.todos[todo_id]
+        todo.completed_date -= timedelta(days=120)
+    todo_count = len(coordinator.todos)
+
+    start = time.perf_counter()
+    await coordinator.async_check_recurring_todos()
+    spawn_ms = (time.perf_counter() - start) * 1000
+
+    record(
+        "check_recurring_todos",
+        {
+            "pending": pending,
+            "spawned": len(coordinator.todos) - todo_count,
+            "spawn_ms": round(spawn_ms, 3),
+            "idle": await _measure(coordinator.async_check_recurring_todos),
+        },
+    )
+
+
+async def test_get_todos(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark getting all todos in urgency order."""
+    coordinator, _ = await _setup(hass, hass_storage, size)
+
+    async def get_all() -> None:
+        coordinator.get_todos()
+
+    async def get_open() -> None:
+        coordinator.get_todos(filter_completed=True)
+
+    record("get_todos", await _measure(get_all, 20))
+    record("get_todos_open", await _measure(get_open, 20))
+
+
+async def test_sensor_attributes(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark the serialized size of the summary sensor attributes."""
+    await _setup(hass, hass_storage, size)
+    record(
+        "sensor_attribute_bytes",
+        {
+            entity_id: len(json_bytes(dict(state.attributes)))
+            for entity_id in (
+                "sensor.todo_manager_all",
+                "sensor.todo_manager_active",
+                "sensor.todo_manager_overdue",
+            )
+            if (state := hass.states.get(entity_id))
+        },
+    )
+
+
+async def test_idle_refresh(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark a refresh without changes and the state writes it causes."""
+    coordinator, _ = await _setup(hass, hass_storage, size)
+    changed: list[str] = []
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, lambda event: changed.append(event.data["entity_id"])
+    )
+
+    async def refresh() -> None:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    timings = await _measure(refresh, 20)
+    record(
+        "idle_refresh",
+        {
+            **timings,
+            # The performance sensor reports the refresh itself
+            "state_changes": len(
+                [entity_id for entity_id in changed if not entity_id.endswith("_performance")]
+            ),
+        },
+    )
+
+
+async def test_calendar_events(
+    hass: HomeAssistant, hass_storage: dict[str, Any], size: int, record
+) -> None:
+    """Benchmark the events of a month view of the calendar.
+
+    index is the time the coordinator takes to find the due todos and
+    occurrences, the rest goes into building the events.
+    """
+    coordinator, _ = await _setup(hass, hass_storage, size)
+    entity = hass.data["calendar"].get_entity("calendar.todo_manager")
+    start = dt_util.start_of_local_day()
+    end = start + timedelta(days=31)
+    local_start = start.replace(tzinfo=None)
+    local_end = end.replace(tzinfo=None)
+    events: list[Any] = []
+
+    async def get_events() -> None:
+        events[:] = await entity.async_get_events(hass, start, end)
+
+    async def find_todos() -> None:
+        coordinator.get_due_between(local_start, local_end)
+        coordinator.get_future_occurrences(local_start, local_end)
+
+    record(
+        "calendar_events",
+        {
+            **await _measure(get_events, 20),
+            "events": len(events),
+            "index": await _measure(find_todos, 20),
+        },
+    )
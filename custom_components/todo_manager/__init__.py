@@ -1,55 +1,153 @@
 """The ToDo Manager integration."""
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 import logging
+from time import perf_counter
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import storage
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN, DATA_STORAGE, STORAGE_VERSION
+from .archive import TodoArchive
+from .const import (
+    CONF_ARCHIVE_AFTER_DAYS,
+    CONF_ARCHIVE_RETENTION_DAYS,
+    CONF_JOURNAL,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_KEY,
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_ARCHIVE_RETENTION_DAYS,
+    DEFAULT_JOURNAL,
+    DEFAULT_SAVE_DELAY,
+    DOMAIN,
+    STORAGE_VERSION,
+)
 from .coordinator import TodoCoordinator
+from .store import ShardedTodoStore
 from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+ARCHIVE_INTERVAL = timedelta(hours=6)
+PLATFORMS = [Platform.CALENDAR, Platform.SENSOR, Platform.TODO]
+
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the ToDo Manager component."""
     hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
+    # Shared by all config entries, calls are routed by entry id
+    await async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ToDo Manager from a config entry."""
-    
+    start = perf_counter()
+    # Every entry has its own files, the first one keeps the original keys
+    key = entry.data.get(CONF_STORAGE_KEY, DOMAIN)
+
     # Initialize storage
-    store = storage.Store(hass, STORAGE_VERSION, f"{DOMAIN}_storage")
-    hass.data[DOMAIN][DATA_STORAGE] = store
-    
+    store = ShardedTodoStore(
+        hass,
+        f"{key}_storage",
+        entry.options.get(CONF_JOURNAL, DEFAULT_JOURNAL),
+    )
+    save_delay = entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+
+    # Completed todos move to a separate store that is loaded on demand
+    archive = TodoArchive(
+        storage.Store(hass, STORAGE_VERSION, f"{key}_archive"),
+        entry.options.get(
+            CONF_ARCHIVE_RETENTION_DAYS, DEFAULT_ARCHIVE_RETENTION_DAYS
+        ),
+        save_delay,
+    )
+
     # Initialize coordinator
-    coordinator = TodoCoordinator(hass, store)
+    coordinator = TodoCoordinator(
+        hass,
+        store,
+        archive,
+        save_delay,
+        entry.options.get(CONF_ARCHIVE_AFTER_DAYS, DEFAULT_ARCHIVE_AFTER_DAYS),
+        name=entry.title,
+        key=key,
+    )
     hass.data[DOMAIN][entry.entry_id] = coordinator
-    
-    # Load data
-    await coordinator.async_load_data()
-    
+
+    # Only the summary is loaded before the platforms are set up, the todos
+    # follow in the background. Calls arriving meanwhile wait for them.
+    await coordinator.async_load_summary()
+
     # Setup entities
     await coordinator.async_setup_entities()
-    
-    # Setup services
-    await async_setup_services(hass)
-    
+
+    # Archive old completed todos now and from time to time
+    async def _async_archive(now: datetime | None = None) -> None:
+        try:
+            await coordinator.async_wait_hydrated()
+        except HomeAssistantError:
+            # Already logged when loading failed
+            return
+        await coordinator.async_archive_completed()
+
+    entry.async_create_background_task(
+        hass, _async_archive(), f"{DOMAIN} archive completed todos"
+    )
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_archive, ARCHIVE_INTERVAL)
+    )
+
+    # Write pending changes before Home Assistant shuts down
+    async def _async_flush_on_stop(event: Event) -> None:
+        await coordinator.async_flush()
+        await coordinator.archive.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     # Forward entry setup
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
-    
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.startup_timings["setup"] = round((perf_counter() - start) * 1000, 1)
+    entry.async_create_background_task(
+        hass, coordinator.async_hydrate(), f"{DOMAIN} load todos"
+    )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: TodoCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        await coordinator.async_flush()
+        await coordinator.archive.async_flush()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the files of a removed config entry.
+
+    The first entry keeps its files, so adding the integration again brings
+    its todos back as before.
+    """
+    if (key := entry.data.get(CONF_STORAGE_KEY)) is None:
+        return
+    await ShardedTodoStore(hass, f"{key}_storage").async_remove()
+    await storage.Store(hass, STORAGE_VERSION, f"{key}_archive").async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
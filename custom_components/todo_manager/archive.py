@@ -0,0 +1,126 @@
+"""Archive for completed todos of ToDo Manager."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers import storage
+
+from .const import STORAGE_KEY_TODOS
+from .models import local_now, parse_datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _completed_before(todo: dict[str, Any], cutoff: datetime | date) -> bool:
+    """Return if a todo was completed before the cutoff."""
+    completed_dt = parse_datetime(todo.get("completed_date"))
+    if completed_dt is None:
+        return False
+    if isinstance(cutoff, datetime):
+        return completed_dt < cutoff
+    return completed_dt.date() < cutoff
+
+
+class TodoArchive:
+    """Cold storage for completed todos.
+
+    The archive lives in its own store and is only loaded when todos are
+    archived, purged or queried, so it never slows down startup or the
+    saves of the active todos.
+    """
+
+    def __init__(
+        self, store: storage.Store, retention_days: int, save_delay: int
+    ) -> None:
+        """Initialize the archive."""
+        self.store = store
+        self.retention_days = retention_days
+        self.save_delay = save_delay
+        self._todos: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+        self._dirty = False
+
+    @property
+    def loaded(self) -> bool:
+        """Return if the archive has been loaded."""
+        return self._todos is not None
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        """Load the archived todos on first use."""
+        async with self._load_lock:
+            if self._todos is None:
+                data = await self.store.async_load() or {}
+                self._todos = data.get(STORAGE_KEY_TODOS, {})
+        return self._todos
+
+    @callback
+    def async_add(self, todos: list[dict[str, Any]]) -> None:
+        """Archive todos and apply the retention limit.
+
+        The archive must have been loaded before.
+        """
+        assert self._todos is not None
+        for todo in todos:
+            self._todos[todo["id"]] = todo
+        if self.retention_days > 0:
+            self._remove_completed_before(
+                local_now() - timedelta(days=self.retention_days)
+            )
+        self._async_schedule_save()
+
+    async def async_purge(self, before: date | None = None) -> int:
+        """Remove archived todos completed before a date, or all of them."""
+        archived = await self.async_load()
+        if before is None:
+            count = len(archived)
+            archived.clear()
+        else:
+            count = self._remove_completed_before(before)
+        if count:
+            self._async_schedule_save()
+        return count
+
+    async def async_query(
+        self, start: int, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Return a page of archived todos, latest completed first."""
+        archived = await self.async_load()
+        todos = sorted(
+            archived.values(),
+            key=lambda todo: todo.get("completed_date") or "",
+            reverse=True,
+        )
+        return todos[start : start + limit], len(todos)
+
+    async def async_flush(self) -> None:
+        """Write pending changes immediately."""
+        if self._dirty:
+            await self.store.async_save(self._data_to_save())
+
+    def _remove_completed_before(self, cutoff: datetime | date) -> int:
+        """Drop archived todos completed before the cutoff."""
+        assert self._todos is not None
+        expired = [
+            todo_id
+            for todo_id, todo in self._todos.items()
+            if _completed_before(todo, cutoff)
+        ]
+        for todo_id in expired:
+            del self._todos[todo_id]
+        return len(expired)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule writing the archive."""
+        self._dirty = True
+        self.store.async_delay_save(self._data_to_save, self.save_delay)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        self._dirty = False
+        return {STORAGE_KEY_TODOS: self._todos or {}}
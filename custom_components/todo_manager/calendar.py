@@ -0,0 +1,123 @@
+"""Calendar platform for ToDo Manager."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+from operator import itemgetter
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import TodoCoordinator
+from .models import END_OF_DAY, Todo, local_now
+
+_LOGGER = logging.getLogger(__name__)
+
+# Length of the event of a todo due at a time of day
+EVENT_DURATION = timedelta(minutes=30)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the ToDo Manager calendar once the todos are loaded."""
+    coordinator: TodoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_on_hydrated(
+        lambda: async_add_entities([TodoManagerCalendar(coordinator)])
+    )
+
+
+def _span(due: datetime, todo: Todo) -> tuple[datetime, datetime]:
+    """Return the local start and end of the event of a todo."""
+    if todo.due_time == END_OF_DAY:
+        start = datetime.combine(due.date(), time())
+        return start, start + timedelta(days=1)
+    return due, due + EVENT_DURATION
+
+
+def _event(due: datetime, todo: Todo, occurrence: bool = False) -> CalendarEvent:
+    """Return the event of a todo due at a local time.
+
+    Todos due at the end of the day are all-day events. Future occurrences
+    of recurring todos share the uid of the todo they follow.
+    """
+    if todo.due_time == END_OF_DAY:
+        start: datetime | date = due.date()
+        end: datetime | date = start + timedelta(days=1)
+    else:
+        start = due.replace(tzinfo=dt_util.get_default_time_zone())
+        end = start + EVENT_DURATION
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=todo.title,
+        description=todo.description or None,
+        uid=todo.id,
+        recurrence_id=due.date().isoformat() if occurrence else None,
+    )
+
+
+class TodoManagerCalendar(CoordinatorEntity, CalendarEntity):
+    """The due dates of all todos.
+
+    Range queries bisect the due indexes of the coordinator and compute the
+    occurrences of recurring todos only within the range.
+    """
+
+    _attr_icon = "mdi:calendar-check"
+
+    def __init__(self, coordinator: TodoCoordinator) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._attr_name = coordinator.name
+        self._attr_unique_id = f"{coordinator.key}_calendar"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next event of an open todo."""
+        now = local_now()
+        next_due = self.coordinator.get_next_due() or now
+        for due, todo in self.coordinator.get_due_between(
+            now - timedelta(days=1), next_due + timedelta(days=1), completed=False
+        ):
+            if _span(due, todo)[1] > now:
+                return _event(due, todo)
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the events of the todos and future occurrences in a range.
+
+        Events are only built for the todos overlapping the range, building
+        and validating them costs more than finding the todos.
+        """
+        with self.coordinator.stats.measure("calendar_events"):
+            start = dt_util.as_local(start_date).replace(tzinfo=None)
+            end = dt_util.as_local(end_date).replace(tzinfo=None)
+            # All-day events are indexed at the end of their day
+            query = (start - EVENT_DURATION, end + timedelta(days=1))
+            candidates = [
+                (due, todo, False)
+                for due, todo in self.coordinator.get_due_between(*query)
+            ]
+            candidates.extend(
+                (due, todo, True)
+                for due, todo in self.coordinator.get_future_occurrences(*query)
+            )
+            in_range = []
+            for due, todo, occurrence in candidates:
+                event_start, event_end = _span(due, todo)
+                if event_start < end and event_end > start:
+                    in_range.append((event_start, due, todo, occurrence))
+            in_range.sort(key=itemgetter(0))
+            return [
+                _event(due, todo, occurrence) for _, due, todo, occurrence in in_range
+            ]
@@ -3,25 +3,50 @@ from __future__ import annotations
 
 import logging
 from typing import Any
+import uuid
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_ARCHIVE_AFTER_DAYS,
+    CONF_ARCHIVE_RETENTION_DAYS,
+    CONF_ATTRIBUTE_BUDGET,
+    CONF_JOURNAL,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_KEY,
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_ARCHIVE_RETENTION_DAYS,
+    DEFAULT_ATTRIBUTE_BUDGET,
+    DEFAULT_JOURNAL,
+    DEFAULT_SAVE_DELAY,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema({})
+DEFAULT_NAME = "ToDo Manager"
+
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string}
+)
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    # No validation needed for this integration
-    return {"title": "ToDo Manager"}
+    title = data.get(CONF_NAME, DEFAULT_NAME)
+    # Lists are told apart by name in the UI and in entity names
+    if any(
+        entry.title == title for entry in hass.config_entries.async_entries(DOMAIN)
+    ):
+        raise NameExists
+    return {"title": title}
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -29,13 +54,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         if user_input is None:
             return self.async_show_form(
                 step_id="user", data_schema=STEP_USER_DATA_SCHEMA
@@ -47,17 +77,78 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             info = await validate_input(self.hass, user_input)
         except CannotConnect:
             errors["base"] = "cannot_connect"
+        except NameExists:
+            errors["base"] = "name_exists"
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
 
         if not errors:
-            return self.async_create_entry(title=info["title"], data=user_input)
+            data = dict(user_input)
+            # Further lists get files of their own, the first one keeps
+            # the original storage keys
+            if self._async_current_entries():
+                data[CONF_STORAGE_KEY] = f"{DOMAIN}_{uuid.uuid4().hex}"
+            return self.async_create_entry(title=info["title"], data=data)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle ToDo Manager options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SAVE_DELAY,
+                        default=self.config_entry.options.get(
+                            CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                    vol.Optional(
+                        CONF_ARCHIVE_AFTER_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_ARCHIVE_AFTER_DAYS, DEFAULT_ARCHIVE_AFTER_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+                    vol.Optional(
+                        CONF_ARCHIVE_RETENTION_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_ARCHIVE_RETENTION_DAYS,
+                            DEFAULT_ARCHIVE_RETENTION_DAYS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=36500)),
+                    vol.Optional(
+                        CONF_JOURNAL,
+                        default=self.config_entry.options.get(
+                            CONF_JOURNAL, DEFAULT_JOURNAL
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ATTRIBUTE_BUDGET,
+                        default=self.config_entry.options.get(
+                            CONF_ATTRIBUTE_BUDGET, DEFAULT_ATTRIBUTE_BUDGET
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1048576)),
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
+
+
+class NameExists(HomeAssistantError):
+    """Error to indicate another entry has the same name."""
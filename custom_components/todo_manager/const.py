@@ -2,7 +2,6 @@
 
 DOMAIN = "todo_manager"
 DATA_COORDINATOR = "coordinator"
-DATA_STORAGE = "storage"
 
 # Service names
 SERVICE_CREATE_TODO = "create_todo"
@@ -13,6 +12,16 @@ SERVICE_TOGGLE_ITEM = "toggle_item"
 SERVICE_CREATE_PERSON = "create_person"
 SERVICE_UPDATE_PERSON = "update_person"
 SERVICE_DELETE_PERSON = "delete_person"
+SERVICE_BULK_CREATE_TODOS = "bulk_create_todos"
+SERVICE_BULK_UPDATE_TODOS = "bulk_update_todos"
+SERVICE_BULK_COMPLETE_TODOS = "bulk_complete_todos"
+SERVICE_BULK_DELETE_TODOS = "bulk_delete_todos"
+SERVICE_DELETE_COMPLETED_TODOS = "delete_completed_todos"
+SERVICE_PURGE_ARCHIVE = "purge_archive"
+SERVICE_SEARCH = "search"
+SERVICE_QUERY_TODOS = "query_todos"
+SERVICE_IMPORT_TODOS = "import_todos"
+SERVICE_EXPORT_TODOS = "export_todos"
 
 # ToDo types
 TODO_TYPE_SIMPLE = "simple"
@@ -20,13 +29,62 @@ TODO_TYPE_COMPLEX = "complex"
 TODO_TYPE_SHOPPING = "shopping"
 TODO_TYPE_PACKING = "packing"
 
+# Sort orders of queries
+SORT_URGENCY = "urgency"
+SORT_DUE_DATE = "due_date"
+SORT_TITLE = "title"
+SORT_CREATED_AT = "created_at"
+
 # Storage keys
 STORAGE_KEY_TODOS = "todos"
 STORAGE_KEY_PERSONS = "persons"
+STORAGE_KEY_REVISION = "revision"
+STORAGE_KEY_SUMMARY = "summary"
 STORAGE_VERSION = 1
+STORAGE_MINOR_VERSION = 3
+
+# Events
+EVENT_TODO_DUE = f"{DOMAIN}_due"
+EVENT_TODO_OVERDUE = f"{DOMAIN}_overdue"
+
+# Change notifications
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+CHANGE_DELETED = "deleted"
+
+# Config entry data, prefix of the storage keys and unique ids of entries
+# added next to the first one
+CONF_STORAGE_KEY = "storage_key"
+
+# Options
+CONF_SAVE_DELAY = "save_delay"
+CONF_ARCHIVE_AFTER_DAYS = "archive_after_days"
+CONF_ARCHIVE_RETENTION_DAYS = "archive_retention_days"
+CONF_JOURNAL = "journal"
+CONF_ATTRIBUTE_BUDGET = "attribute_budget"
 
 # Attributes
+ATTR_ENTRY_ID = "entry_id"
 ATTR_TODO_ID = "todo_id"
+ATTR_TODO_IDS = "todo_ids"
+ATTR_TODOS = "todos"
+ATTR_BEFORE = "before"
+ATTR_PURGED = "purged"
+ATTR_FILE = "file"
+ATTR_OVERWRITE = "overwrite"
+ATTR_INCLUDE_ARCHIVE = "include_archive"
+ATTR_IMPORTED = "imported"
+ATTR_EXPORTED = "exported"
+ATTR_REJECTED = "rejected"
+ATTR_REJECTED_ROWS = "rejected_rows"
+ATTR_QUERY = "query"
+ATTR_LIMIT = "limit"
+ATTR_CURSOR = "cursor"
+ATTR_SORT = "sort"
+ATTR_OVERDUE = "overdue"
+ATTR_DUE_AFTER = "due_after"
+ATTR_DUE_BEFORE = "due_before"
+ATTR_OPEN_ITEMS = "open_items"
 ATTR_TITLE = "title"
 ATTR_DESCRIPTION = "description"
 ATTR_DUE_DATE = "due_date"
@@ -43,6 +101,7 @@ ATTR_ITEM_ID = "item_id"
 ATTR_ITEM_NAME = "item_name"
 ATTR_ITEM_QUANTITY = "item_quantity"
 ATTR_ITEM_CHECKED = "item_checked"
+ATTR_EXPECTED_REVISION = "expected_revision"
 ATTR_PERSON_ID = "person_id"
 ATTR_PERSON_NAME = "person_name"
 ATTR_PERSON_COLOR = "person_color"
@@ -50,3 +109,9 @@ ATTR_PERSON_COLOR = "person_color"
 # Default values
 DEFAULT_TODO_TYPE = TODO_TYPE_SIMPLE
 DEFAULT_RECURRING = False
+DEFAULT_SAVE_DELAY = 2  # Seconds to coalesce writes, 0 writes immediately
+DEFAULT_ARCHIVE_AFTER_DAYS = 30  # 0 keeps completed todos active forever
+DEFAULT_ARCHIVE_RETENTION_DAYS = 365  # 0 keeps archived todos forever
+DEFAULT_JOURNAL = False
+# Recorder skips attributes above 16 KiB, 0 lists all todos
+DEFAULT_ATTRIBUTE_BUDGET = 16384
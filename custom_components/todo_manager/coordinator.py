@@ -1,42 +1,206 @@
 """Data coordinator for ToDo Manager."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+from itertools import chain, islice
+from operator import itemgetter
+from time import perf_counter
 from typing import Any
 import uuid
 
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import storage
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
 from .const import (
+    CHANGE_CREATED,
+    CHANGE_DELETED,
+    CHANGE_UPDATED,
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_SAVE_DELAY,
     DOMAIN,
+    SORT_CREATED_AT,
+    SORT_DUE_DATE,
+    SORT_TITLE,
+    SORT_URGENCY,
     STORAGE_KEY_TODOS,
     STORAGE_KEY_PERSONS,
+    STORAGE_KEY_REVISION,
+    STORAGE_KEY_SUMMARY,
     STORAGE_VERSION,
     TODO_TYPE_SIMPLE,
 )
+from .archive import TodoArchive
+from .models import Person, Todo, local_now
+from .recurrence import calculate_next_due, iter_due_dates
+from .scheduler import DueScheduler
+from .search import SearchIndex
+from .stats import OperationStats
+from .store import ShardedTodoStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Beyond these a due date scores lower than having no due date at all
+# (0.5) or than a completed todo (0.0)
+UNDATED_HORIZON = timedelta(hours=9.5 * 168)
+COMPLETED_HORIZON = timedelta(hours=10 * 168)
+
+
+def _remove_sorted(
+    index: list[tuple[datetime, str]], entry: tuple[datetime, str]
+) -> None:
+    """Remove an entry from a sorted index if it is there."""
+    position = bisect_left(index, entry)
+    if index[position : position + 1] == [entry]:
+        del index[position]
+
 
 class TodoCoordinator(DataUpdateCoordinator):
     """Class to manage ToDo data."""
 
-    def __init__(self, hass: HomeAssistant, store: storage.Store) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: ShardedTodoStore,
+        archive: TodoArchive,
+        save_delay: int = DEFAULT_SAVE_DELAY,
+        archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+        name: str = DOMAIN,
+        key: str = DOMAIN,
+    ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=60),  # Update every minute
+            name=name,
+            # Due times are tracked by the scheduler, no polling needed
+            update_interval=None,
         )
         self.store = store
-        self.todos: dict[str, dict[str, Any]] = {}
-        self.persons: dict[str, dict[str, Any]] = {}
+        self.archive = archive
+        # Prefix of the unique ids of the entities of the config entry
+        self.key = key
+        self.archive_after_days = archive_after_days
+        self.todos: dict[str, Todo] = {}
+        self.persons: dict[str, Person] = {}
         self._entity_registry = None
+        self.save_delay = save_delay
+        self.last_flush_mutations = 0
+        self._pending_mutations = 0
+        self.revision = 0
+        # Counts of the last save, shown until the todos are loaded
+        self.summary: dict[str, Any] | None = None
+        self.hydrated = False
+        self._hydration_done = asyncio.Event()
+        self.hydration_error: Exception | None = None
+        self._hydrated_actions: list[Callable[[], None]] = []
+        # Durations of the startup steps in milliseconds
+        self.startup_timings: dict[str, float] = {}
+        # Recurring series: (series id, due date) -> occurrence todo id
+        self._occurrences: dict[tuple[str, date], str] = {}
+        self._indexed_occurrences: dict[str, tuple[str, date]] = {}
+        # Completed recurring todos whose next occurrence wasn't created yet
+        self._pending_recurrences: set[str] = set()
+        # Open recurring todos with a due date. A series usually has one,
+        # but older occurrences may have been opened again
+        self._open_recurrences: dict[str, None] = {}
+        # Parsed due datetimes and urgency order of open todos
+        self._due: dict[str, datetime | None] = {}
+        self._due_index: list[tuple[datetime, str]] = []
+        # Insertion ordered sets of undated open and of completed todos
+        self._undated: dict[str, None] = {}
+        self._completed: dict[str, None] = {}
+        # Person id -> ids of the todos assigned to them
+        self._person_todos: dict[str, dict[str, None]] = {}
+        self._indexed_persons: dict[str, tuple[str, ...]] = {}
+        # Todos per type and the number of open todos per type
+        self._type_todos: dict[str, dict[str, None]] = {}
+        self._open_types: dict[str, int] = {}
+        self._indexed_types: dict[str, str] = {}
+        # Due order of completed todos, for queries on due ranges
+        self._completed_due_index: list[tuple[datetime, str]] = []
+        # Tokens of titles, descriptions, results and item names
+        self.search_index = SearchIndex()
+        self.scheduler = DueScheduler(hass, self)
+        self.stats = OperationStats()
+        self._change_listeners: list[
+            Callable[[int, str, str | None, str | None], None]
+        ] = []
+
+    async def async_load_summary(self) -> None:
+        """Load the counts written with the last save.
+
+        They take a few bytes, so sensors can show them right at startup
+        while async_hydrate loads the todos in the background.
+        """
+        self.summary = await self.store.async_load_summary()
+        if self.summary:
+            self.revision = self.summary.get(STORAGE_KEY_REVISION, 0)
+
+    async def async_hydrate(self) -> None:
+        """Load the todos, then run the actions waiting for them.
+
+        If loading fails, the error is logged and the calls waiting for the
+        todos fail instead of waiting forever.
+        """
+        start = perf_counter()
+        try:
+            await self.async_load_data()
+            # Catch up on occurrences missed while Home Assistant was down
+            # before the entities exist, so they aren't notified of every one
+            await self.async_check_recurring_todos()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.exception("Error loading todos")
+            self.hydration_error = err
+            self._hydration_done.set()
+            # Sensors showing the counts of the last save become unavailable
+            self.last_update_success = False
+            self.async_update_listeners()
+            return
+        self.startup_timings["hydrate"] = round((perf_counter() - start) * 1000, 1)
+        _LOGGER.debug(
+            "Loaded %d todos in %.1f ms",
+            len(self.todos),
+            self.startup_timings["hydrate"],
+        )
+        self.summary = None
+        self.hydrated = True
+        self._hydration_done.set()
+        actions, self._hydrated_actions = self._hydrated_actions, []
+        for action in actions:
+            action()
+        self.async_update_listeners()
+
+    @callback
+    def async_on_hydrated(self, action: Callable[[], None]) -> None:
+        """Run an action once the todos are loaded, right away if they are."""
+        if self.hydrated:
+            action()
+        else:
+            self._hydrated_actions.append(action)
+
+    async def async_wait_hydrated(self) -> None:
+        """Wait until the todos are loaded.
+
+        Calls arriving during startup queue up here and continue in the
+        order they came in. They fail if the todos could not be loaded or
+        the entry is unloaded first.
+        """
+        await self._hydration_done.wait()
+        if self.hydration_error is not None:
+            raise HomeAssistantError(
+                f"ToDo Manager failed to load its todos: {self.hydration_error}"
+            )
+        if not self.hydrated:
+            raise HomeAssistantError("ToDo Manager was unloaded during startup")
 
     async def async_load_data(self) -> None:
         """Load data from storage."""
@@ -44,188 +208,741 @@ class TodoCoordinator(DataUpdateCoordinator):
         if data:
             self.todos = data.get(STORAGE_KEY_TODOS, {})
             self.persons = data.get(STORAGE_KEY_PERSONS, {})
+            self._async_rebuild_indexes()
+            self.scheduler.async_schedule_all()
         else:
             # Initialize with default person if none exists
             if not self.persons:
                 default_person_id = str(uuid.uuid4())
-                self.persons[default_person_id] = {
-                    "id": default_person_id,
-                    "name": "Standard",
-                    "color": "#1976d2",
-                }
+                self.persons[default_person_id] = Person(
+                    default_person_id, "Standard", "#1976d2"
+                )
+                self.store.async_mark_persons_dirty()
                 await self.async_save_data()
 
     async def async_save_data(self) -> None:
-        """Save data to storage."""
-        data = {
+        """Save data to storage.
+
+        With a save delay the store is only marked dirty and all mutations
+        within the window are written by a single flush. Only the shards of
+        todos reported through async_todo_changed are written.
+        """
+        with self.stats.measure("save_data"):
+            self._pending_mutations += 1
+            if self.save_delay > 0:
+                self.store.async_delay_save(self._data_to_save, self.save_delay)
+            else:
+                await self.store.async_save(self._data_to_save())
+            await self.async_request_refresh()
+
+    async def async_flush(self) -> None:
+        """Write pending mutations to storage immediately."""
+        if self._pending_mutations:
+            await self.store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store and reset the pending mutation count."""
+        _LOGGER.debug(
+            "Flushing %d mutation(s) to storage", self._pending_mutations
+        )
+        self.last_flush_mutations = self._pending_mutations
+        self._pending_mutations = 0
+        return {
             STORAGE_KEY_TODOS: self.todos,
             STORAGE_KEY_PERSONS: self.persons,
+            STORAGE_KEY_REVISION: self.revision,
+            STORAGE_KEY_SUMMARY: self._build_summary(),
+        }
+
+    @callback
+    def _build_summary(self) -> dict[str, Any]:
+        """Return the counts to show at the next startup before hydration."""
+        next_due = self.get_next_due()
+        return {
+            "todos": len(self.todos),
+            "active": self.get_active_count(),
+            "overdue": self.get_overdue_count(),
+            "next_due": next_due.isoformat() if next_due else None,
+            STORAGE_KEY_REVISION: self.revision,
         }
-        await self.store.async_save(data)
-        await self.async_request_refresh()
+
+    async def async_archive_completed(self) -> int:
+        """Move todos completed longer ago than the archive age to the archive.
+
+        Completed recurring todos whose next occurrence wasn't created yet
+        stay active so the series can continue.
+        """
+        if self.archive_after_days <= 0:
+            return 0
+
+        def expired() -> list[str]:
+            cutoff = local_now() - timedelta(days=self.archive_after_days)
+            return [
+                todo_id
+                for todo_id in self._completed
+                if todo_id not in self._pending_recurrences
+                and (completed_date := self.todos[todo_id].completed_date)
+                and completed_date < cutoff
+            ]
+
+        if not expired():
+            return 0
+        await self.archive.async_load()
+        # Todos may have changed while the archive was loading
+        todo_ids = expired()
+        if not todo_ids:
+            return 0
+
+        self.archive.async_add(
+            [self.todos[todo_id].as_dict() for todo_id in todo_ids]
+        )
+        for todo_id in todo_ids:
+            del self.todos[todo_id]
+            self.async_todo_changed(todo_id, CHANGE_DELETED)
+        await self.async_save_data()
+        _LOGGER.info("Archived %d completed todos", len(todo_ids))
+        return len(todo_ids)
+
+    @callback
+    def async_add_change_listener(
+        self, listener: Callable[[int, str, str | None, str | None], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for todo and person changes.
+
+        The listener is called with the new revision, the kind of change and
+        the id of the changed todo or person.
+        """
+        self._change_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._change_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_todo_changed(self, todo_id: str, change: str) -> None:
+        """Record a change of a todo, update indexes and notify listeners."""
+        if change != CHANGE_DELETED:
+            self.todos[todo_id].revision += 1
+        self.store.async_mark_todo_dirty(todo_id)
+        self._unindex_todo(todo_id)
+        if change != CHANGE_DELETED:
+            self._index_todo(todo_id)
+            self.scheduler.async_schedule(todo_id)
+        else:
+            self.scheduler.async_unschedule(todo_id)
+        self._async_notify_change(change, todo_id, None)
+
+    @callback
+    def async_person_changed(self, person_id: str, change: str) -> None:
+        """Record a change of a person and notify listeners."""
+        self.store.async_mark_persons_dirty()
+        self._async_notify_change(change, None, person_id)
+
+    @callback
+    def _async_notify_change(
+        self, change: str, todo_id: str | None, person_id: str | None
+    ) -> None:
+        """Bump the revision and notify change listeners."""
+        self.revision += 1
+        for listener in list(self._change_listeners):
+            listener(self.revision, change, todo_id, person_id)
+
+    async def async_shutdown(self) -> None:
+        """Stop the scheduler and cancel pending refreshes."""
+        self.scheduler.async_stop()
+        # Release calls still waiting for the todos
+        self._hydration_done.set()
+        await super().async_shutdown()
 
     async def _async_update_data(self) -> None:
         """Update data."""
-        # Check for recurring todos that need to be created
-        await self._check_recurring_todos()
+        if self.hydration_error is not None:
+            raise UpdateFailed("The todos could not be loaded")
+        with self.stats.measure("update_data"):
+            # Check for recurring todos that need to be created
+            await self.async_check_recurring_todos()
         return {
             "todos": self.todos,
             "persons": self.persons,
         }
 
-    async def _check_recurring_todos(self) -> None:
-        """Check and create recurring todos."""
-        now = datetime.now()
-        created_new = False
-        
-        for todo_id, todo in list(self.todos.items()):
-            if not todo.get("recurring", False):
-                continue
-            
-            recurring_rule = todo.get("recurring_rule", {})
-            if not recurring_rule:
-                continue
-            
-            interval = recurring_rule.get("interval", 1)
-            unit = recurring_rule.get("unit", "days")
-            
-            # Check if todo is completed - if so, create next occurrence
-            if todo.get("completed", False):
-                completed_date = todo.get("completed_date")
-                if not completed_date:
-                    continue
-                    
-                try:
-                    completed_dt = datetime.fromisoformat(completed_date.replace("Z", "+00:00"))
-                    if completed_dt.tzinfo:
-                        completed_dt = completed_dt.replace(tzinfo=None)
-                except (ValueError, TypeError):
-                    continue
-                
-                # Calculate next due date
-                if unit == "days":
-                    next_due = completed_dt + timedelta(days=interval)
-                elif unit == "weeks":
-                    next_due = completed_dt + timedelta(weeks=interval)
-                elif unit == "months":
-                    # Calculate months properly
-                    year = completed_dt.year
-                    month = completed_dt.month + interval
-                    day = completed_dt.day
-                    # Handle month overflow
-                    while month > 12:
-                        month -= 12
-                        year += 1
-                    # Handle day overflow (e.g., Feb 30 -> Feb 28)
-                    while True:
-                        try:
-                            next_due = datetime(year, month, day)
-                            break
-                        except ValueError:
-                            day -= 1
-                else:
-                    continue
-                
-                # Check if next occurrence should be created (only if due date has passed)
-                if now >= next_due:
-                    # Check if this occurrence already exists
-                    # Look for todos with same title, recurring pattern, and due date
-                    existing = False
-                    for existing_todo in self.todos.values():
-                        if (existing_todo.get("title") == todo.get("title") and
-                            existing_todo.get("recurring", False) and
-                            existing_todo.get("recurring_rule") == recurring_rule and
-                            existing_todo.get("due_date") == next_due.strftime("%Y-%m-%d") and
-                            not existing_todo.get("completed", False)):
-                            existing = True
-                            break
-                    
-                    if not existing:
-                        # Create new todo based on this one
-                        new_todo_id = str(uuid.uuid4())
-                        new_todo = todo.copy()
-                        new_todo["id"] = new_todo_id
-                        new_todo["completed"] = False
-                        new_todo["completed_date"] = None
-                        new_todo["due_date"] = next_due.strftime("%Y-%m-%d")
-                        new_todo["result"] = None  # Reset result
-                        
-                        # If items exist (shopping/packing lists), reset them
-                        if "items" in new_todo:
-                            for item in new_todo["items"]:
-                                item["checked"] = False
-                        
-                        self.todos[new_todo_id] = new_todo
-                        created_new = True
-        
+    @callback
+    def is_pending_recurrence(self, todo_id: str) -> bool:
+        """Return if a completed recurring todo waits for its next occurrence."""
+        return todo_id in self._pending_recurrences
+
+    async def async_check_recurring_todos(self) -> None:
+        """Check and create recurring todos.
+
+        Only completed recurring todos without a next occurrence are
+        considered and existing occurrences are found through the series
+        index, so the check doesn't scan the whole store.
+        """
+        with self.stats.measure("check_recurring_todos"):
+            created_new = self._async_spawn_recurrences()
         if created_new:
             await self.async_save_data()
 
+    @callback
+    def _async_spawn_recurrences(self) -> bool:
+        """Create the due next occurrences, return if any was created."""
+        now = local_now()
+        created_new = False
+
+        for todo_id in list(self._pending_recurrences):
+            todo = self.todos[todo_id]
+            next_due = calculate_next_due(todo)
+            # Check if next occurrence should be created (only if due date has passed)
+            if next_due is None or now < next_due:
+                continue
+
+            due_date = next_due.date()
+            occurrence_id = self._occurrences.get((todo.series_id, due_date))
+            if occurrence_id is None:
+                # Create new todo based on this one, with items unchecked
+                occurrence_id = str(uuid.uuid4())
+                self.todos[occurrence_id] = todo.next_occurrence(
+                    occurrence_id, due_date
+                )
+                self.async_todo_changed(occurrence_id, CHANGE_CREATED)
+                created_new = True
+
+            todo.next_occurrence_id = occurrence_id
+            self.async_todo_changed(todo_id, CHANGE_UPDATED)
+
+        return created_new
+
+    @callback
+    def _async_rebuild_indexes(self) -> None:
+        """Rebuild all todo indexes from scratch."""
+        self._person_todos.clear()
+        self._indexed_persons.clear()
+        self._type_todos.clear()
+        self._open_types.clear()
+        self._indexed_types.clear()
+        self._completed_due_index.clear()
+        self.search_index.clear()
+        self._due.clear()
+        self._due_index.clear()
+        self._undated.clear()
+        self._completed.clear()
+        self._occurrences.clear()
+        self._indexed_occurrences.clear()
+        self._pending_recurrences.clear()
+        self._open_recurrences.clear()
+        for todo_id in self.todos:
+            self._index_todo(todo_id)
+
+    @callback
+    def _index_todo(self, todo_id: str) -> None:
+        """Add a todo to the indexes."""
+        todo = self.todos[todo_id]
+        due = self._due[todo_id] = todo.due
+        if todo.completed:
+            self._completed[todo_id] = None
+            if due is not None:
+                insort(self._completed_due_index, (due, todo_id))
+        elif due is None:
+            self._undated[todo_id] = None
+        else:
+            insort(self._due_index, (due, todo_id))
+        todo_type = self._indexed_types[todo_id] = todo.todo_type
+        self._type_todos.setdefault(todo_type, {})[todo_id] = None
+        if not todo.completed:
+            self._open_types[todo_type] = self._open_types.get(todo_type, 0) + 1
+
+        self.search_index.add(todo)
+
+        persons = self._indexed_persons[todo_id] = tuple(todo.persons)
+        for person_id in persons:
+            self._person_todos.setdefault(person_id, {})[todo_id] = None
+
+        if not todo.is_recurring:
+            return
+
+        # Recurring todos always belong to a series
+        if not todo.series_id:
+            todo.series_id = str(uuid.uuid4())
+
+        if todo.due_date is not None:
+            key = (todo.series_id, todo.due_date)
+            self._occurrences.setdefault(key, todo_id)
+            self._indexed_occurrences[todo_id] = key
+
+        if todo.completed and not todo.next_occurrence_id:
+            self._pending_recurrences.add(todo_id)
+        elif not todo.completed and todo.due_date is not None:
+            self._open_recurrences[todo_id] = None
+
+    @callback
+    def _unindex_todo(self, todo_id: str) -> None:
+        """Remove a todo from the indexes."""
+        completed = todo_id in self._completed
+        due = self._due.pop(todo_id, None)
+        if due is not None:
+            _remove_sorted(
+                self._completed_due_index if completed else self._due_index,
+                (due, todo_id),
+            )
+        self._undated.pop(todo_id, None)
+        self._completed.pop(todo_id, None)
+        if (todo_type := self._indexed_types.pop(todo_id, None)) is not None:
+            type_todos = self._type_todos[todo_type]
+            del type_todos[todo_id]
+            if not type_todos:
+                del self._type_todos[todo_type]
+            if not completed:
+                self._open_types[todo_type] -= 1
+                if not self._open_types[todo_type]:
+                    del self._open_types[todo_type]
+        for person_id in self._indexed_persons.pop(todo_id, ()):
+            person_todos = self._person_todos[person_id]
+            person_todos.pop(todo_id, None)
+            if not person_todos:
+                del self._person_todos[person_id]
+
+        self.search_index.remove(todo_id)
+
+        key = self._indexed_occurrences.pop(todo_id, None)
+        if key is not None and self._occurrences.get(key) == todo_id:
+            del self._occurrences[key]
+        self._pending_recurrences.discard(todo_id)
+        self._open_recurrences.pop(todo_id, None)
+
     async def async_setup_entities(self) -> None:
         """Setup sensor entities for todos."""
         # Entities will be created dynamically based on todos
         pass
 
     @callback
-    def get_todos(self, filter_completed: bool = False) -> list[dict[str, Any]]:
-        """Get all todos, optionally filtered."""
-        todos = list(self.todos.values())
-        if filter_completed:
-            todos = [t for t in todos if not t.get("completed", False)]
-        # Convert to proper dict format
-        return sorted(todos, key=lambda x: self._get_urgency_score(x), reverse=True)
-    
+    def get_todos(self, filter_completed: bool = False) -> list[Todo]:
+        """Get all todos sorted by urgency, optionally without completed ones."""
+        return list(self._iter_by_urgency(not filter_completed))
+
+    @callback
+    def get_most_urgent(self, limit: int) -> list[Todo]:
+        """Get the most urgent open todos without sorting the whole store."""
+        return list(islice(self._iter_by_urgency(False), limit))
+
+    @callback
+    def get_completed_todos(self) -> list[Todo]:
+        """Get all completed todos."""
+        return [self.todos[todo_id] for todo_id in self._completed]
+
+    @callback
+    def get_person_todo_ids(self, person_id: str) -> list[str]:
+        """Get the ids of all todos assigned to a person."""
+        return list(self._person_todos.get(person_id, ()))
+
+    @callback
+    def get_person_counts(self, person_id: str) -> tuple[int, int]:
+        """Return the number of open and overdue todos of a person."""
+        now = local_now()
+        active = overdue = 0
+        for todo_id in self._person_todos.get(person_id, ()):
+            if todo_id in self._completed:
+                continue
+            active += 1
+            if (due := self._due[todo_id]) is not None and due < now:
+                overdue += 1
+        return active, overdue
+
+    @callback
+    def get_active_count(self) -> int:
+        """Return the number of open todos."""
+        return len(self._due_index) + len(self._undated)
+
+    @callback
+    def get_open_type_counts(self) -> dict[str, int]:
+        """Return the number of open todos per type."""
+        return dict(self._open_types)
+
+    @callback
+    def get_next_due(self) -> datetime | None:
+        """Return the earliest due time of the open todos that isn't past."""
+        position = bisect_left(self._due_index, local_now(), key=itemgetter(0))
+        if position == len(self._due_index):
+            return None
+        return self._due_index[position][0]
+
+    @callback
+    def get_overdue_count(self) -> int:
+        """Return the number of open todos past their due time."""
+        return bisect_left(self._due_index, local_now(), key=itemgetter(0))
+
+    @callback
+    def get_view_fingerprint(self, view: str) -> tuple[Any, ...]:
+        """Return a cheap value that changes whenever a summary view does.
+
+        The counts of all and overdue todos are their own fingerprint. The
+        active view exposes the todos themselves, so it follows the revision
+        and the next due time, which moves on once a todo becomes overdue.
+        """
+        if not self.hydrated:
+            return (False, self.revision, self.last_update_success)
+        if view == "all":
+            return (True, len(self.todos))
+        if view == "overdue":
+            return (True, self.get_overdue_count())
+        return (True, self.revision, self.get_next_due())
+
+    def _iter_by_urgency(
+        self, include_completed: bool
+    ) -> Iterator[Todo]:
+        """Yield todos in the order of _get_urgency_score, highest first.
+
+        The score falls with the due time, so open todos come from the due
+        index in ascending order. Todos without a due date and completed
+        todos are merged in where far future due dates drop below their
+        fixed scores.
+        """
+        now = local_now()
+        undated_at = bisect_right(
+            self._due_index, now + UNDATED_HORIZON, key=itemgetter(0)
+        )
+        completed_at = bisect_right(
+            self._due_index, now + COMPLETED_HORIZON, key=itemgetter(0)
+        )
+        for _, todo_id in self._due_index[:undated_at]:
+            yield self.todos[todo_id]
+        for todo_id in self._undated:
+            yield self.todos[todo_id]
+        for _, todo_id in self._due_index[undated_at:completed_at]:
+            yield self.todos[todo_id]
+        if include_completed:
+            for todo_id in self._completed:
+                yield self.todos[todo_id]
+        for _, todo_id in self._due_index[completed_at:]:
+            yield self.todos[todo_id]
+
+    def _sort_by_urgency(self, todo_ids: Iterable[str]) -> list[Todo]:
+        """Sort a subset of todos in the order of _iter_by_urgency."""
+        now = local_now()
+        undated_at = now + UNDATED_HORIZON
+        completed_at = now + COMPLETED_HORIZON
+
+        def sort_key(todo_id: str) -> tuple[int, datetime]:
+            due = self._due[todo_id]
+            if todo_id in self._completed:
+                return (3, now)
+            if due is None:
+                return (1, now)
+            if due <= undated_at:
+                return (0, due)
+            return (2 if due <= completed_at else 4, due)
+
+        return [self.todos[todo_id] for todo_id in sorted(todo_ids, key=sort_key)]
+
+    @callback
+    def filter_todos(
+        self,
+        *,
+        person: str | None = None,
+        todo_type: str | None = None,
+        completed: bool | None = None,
+        due_after: date | None = None,
+        due_before: date | None = None,
+    ) -> list[Todo]:
+        """Get todos matching all given filters, sorted by urgency.
+
+        The due range is inclusive, todos without a due date never match a
+        range.
+        """
+        return self.query_todos(
+            person=person,
+            todo_type=todo_type,
+            completed=completed,
+            due_after=due_after,
+            due_before=due_before,
+        )
+
+    @callback
+    def query_todos(
+        self,
+        *,
+        person: str | None = None,
+        todo_type: str | None = None,
+        completed: bool | None = None,
+        overdue: bool | None = None,
+        due_after: date | None = None,
+        due_before: date | None = None,
+        recurring: bool | None = None,
+        open_items: bool | None = None,
+        sort: str = SORT_URGENCY,
+    ) -> list[Todo]:
+        """Get todos matching all given filters, sorted.
+
+        Candidates come from the smallest index selected by the filters (by
+        person, type, completion or due range), so the cost follows the
+        number of candidates rather than the size of the store. The other
+        filters are checked on each candidate. The due range is inclusive,
+        todos without a due date never match a range or are overdue.
+        """
+        now = local_now()
+        lower = datetime.combine(due_after, time.min) if due_after else None
+        upper = (
+            datetime.combine(due_before + timedelta(days=1), time.min)
+            if due_before
+            else None
+        )
+        if overdue:
+            upper = min(upper, now) if upper else now
+
+        # Sizes and iterators of the candidate sets of the indexed filters
+        candidates: list[tuple[int, Callable[[], Iterable[str]]]] = []
+        if person is not None:
+            person_todos = self._person_todos.get(person, {})
+            candidates.append((len(person_todos), lambda: person_todos))
+        if todo_type is not None:
+            type_todos = self._type_todos.get(todo_type, {})
+            candidates.append((len(type_todos), lambda: type_todos))
+        if completed:
+            candidates.append((len(self._completed), lambda: self._completed))
+        elif completed is False:
+            candidates.append(
+                (
+                    self.get_active_count(),
+                    lambda: chain(
+                        self._undated, map(itemgetter(1), self._due_index)
+                    ),
+                )
+            )
+        if lower is not None or upper is not None:
+            ranges = []
+            if completed is not True:
+                ranges.append(self._due_range(self._due_index, lower, upper))
+            if completed is not False and not overdue:
+                ranges.append(
+                    self._due_range(self._completed_due_index, lower, upper)
+                )
+            candidates.append(
+                (
+                    sum(map(len, ranges)),
+                    lambda: map(itemgetter(1), chain.from_iterable(ranges)),
+                )
+            )
+
+        def matches(todo_id: str) -> bool:
+            todo = self.todos[todo_id]
+            due = self._due[todo_id]
+            return (
+                (person is None or person in self._indexed_persons[todo_id])
+                and (todo_type is None or todo.todo_type == todo_type)
+                and (completed is None or todo.completed == completed)
+                and (
+                    overdue is None
+                    or (not todo.completed and due is not None and due < now)
+                    == overdue
+                )
+                and (lower is None or (due is not None and due >= lower))
+                and (upper is None or (due is not None and due < upper))
+                and (recurring is None or todo.is_recurring == recurring)
+                and (
+                    open_items is None
+                    or any(not item.checked for item in todo.items) == open_items
+                )
+            )
+
+        if not candidates:
+            if sort == SORT_URGENCY:
+                # Already in urgency order, no need to sort
+                return [
+                    todo
+                    for todo in self._iter_by_urgency(completed is not False)
+                    if matches(todo.id)
+                ]
+            candidates.append((len(self.todos), lambda: self.todos))
+
+        _, todo_ids = min(candidates, key=itemgetter(0))
+        return self._sort_todos(
+            [todo_id for todo_id in todo_ids() if matches(todo_id)], sort
+        )
+
+    @staticmethod
+    def _due_range(
+        index: list[tuple[datetime, str]],
+        lower: datetime | None,
+        upper: datetime | None,
+    ) -> list[tuple[datetime, str]]:
+        """Return the part of a due index within [lower, upper)."""
+        start = bisect_left(index, lower, key=itemgetter(0)) if lower else 0
+        end = bisect_left(index, upper, key=itemgetter(0)) if upper else len(index)
+        return index[start:end]
+
+    def _sort_todos(self, todo_ids: list[str], sort: str) -> list[Todo]:
+        """Sort todos by one of the query sort orders."""
+        if sort == SORT_URGENCY:
+            return self._sort_by_urgency(todo_ids)
+        todos = [self.todos[todo_id] for todo_id in todo_ids]
+        if sort == SORT_DUE_DATE:
+            todos.sort(key=lambda todo: (todo.due is None, todo.due or datetime.min))
+        elif sort == SORT_TITLE:
+            todos.sort(key=lambda todo: todo.title.casefold())
+        elif sort == SORT_CREATED_AT:
+            todos.sort(key=lambda todo: todo.created_at or datetime.min)
+        return todos
+
     @callback
-    def get_todos_dict(self) -> dict[str, dict[str, Any]]:
+    def get_due_between(
+        self, start: datetime, end: datetime, completed: bool | None = None
+    ) -> list[tuple[datetime, Todo]]:
+        """Return the todos due from start to before end, earliest first.
+
+        The due indexes are bisected, so only the todos in the range are
+        touched.
+        """
+        indexes = {False: self._due_index, True: self._completed_due_index}
+        due_todos = []
+        for state, index in indexes.items():
+            if completed is not None and state != completed:
+                continue
+            low = bisect_left(index, start, key=itemgetter(0))
+            high = bisect_left(index, end, lo=low, key=itemgetter(0))
+            due_todos.extend(
+                (due, self.todos[todo_id]) for due, todo_id in index[low:high]
+            )
+        due_todos.sort(key=itemgetter(0))
+        return due_todos
+
+    @callback
+    def get_future_occurrences(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, Todo]]:
+        """Return the occurrences of recurring todos not created yet in a range.
+
+        Each occurrence is assumed to be completed when due, so an open
+        recurring todo repeats every interval after its due date. Completed
+        ones waiting for their next occurrence continue from the date it
+        will be created. Only the latest todo of each series is continued
+        and only the dates in the range are computed.
+        """
+        # Series id to the first date to continue from, the first date that
+        # is a future occurrence and the todo
+        heads: dict[str | None, tuple[date, date, Todo]] = {}
+        for todo_id in chain(self._open_recurrences, self._pending_recurrences):
+            todo = self.todos[todo_id]
+            if todo.completed:
+                if (next_due := calculate_next_due(todo)) is None:
+                    continue
+                first = next_due.date()
+                future = first
+            else:
+                first = todo.due_date
+                # The todo itself is not a future occurrence
+                future = first + timedelta(days=1)
+            head = heads.get(todo.series_id)
+            if head is None or first > head[0]:
+                heads[todo.series_id] = (first, future, todo)
+
+        occurrences = []
+        for first, future, todo in heads.values():
+            for due_date in iter_due_dates(
+                first,
+                todo.recurring_rule,
+                max(start.date(), future),
+                end.date() + timedelta(days=1),
+            ):
+                due = datetime.combine(due_date, todo.due_time)
+                if (
+                    start <= due < end
+                    and (todo.series_id, due_date) not in self._occurrences
+                ):
+                    occurrences.append((due, todo))
+        occurrences.sort(key=itemgetter(0))
+        return occurrences
+
+    @callback
+    def search_todos(
+        self,
+        query: str,
+        *,
+        person: str | None = None,
+        completed: bool | None = None,
+    ) -> list[tuple[Todo, float]]:
+        """Get the todos matching a search query with their scores.
+
+        The best matches come first, equal scores in the order of urgency.
+        """
+        scores = dict(self.search_index.search(query))
+        todo_ids = [
+            todo_id
+            for todo_id in scores
+            if (person is None or person in self._indexed_persons[todo_id])
+            and (completed is None or (todo_id in self._completed) == completed)
+        ]
+        todos = self._sort_by_urgency(todo_ids)
+        todos.sort(key=lambda todo: -scores[todo.id])
+        return [(todo, scores[todo.id]) for todo in todos]
+
+    @callback
+    def search_result_to_dict(
+        self, todo: Todo, score: float, query: str
+    ) -> dict[str, Any]:
+        """Convert a search match to the version exposed to clients."""
+        return {
+            **self.todo_to_dict(todo),
+            "score": round(score, 2),
+            "matched_items": SearchIndex.matching_items(todo, query),
+        }
+
+    @callback
+    def todo_to_dict(self, todo: Todo) -> dict[str, Any]:
+        """Convert a todo to the version exposed to clients."""
+        return {**todo.as_dict(), "urgency_score": self._get_urgency_score(todo)}
+
+    @callback
+    def get_todos_dict(self) -> dict[str, Todo]:
         """Get todos as dictionary for easier access."""
         return self.todos
 
     @callback
-    def _get_urgency_score(self, todo: dict[str, Any]) -> float:
+    def get_due_datetime(self, todo: Todo) -> datetime | None:
+        """Return the due date and time of a todo."""
+        if todo.id in self._due:
+            return self._due[todo.id]
+        return todo.due
+
+    @callback
+    def _get_urgency_score(self, todo: Todo) -> float:
         """Calculate urgency score for sorting."""
-        if todo.get("completed", False):
+        if todo.completed:
             return 0.0
         
-        due_date = todo.get("due_date")
-        due_time = todo.get("due_time", "23:59")
-        
-        if not due_date:
+        due_dt = self.get_due_datetime(todo)
+        if due_dt is None:
             return 0.5  # No due date = medium priority
+
+        now = local_now()
+        if due_dt < now:
+            # Overdue - return high score based on how overdue
+            hours_overdue = (now - due_dt).total_seconds() / 3600
+            return 1000.0 + hours_overdue
         
-        try:
-            due_str = f"{due_date} {due_time}"
-            due_dt = datetime.strptime(due_str, "%Y-%m-%d %H:%M")
-            now = datetime.now()
-            
-            if due_dt < now:
-                # Overdue - return high score based on how overdue
-                hours_overdue = (now - due_dt).total_seconds() / 3600
-                return 1000.0 + hours_overdue
-            
-            # Calculate hours until due
-            hours_until = (due_dt - now).total_seconds() / 3600
-            
-            # Return inverse score - closer to due = higher score
-            if hours_until < 24:
-                return 100.0 - hours_until
-            elif hours_until < 168:  # 1 week
-                return 50.0 - (hours_until / 7)
-            else:
-                return 10.0 - (hours_until / 168)
-        except (ValueError, TypeError):
-            return 0.5
+        # Calculate hours until due
+        hours_until = (due_dt - now).total_seconds() / 3600
+        
+        # Return inverse score - closer to due = higher score
+        if hours_until < 24:
+            return 100.0 - hours_until
+        elif hours_until < 168:  # 1 week
+            return 50.0 - (hours_until / 7)
+        else:
+            return 10.0 - (hours_until / 168)
 
     @callback
-    def get_todo(self, todo_id: str) -> dict[str, Any] | None:
+    def get_todo(self, todo_id: str) -> Todo | None:
         """Get a specific todo."""
         return self.todos.get(todo_id)
 
     @callback
     def get_persons(self) -> list[dict[str, Any]]:
-        """Get all persons."""
-        return list(self.persons.values())
+        """Get all persons in the form exposed to clients."""
+        return [person.as_dict() for person in self.persons.values()]
 
     @callback
-    def get_person(self, person_id: str) -> dict[str, Any] | None:
+    def get_person(self, person_id: str) -> Person | None:
         """Get a specific person."""
         return self.persons.get(person_id)
@@ -0,0 +1,91 @@
+"""Diagnostics support for ToDo Manager."""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN
+from .coordinator import TodoCoordinator
+
+# Number of todos with the most items that are listed
+LARGEST_LISTS = 5
+
+
+def _file_sizes(paths: list[str]) -> dict[str, int]:
+    """Return the size of the files that exist."""
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[os.path.basename(path)] = os.path.getsize(path)
+        except OSError:
+            continue
+    return sizes
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Titles, descriptions and names are left out, todos and persons are only
+    counted.
+    """
+    coordinator: TodoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    todos = coordinator.todos.values()
+
+    file_sizes = await hass.async_add_executor_job(
+        _file_sizes, coordinator.store.paths
+    )
+
+    largest = sorted(
+        (todo for todo in todos if todo.items),
+        key=lambda todo: len(todo.items),
+        reverse=True,
+    )[:LARGEST_LISTS]
+
+    attribute_sizes = {}
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if state := hass.states.get(entity.entity_id):
+            attribute_sizes[entity.entity_id] = len(json_bytes(state.attributes))
+
+    return {
+        "options": dict(entry.options),
+        "startup": {
+            "hydrated": coordinator.hydrated,
+            "hydration_error": (
+                repr(coordinator.hydration_error)
+                if coordinator.hydration_error
+                else None
+            ),
+            "timings_ms": coordinator.startup_timings,
+        },
+        "store": {
+            "files": file_sizes,
+            "total_bytes": sum(file_sizes.values()),
+            "journal_mode": coordinator.store.journal_mode,
+            "journal_records": coordinator.store.journal.records,
+            "revision": coordinator.revision,
+        },
+        "counts": {
+            "todos": len(coordinator.todos),
+            "open": coordinator.get_active_count(),
+            "overdue": coordinator.get_overdue_count(),
+            "completed": len(coordinator.get_completed_todos()),
+            "items": sum(len(todo.items) for todo in todos),
+            "persons": len(coordinator.persons),
+            "archive_loaded": coordinator.archive.loaded,
+        },
+        "largest_lists": [
+            {"id": todo.id, "todo_type": todo.todo_type, "items": len(todo.items)}
+            for todo in largest
+        ],
+        "attribute_bytes": attribute_sizes,
+        "timings": coordinator.stats.summary(),
+        "slow_operations": list(coordinator.stats.slow_operations),
+    }
@@ -0,0 +1,81 @@
+"""Append-only mutation journal for ToDo Manager."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps
+
+_LOGGER = logging.getLogger(__name__)
+
+OP_SET = "set"
+OP_DELETE = "delete"
+OP_PERSONS = "persons"
+
+
+class TodoJournal:
+    """JSON lines file that mutations are appended to between snapshots.
+
+    Every record holds the complete new state of one todo, or of all
+    persons, so replaying a record twice does no harm.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the journal."""
+        self.hass = hass
+        self.path = path
+        self.records = 0
+
+    async def async_load(self) -> list[dict[str, Any]]:
+        """Read all records."""
+        records = await self.hass.async_add_executor_job(self._read)
+        self.records = len(records)
+        return records
+
+    async def async_append(self, records: list[dict[str, Any]]) -> None:
+        """Append records and sync them to disk."""
+        lines = [f"{json_dumps(record)}\n" for record in records]
+        await self.hass.async_add_executor_job(self._append, lines)
+        self.records += len(records)
+
+    async def async_clear(self) -> None:
+        """Remove all records after they were written to a snapshot."""
+        await self.hass.async_add_executor_job(self._clear)
+        self.records = 0
+
+    def _read(self) -> list[dict[str, Any]]:
+        """Read the journal file."""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line_number, line in enumerate(lines, 1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A crash while appending leaves a partial last line
+                _LOGGER.warning(
+                    "Skipping unreadable line %d of %s", line_number, self.path
+                )
+        return records
+
+    def _append(self, lines: list[str]) -> None:
+        """Append lines to the journal file."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _clear(self) -> None:
+        """Delete the journal file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
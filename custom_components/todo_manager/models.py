@@ -0,0 +1,276 @@
+"""Data model of ToDo Manager."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time
+from enum import StrEnum
+from typing import Any
+import uuid
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    TODO_TYPE_COMPLEX,
+    TODO_TYPE_PACKING,
+    TODO_TYPE_SHOPPING,
+    TODO_TYPE_SIMPLE,
+)
+
+END_OF_DAY = time(23, 59)
+
+
+class TodoType(StrEnum):
+    """Type of a todo."""
+
+    SIMPLE = TODO_TYPE_SIMPLE
+    COMPLEX = TODO_TYPE_COMPLEX
+    SHOPPING = TODO_TYPE_SHOPPING
+    PACKING = TODO_TYPE_PACKING
+
+
+class RecurrenceUnit(StrEnum):
+    """Unit of a recurrence interval."""
+
+    DAYS = "days"
+    WEEKS = "weeks"
+    MONTHS = "months"
+
+
+def local_now() -> datetime:
+    """Return the current time as naive local time.
+
+    Due dates are naive and meant in the time zone configured in Home
+    Assistant, which may differ from the one of the host.
+    """
+    return dt_util.now().replace(tzinfo=None)
+
+
+def parse_date(value: Any) -> date | None:
+    """Parse an ISO date, None if it can't be parsed."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_time(value: Any) -> time:
+    """Parse a time of day, the end of the day if it can't be parsed."""
+    if isinstance(value, time):
+        return value.replace(second=0, microsecond=0)
+    try:
+        return time.fromisoformat(value).replace(second=0, microsecond=0)
+    except (TypeError, ValueError):
+        return END_OF_DAY
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    """Parse an ISO datetime as naive local time, None if it can't be parsed.
+
+    Datetimes with a time zone are converted to local time first.
+    """
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (AttributeError, TypeError, ValueError):
+            return None
+    if value.tzinfo is not None:
+        value = dt_util.as_local(value)
+    return value.replace(tzinfo=None)
+
+
+def _isoformat(value: date | datetime | None) -> str | None:
+    """Format an optional date or datetime."""
+    return value.isoformat() if value is not None else None
+
+
+@dataclass(slots=True)
+class RecurringRule:
+    """How often a recurring todo repeats after it was completed."""
+
+    interval: int = 1
+    unit: RecurrenceUnit = RecurrenceUnit.DAYS
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> RecurringRule | None:
+        """Create a rule from its stored form."""
+        if not data:
+            return None
+        try:
+            unit = RecurrenceUnit(data.get("unit", RecurrenceUnit.DAYS))
+        except ValueError:
+            return None
+        return cls(int(data.get("interval", 1)), unit)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stored form of the rule."""
+        return {"interval": self.interval, "unit": self.unit.value}
+
+
+@dataclass(slots=True)
+class TodoItem:
+    """Item of a shopping or packing list."""
+
+    id: str
+    name: str = ""
+    quantity: str = ""
+    checked: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Any) -> TodoItem:
+        """Create an item from its stored form or a plain name."""
+        if not isinstance(data, dict):
+            return cls(str(uuid.uuid4()), str(data))
+        return cls(
+            str(data.get("id") or uuid.uuid4()),
+            str(data.get("name", data.get("item_name", ""))),
+            str(data.get("quantity", data.get("item_quantity", ""))),
+            bool(data.get("checked", False)),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stored form of the item."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "quantity": self.quantity,
+            "checked": self.checked,
+        }
+
+
+@dataclass(slots=True)
+class Todo:
+    """A todo with its dates parsed."""
+
+    id: str
+    title: str
+    description: str = ""
+    due_date: date | None = None
+    due_time: time = END_OF_DAY
+    todo_type: TodoType = TodoType.SIMPLE
+    persons: list[str] = field(default_factory=list)
+    recurring: bool = False
+    recurring_rule: RecurringRule | None = None
+    completed: bool = False
+    completed_date: datetime | None = None
+    result: str | None = None
+    items: list[TodoItem] = field(default_factory=list)
+    created_at: datetime | None = None
+    series_id: str | None = None
+    next_occurrence_id: str | None = None
+    # Bumped on every change, for compare-and-set updates
+    revision: int = 0
+
+    @property
+    def due(self) -> datetime | None:
+        """Return the due date and time."""
+        if self.due_date is None:
+            return None
+        return datetime.combine(self.due_date, self.due_time)
+
+    @property
+    def is_recurring(self) -> bool:
+        """Return if the todo repeats."""
+        return self.recurring and self.recurring_rule is not None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Todo:
+        """Create a todo from its stored form."""
+        try:
+            todo_type = TodoType(data.get("todo_type") or TodoType.SIMPLE)
+        except ValueError:
+            todo_type = TodoType.SIMPLE
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "",
+            description=data.get("description") or "",
+            due_date=parse_date(data.get("due_date")),
+            due_time=parse_time(data.get("due_time")),
+            todo_type=todo_type,
+            persons=list(data.get("persons") or []),
+            recurring=bool(data.get("recurring", False)),
+            recurring_rule=RecurringRule.from_dict(data.get("recurring_rule")),
+            completed=bool(data.get("completed", False)),
+            completed_date=parse_datetime(data.get("completed_date")),
+            result=data.get("result"),
+            items=[TodoItem.from_dict(item) for item in data.get("items") or []],
+            created_at=parse_datetime(data.get("created_at")),
+            series_id=data.get("series_id"),
+            next_occurrence_id=data.get("next_occurrence_id"),
+            revision=int(data.get("revision") or 0),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stored form of the todo, also used by the API."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "due_date": _isoformat(self.due_date),
+            "due_time": self.due_time.strftime("%H:%M"),
+            "todo_type": self.todo_type.value,
+            "persons": list(self.persons),
+            "recurring": self.recurring,
+            "recurring_rule": (
+                self.recurring_rule.as_dict() if self.recurring_rule else None
+            ),
+            "completed": self.completed,
+            "completed_date": _isoformat(self.completed_date),
+            "result": self.result,
+            "items": [item.as_dict() for item in self.items],
+            "created_at": _isoformat(self.created_at),
+            "series_id": self.series_id,
+            "next_occurrence_id": self.next_occurrence_id,
+            "revision": self.revision,
+        }
+
+    def set_completed(self, completed: bool, result: str | None = None) -> None:
+        """Mark the todo as completed or open again.
+
+        A todo opened again keeps its next occurrence, so completing it once
+        more doesn't spawn a second one and fork the series.
+        """
+        self.completed = completed
+        if completed:
+            self.completed_date = local_now()
+            # Keep an existing result if none is provided
+            if result:
+                self.result = result
+        else:
+            self.completed_date = None
+
+    def next_occurrence(self, todo_id: str, due_date: date) -> Todo:
+        """Return an open copy of the todo due at another date."""
+        return replace(
+            self,
+            id=todo_id,
+            due_date=due_date,
+            persons=list(self.persons),
+            completed=False,
+            completed_date=None,
+            result=None,
+            items=[replace(item, checked=False) for item in self.items],
+            next_occurrence_id=None,
+            revision=0,
+        )
+
+
+@dataclass(slots=True)
+class Person:
+    """A person todos can be assigned to."""
+
+    id: str
+    name: str
+    color: str = "#1976d2"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Person:
+        """Create a person from its stored form."""
+        return cls(data["id"], data.get("name") or "", data.get("color") or "#1976d2")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stored form of the person, also used by the API."""
+        return {"id": self.id, "name": self.name, "color": self.color}
@@ -0,0 +1,74 @@
+"""Recurrence helpers for ToDo Manager."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+
+from .models import RecurrenceUnit, RecurringRule, Todo
+
+
+def add_months(value: date, months: int) -> date:
+    """Add months to a date, the day clamped to the end of the month."""
+    year, month = divmod(value.month - 1 + months, 12)
+    day = value.day
+    # Handle day overflow (e.g., Feb 30 -> Feb 28)
+    while True:
+        try:
+            return value.replace(year=value.year + year, month=month + 1, day=day)
+        except ValueError:
+            day -= 1
+
+
+def iter_due_dates(
+    first: date, rule: RecurringRule, start: date, end: date
+) -> Iterator[date]:
+    """Yield the dates every interval from first, from start to before end.
+
+    The first date in the window is computed directly, so far windows don't
+    step through all occurrences before them.
+    """
+    if rule.unit is RecurrenceUnit.MONTHS:
+        months = (start.year - first.year) * 12 + start.month - first.month
+        # Clamped days can put the occurrence of that month before start
+        count = max(0, months // rule.interval - 1)
+        while (due := add_months(first, count * rule.interval)) < end:
+            if due >= start:
+                yield due
+            count += 1
+        return
+
+    step = timedelta(
+        days=rule.interval if rule.unit is RecurrenceUnit.DAYS else rule.interval * 7
+    )
+    due = first + step * max(0, -((first - start) // step))
+    while due < end:
+        yield due
+        due += step
+
+
+def calculate_next_due(todo: Todo) -> datetime | None:
+    """Return when the next occurrence of a completed recurring todo is due.
+
+    Returns None if the todo is not a completed recurring todo or has no
+    completion date.
+    """
+    recurring_rule = todo.recurring_rule
+    if not todo.recurring or recurring_rule is None:
+        return None
+    if not todo.completed:
+        return None
+
+    completed_dt = todo.completed_date
+    if completed_dt is None:
+        return None
+
+    interval = recurring_rule.interval
+    unit = recurring_rule.unit
+
+    if unit is RecurrenceUnit.DAYS:
+        return completed_dt + timedelta(days=interval)
+    if unit is RecurrenceUnit.WEEKS:
+        return completed_dt + timedelta(weeks=interval)
+    if unit is RecurrenceUnit.MONTHS:
+        return datetime.combine(add_months(completed_dt.date(), interval), time())
+    return None
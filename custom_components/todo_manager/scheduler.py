@@ -0,0 +1,168 @@
+"""Due time scheduler for ToDo Manager."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_TODO_DUE, EVENT_TODO_OVERDUE
+from .models import local_now
+from .recurrence import calculate_next_due
+
+if TYPE_CHECKING:
+    from .coordinator import TodoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_DUE = "due"
+KIND_OVERDUE = "overdue"
+KIND_RECURRENCE = "recurrence"
+
+
+class DueScheduler:
+    """Wake up exactly when the next todo becomes due.
+
+    Upcoming due times and recurrence spawn times are kept in a min-heap and
+    a single timer is armed for the earliest one. Entries are invalidated
+    lazily: rescheduling a todo bumps its generation and stale entries are
+    dropped when they reach the top of the heap.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._heap: list[tuple[datetime, int, str, str, int]] = []
+        self._generations: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._armed_at: datetime | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule_all(self) -> None:
+        """Schedule every todo of the coordinator."""
+        self._heap.clear()
+        self._generations.clear()
+        for todo_id in self.coordinator.todos:
+            self._push_todo(todo_id)
+        self._async_arm()
+
+    @callback
+    def async_schedule(self, todo_id: str) -> None:
+        """Reschedule a created or updated todo."""
+        self._push_todo(todo_id)
+        self._async_arm()
+
+    @callback
+    def async_unschedule(self, todo_id: str) -> None:
+        """Forget a deleted todo."""
+        self._generations.pop(todo_id, None)
+        self._async_arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = None
+
+    def _push_todo(self, todo_id: str) -> None:
+        """Push the upcoming points in time of a todo onto the heap."""
+        generation = self._generations.get(todo_id, 0) + 1
+        self._generations[todo_id] = generation
+
+        todo = self.coordinator.todos[todo_id]
+        now = local_now()
+        points: list[tuple[datetime, str]] = []
+        if not todo.completed:
+            if due := self.coordinator.get_due_datetime(todo):
+                due_day = due.replace(hour=0, minute=0, second=0, microsecond=0)
+                if due_day > now:
+                    points.append((due_day, KIND_DUE))
+                if due > now:
+                    points.append((due, KIND_OVERDUE))
+        elif self.coordinator.is_pending_recurrence(todo_id):
+            if spawn := calculate_next_due(todo):
+                # Catch up on spawns missed while Home Assistant was down
+                points.append((max(spawn, now), KIND_RECURRENCE))
+
+        # Due dates are naive local time of Home Assistant, not of the host
+        time_zone = dt_util.get_default_time_zone()
+        for when, kind in points:
+            heapq.heappush(
+                self._heap,
+                (
+                    when.replace(tzinfo=time_zone),
+                    next(self._sequence),
+                    todo_id,
+                    kind,
+                    generation,
+                ),
+            )
+
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 2 * len(self._generations) + 64:
+            self._heap = [
+                entry
+                for entry in self._heap
+                if self._generations.get(entry[2]) == entry[4]
+            ]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest valid entry."""
+        while self._heap and self._generations.get(self._heap[0][2]) != self._heap[0][4]:
+            heapq.heappop(self._heap)
+        when = self._heap[0][0] if self._heap else None
+        if when == self._armed_at:
+            return
+
+        self.async_stop()
+        if when is not None:
+            self._armed_at = when
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._async_fire, when
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Handle everything that became due."""
+        self._unsub_timer = None
+        self._armed_at = None
+        check_recurring = False
+        fired = False
+
+        while self._heap and self._heap[0][0] <= now:
+            _, _, todo_id, kind, generation = heapq.heappop(self._heap)
+            if self._generations.get(todo_id) != generation:
+                continue
+            if kind == KIND_RECURRENCE:
+                check_recurring = True
+                continue
+            todo = self.coordinator.todos[todo_id]
+            self.hass.bus.async_fire(
+                EVENT_TODO_DUE if kind == KIND_DUE else EVENT_TODO_OVERDUE,
+                {
+                    "todo_id": todo_id,
+                    "title": todo.title,
+                    "due_date": todo.due_date.isoformat() if todo.due_date else None,
+                    "due_time": todo.due_time.strftime("%H:%M"),
+                    "persons": list(todo.persons),
+                },
+            )
+            fired = True
+
+        if fired:
+            # Overdue counts changed
+            self.coordinator.async_update_listeners()
+        if check_recurring:
+            self.hass.async_create_task(self.coordinator.async_check_recurring_todos())
+        self._async_arm()
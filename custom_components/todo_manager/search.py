@@ -0,0 +1,142 @@
+"""Full-text search index for ToDo Manager."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+import logging
+import re
+import unicodedata
+
+from .models import Todo
+
+_LOGGER = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# Score of a token per field it occurs in
+TITLE_WEIGHT = 4.0
+ITEM_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+RESULT_WEIGHT = 1.0
+# Share of the score a token matched only by prefix gets
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into casefolded tokens without accents."""
+    if not text:
+        return []
+    if text.isascii():
+        return _WORD.findall(text.lower())
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+    return _WORD.findall(folded)
+
+
+def _matches(tokens: list[str], query_tokens: list[str]) -> bool:
+    """Return if every query token is a prefix of one of the tokens."""
+    return all(
+        any(token.startswith(query_token) for token in tokens)
+        for query_token in query_tokens
+    )
+
+
+class SearchIndex:
+    """Inverted index from tokens to the todos containing them.
+
+    Tokens are kept sorted as well, so a query token matches all tokens it
+    is a prefix of by bisecting instead of scanning the vocabulary.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._postings: dict[str, dict[str, float]] = {}
+        self._tokens: list[str] = []
+        self._todo_tokens: dict[str, dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct tokens."""
+        return len(self._tokens)
+
+    def clear(self) -> None:
+        """Remove all todos."""
+        self._postings.clear()
+        self._tokens.clear()
+        self._todo_tokens.clear()
+
+    def add(self, todo: Todo) -> None:
+        """Index the text fields of a todo."""
+        scores: dict[str, float] = {}
+        for text, weight in (
+            (todo.title, TITLE_WEIGHT),
+            (todo.description, DESCRIPTION_WEIGHT),
+            (todo.result, RESULT_WEIGHT),
+            *((item.name, ITEM_WEIGHT) for item in todo.items),
+        ):
+            for token in set(tokenize(text)):
+                scores[token] = scores.get(token, 0.0) + weight
+
+        self._todo_tokens[todo.id] = scores
+        for token, score in scores.items():
+            if (postings := self._postings.get(token)) is None:
+                postings = self._postings[token] = {}
+                insort(self._tokens, token)
+            postings[todo.id] = score
+
+    def remove(self, todo_id: str) -> None:
+        """Remove a todo from the index."""
+        for token in self._todo_tokens.pop(todo_id, ()):
+            postings = self._postings[token]
+            del postings[todo_id]
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def search(self, query: str) -> list[tuple[str, float]]:
+        """Return the ids and scores of the todos matching all query tokens.
+
+        Query tokens match whole tokens and, at a lower score, tokens they
+        are a prefix of. The best matches come first.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        scores: dict[str, float] | None = None
+        for query_token in query_tokens:
+            token_scores: dict[str, float] = {}
+            position = bisect_left(self._tokens, query_token)
+            while position < len(self._tokens) and self._tokens[
+                position
+            ].startswith(query_token):
+                token = self._tokens[position]
+                factor = 1.0 if token == query_token else PREFIX_FACTOR
+                for todo_id, score in self._postings[token].items():
+                    token_scores[todo_id] = max(
+                        token_scores.get(todo_id, 0.0), score * factor
+                    )
+                position += 1
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    todo_id: score + token_scores[todo_id]
+                    for todo_id, score in scores.items()
+                    if todo_id in token_scores
+                }
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda match: -match[1])
+
+    @staticmethod
+    def matching_items(todo: Todo, query: str) -> list[str]:
+        """Return the ids of the items of a todo matching all query tokens."""
+        query_tokens = tokenize(query)
+        return [
+            item.id
+            for item in todo.items
+            if query_tokens and _matches(tokenize(item.name), query_tokens)
+        ]
@@ -2,16 +2,24 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    CHANGE_CREATED,
+    CHANGE_DELETED,
+    CONF_ATTRIBUTE_BUDGET,
+    DEFAULT_ATTRIBUTE_BUDGET,
+    DOMAIN,
+)
 from .coordinator import TodoCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,84 +32,271 @@ async def async_setup_entry(
 ) -> None:
     """Set up ToDo Manager sensor entities."""
     coordinator: TodoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    budget = entry.options.get(CONF_ATTRIBUTE_BUDGET, DEFAULT_ATTRIBUTE_BUDGET)
     
     # Create summary sensors
     async_add_entities([
-        TodoSummarySensor(coordinator, "all"),
-        TodoSummarySensor(coordinator, "active"),
-        TodoSummarySensor(coordinator, "overdue"),
+        TodoSummarySensor(coordinator, "all", budget),
+        TodoSummarySensor(coordinator, "active", budget),
+        TodoSummarySensor(coordinator, "overdue", budget),
+        TodoPerformanceSensor(coordinator),
     ])
 
+    # Create per person sensors once the persons are loaded, following
+    # person changes
+    coordinator.async_on_hydrated(
+        lambda: async_add_entities(
+            sensor
+            for person_id in coordinator.persons
+            for sensor in _person_sensors(coordinator, person_id)
+        )
+    )
 
-class TodoSummarySensor(CoordinatorEntity, SensorEntity):
-    """Representation of a ToDo summary sensor."""
+    @callback
+    def _async_person_changed(
+        revision: int, change: str, todo_id: str | None, person_id: str | None
+    ) -> None:
+        if person_id is None:
+            return
+        if change == CHANGE_CREATED:
+            async_add_entities(_person_sensors(coordinator, person_id))
+        elif change == CHANGE_DELETED:
+            entity_registry = er.async_get(hass)
+            for sensor_type in PERSON_SENSOR_TYPES:
+                if entity_id := entity_registry.async_get_entity_id(
+                    "sensor",
+                    DOMAIN,
+                    _person_unique_id(coordinator, person_id, sensor_type),
+                ):
+                    entity_registry.async_remove(entity_id)
+
+    entry.async_on_unload(
+        coordinator.async_add_change_listener(_async_person_changed)
+    )
+
+
+PERSON_SENSOR_TYPES = ("active", "overdue")
+
+# Summary count shown by each sensor type until the todos are loaded
+SUMMARY_COUNTS = {"all": "todos", "active": "active", "overdue": "overdue"}
+
+
+def _person_unique_id(
+    coordinator: TodoCoordinator, person_id: str, sensor_type: str
+) -> str:
+    """Return the unique id of a person sensor."""
+    return f"{coordinator.key}_person_{person_id}_{sensor_type}"
+
+
+def _person_sensors(
+    coordinator: TodoCoordinator, person_id: str
+) -> list[TodoPersonSensor]:
+    """Create the sensors of a person."""
+    return [
+        TodoPersonSensor(coordinator, person_id, sensor_type)
+        for sensor_type in PERSON_SENSOR_TYPES
+    ]
+
+
+class TodoChangeSensor(CoordinatorEntity, SensorEntity):
+    """Base of the sensors that write their state only when it changed.
+
+    Every refresh notifies all sensors. They compare a cheap fingerprint of
+    what they show with the one of the last written state instead of
+    rebuilding the state and firing a state change event for nothing.
+    """
+
+    _last_fingerprint: Any = None
+
+    def _fingerprint(self) -> Any:
+        """Return a value that changes whenever the state does."""
+        raise NotImplementedError
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the fingerprint of the first state."""
+        await super().async_added_to_hass()
+        self._last_fingerprint = self._fingerprint()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the fingerprint changed."""
+        fingerprint = self._fingerprint()
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        super()._handle_coordinator_update()
+
+
+class TodoSummarySensor(TodoChangeSensor):
+    """Representation of a ToDo summary sensor.
+
+    The todo list of the active sensor is not recorded and is cut off at
+    the attribute budget, most urgent todos first. The counts next to it
+    are small and recorded.
+    """
+
+    _unrecorded_attributes = frozenset(
+        {"todos", "truncated", "persons", "revision"}
+    )
 
     def __init__(
         self,
         coordinator: TodoCoordinator,
         sensor_type: str,
+        attribute_budget: int = DEFAULT_ATTRIBUTE_BUDGET,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._sensor_type = sensor_type
-        self._attr_name = f"ToDo Manager {sensor_type.capitalize()}"
-        self._attr_unique_id = f"{DOMAIN}_{sensor_type}"
+        self._attribute_budget = attribute_budget
+        self._attr_name = f"{coordinator.name} {sensor_type.capitalize()}"
+        self._attr_unique_id = f"{coordinator.key}_{sensor_type}"
         self._attr_icon = "mdi:format-list-checks"
 
+    def _fingerprint(self) -> Any:
+        """Return the fingerprint of the view of the sensor."""
+        return self.coordinator.get_view_fingerprint(self._sensor_type)
+
     @property
-    def native_value(self) -> int:
+    def native_value(self) -> int | None:
         """Return the state of the sensor."""
+        if not self.coordinator.hydrated:
+            # Counts of the last save, the overdue count may be behind
+            summary = self.coordinator.summary or {}
+            return summary.get(SUMMARY_COUNTS[self._sensor_type])
         if self._sensor_type == "all":
             return len(self.coordinator.todos)
         elif self._sensor_type == "active":
-            todos = self.coordinator.get_todos(filter_completed=True)
-            return len(todos)
+            return self.coordinator.get_active_count()
         elif self._sensor_type == "overdue":
-            todos = self.coordinator.get_todos(filter_completed=True)
-            now = datetime.now()
-            overdue_count = 0
-            for todo in todos:
-                due_date = todo.get("due_date")
-                due_time = todo.get("due_time", "23:59")
-                if due_date:
-                    try:
-                        due_str = f"{due_date} {due_time}"
-                        due_dt = datetime.strptime(due_str, "%Y-%m-%d %H:%M")
-                        if due_dt < now:
-                            overdue_count += 1
-                    except (ValueError, TypeError):
-                        pass
-            return overdue_count
+            return self.coordinator.get_overdue_count()
         return 0
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if self._sensor_type == "active":
-            todos = self.coordinator.get_todos(filter_completed=True)
-            # Include all todos, not just top 10, for frontend
+        if self._sensor_type == "active" and not self.coordinator.hydrated:
+            summary = self.coordinator.summary or {}
             return {
-                "todos": [self._todo_to_dict(t) for t in todos],
-                "total_count": len(todos),
-                "persons": self.coordinator.get_persons(),
+                "total_count": summary.get("active"),
+                "next_due": summary.get("next_due"),
+                "revision": self.coordinator.revision,
             }
+        if self._sensor_type == "active":
+            with self.coordinator.stats.measure("sensor_attributes"):
+                todos, truncated = self._budgeted_todos()
+                next_due = self.coordinator.get_next_due()
+                return {
+                    "todos": todos,
+                    "truncated": truncated,
+                    "total_count": self.coordinator.get_active_count(),
+                    "persons": self.coordinator.get_persons(),
+                    "open_by_type": self.coordinator.get_open_type_counts(),
+                    # Keyed by id, names need not be unique. The persons
+                    # attribute maps ids to names and colors
+                    "open_by_person": {
+                        person_id: self.coordinator.get_person_counts(person_id)[0]
+                        for person_id in self.coordinator.persons
+                    },
+                    "next_due": next_due.isoformat() if next_due else None,
+                    # Lets clients skip work while nothing changed
+                    "revision": self.coordinator.revision,
+                }
         return {}
 
-    def _todo_to_dict(self, todo: dict[str, Any]) -> dict[str, Any]:
-        """Convert todo dict to a simplified version for attributes."""
-        return {
-            "id": todo.get("id"),
-            "title": todo.get("title"),
-            "description": todo.get("description"),
-            "due_date": todo.get("due_date"),
-            "due_time": todo.get("due_time"),
-            "todo_type": todo.get("todo_type"),
-            "persons": todo.get("persons", []),
-            "recurring": todo.get("recurring", False),
-            "recurring_rule": todo.get("recurring_rule"),
-            "completed": todo.get("completed", False),
-            "completed_date": todo.get("completed_date"),
-            "result": todo.get("result"),
-            "items": todo.get("items", []),
-            "urgency_score": self.coordinator._get_urgency_score(todo),
-        }
+    def _budgeted_todos(self) -> tuple[list[dict[str, Any]], bool]:
+        """Return the open todos that fit the budget and if some were left out."""
+        todos = []
+        size = 0
+        for todo in self.coordinator.get_todos(filter_completed=True):
+            todo_dict = self.coordinator.todo_to_dict(todo)
+            if self._attribute_budget:
+                size += len(json_bytes(todo_dict)) + 1
+                if size > self._attribute_budget:
+                    return todos, True
+            todos.append(todo_dict)
+        return todos, False
+
+
+class TodoPersonSensor(TodoChangeSensor):
+    """Representation of a sensor counting the todos of a person."""
+
+    def __init__(
+        self,
+        coordinator: TodoCoordinator,
+        person_id: str,
+        sensor_type: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._person_id = person_id
+        self._sensor_type = sensor_type
+        self._attr_unique_id = _person_unique_id(
+            coordinator, person_id, sensor_type
+        )
+        self._attr_icon = "mdi:account-check"
+
+    def _fingerprint(self) -> Any:
+        """Return the counts and the name of the person."""
+        person = self.coordinator.get_person(self._person_id)
+        return (
+            self.coordinator.get_person_counts(self._person_id),
+            person.name if person else None,
+        )
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor, following person renames."""
+        person = self.coordinator.get_person(self._person_id)
+        return (
+            f"{self.coordinator.name} "
+            f"{person.name if person else self._person_id} "
+            f"{self._sensor_type.capitalize()}"
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the person still exists."""
+        return self._person_id in self.coordinator.persons
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        active, overdue = self.coordinator.get_person_counts(self._person_id)
+        return active if self._sensor_type == "active" else overdue
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return {"person_id": self._person_id}
+
+
+class TodoPerformanceSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the timings of the integration.
+
+    The state is the slowest p95 of all operations, the attributes hold
+    count, p50, p95 and max per operation.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"operations"})
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: TodoCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = f"{coordinator.name} Performance"
+        self._attr_unique_id = f"{coordinator.key}_performance"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the slowest p95 in milliseconds."""
+        summary = self.coordinator.stats.summary()
+        return max((s["p95"] for s in summary.values()), default=None)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the timings per operation."""
+        return {"operations": self.coordinator.stats.summary()}
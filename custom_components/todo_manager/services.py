@@ -1,26 +1,75 @@
 """Services for ToDo Manager."""
 from __future__ import annotations
 
+import functools
 import logging
-from datetime import datetime
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import date, time
 from typing import Any
 import uuid
 
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    CHANGE_CREATED,
+    CHANGE_DELETED,
+    CHANGE_UPDATED,
     DOMAIN,
     SERVICE_CREATE_TODO,
     SERVICE_UPDATE_TODO,
     SERVICE_DELETE_TODO,
     SERVICE_COMPLETE_TODO,
+    SERVICE_TOGGLE_ITEM,
     SERVICE_CREATE_PERSON,
     SERVICE_UPDATE_PERSON,
     SERVICE_DELETE_PERSON,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_BULK_UPDATE_TODOS,
+    SERVICE_BULK_COMPLETE_TODOS,
+    SERVICE_BULK_DELETE_TODOS,
+    SERVICE_DELETE_COMPLETED_TODOS,
+    SERVICE_PURGE_ARCHIVE,
+    SERVICE_SEARCH,
+    SERVICE_QUERY_TODOS,
+    SERVICE_IMPORT_TODOS,
+    SERVICE_EXPORT_TODOS,
+    SORT_CREATED_AT,
+    SORT_DUE_DATE,
+    SORT_TITLE,
+    SORT_URGENCY,
+    ATTR_ENTRY_ID,
     ATTR_TODO_ID,
+    ATTR_TODO_IDS,
+    ATTR_TODOS,
+    ATTR_BEFORE,
+    ATTR_PURGED,
+    ATTR_FILE,
+    ATTR_OVERWRITE,
+    ATTR_INCLUDE_ARCHIVE,
+    ATTR_IMPORTED,
+    ATTR_EXPORTED,
+    ATTR_REJECTED,
+    ATTR_REJECTED_ROWS,
+    ATTR_QUERY,
+    ATTR_LIMIT,
+    ATTR_CURSOR,
+    ATTR_COMPLETED,
+    ATTR_COMPLETED_DATE,
+    ATTR_SORT,
+    ATTR_OVERDUE,
+    ATTR_DUE_AFTER,
+    ATTR_DUE_BEFORE,
+    ATTR_OPEN_ITEMS,
     ATTR_TITLE,
     ATTR_DESCRIPTION,
     ATTR_DUE_DATE,
@@ -31,8 +80,8 @@ from .const import (
     ATTR_RECURRING_RULE,
     ATTR_RESULT,
     ATTR_ITEMS,
-    ATTR_ITEM_NAME,
-    ATTR_ITEM_QUANTITY,
+    ATTR_ITEM_ID,
+    ATTR_EXPECTED_REVISION,
     ATTR_PERSON_ID,
     ATTR_PERSON_NAME,
     ATTR_PERSON_COLOR,
@@ -42,15 +91,47 @@ from .const import (
     TODO_TYPE_PACKING,
 )
 
+from .models import (
+    END_OF_DAY,
+    Person,
+    RecurringRule,
+    Todo,
+    TodoItem,
+    TodoType,
+    local_now,
+    parse_datetime,
+)
+from .transfer import read_todos, resolve_path, write_todos
+
 _LOGGER = logging.getLogger(__name__)
 
-# Service schemas
+# Rejected rows listed in the response of an import, all are counted
+MAX_REJECTED_ROWS = 100
+
+
+def _due_date(value: Any) -> date | None:
+    """Validate a due date."""
+    if value is None or value == "":
+        return None
+    return cv.date(value)
+
+
+def _due_time(value: Any) -> time:
+    """Validate a due time to the minute, default end of day."""
+    if value is None or value == "":
+        return END_OF_DAY
+    return cv.time(value).replace(second=0, microsecond=0)
+
+
+# Service schemas, all services also take the entry they are meant for
+ENTRY_ID_SCHEMA = {vol.Optional(ATTR_ENTRY_ID): cv.string}
+
 CREATE_TODO_SCHEMA = vol.Schema(
     {
         vol.Required(ATTR_TITLE): cv.string,
         vol.Optional(ATTR_DESCRIPTION): cv.string,
-        vol.Optional(ATTR_DUE_DATE): cv.string,
-        vol.Optional(ATTR_DUE_TIME, default="23:59"): cv.string,
+        vol.Optional(ATTR_DUE_DATE): _due_date,
+        vol.Optional(ATTR_DUE_TIME, default="23:59"): _due_time,
         vol.Optional(ATTR_TODO_TYPE, default=TODO_TYPE_SIMPLE): vol.In(
             [TODO_TYPE_SIMPLE, TODO_TYPE_COMPLEX, TODO_TYPE_SHOPPING, TODO_TYPE_PACKING]
         ),
@@ -69,8 +150,8 @@ UPDATE_TODO_SCHEMA = vol.Schema(
         vol.Required(ATTR_TODO_ID): cv.string,
         vol.Optional(ATTR_TITLE): cv.string,
         vol.Optional(ATTR_DESCRIPTION): cv.string,
-        vol.Optional(ATTR_DUE_DATE): cv.string,
-        vol.Optional(ATTR_DUE_TIME): cv.string,
+        vol.Optional(ATTR_DUE_DATE): _due_date,
+        vol.Optional(ATTR_DUE_TIME): _due_time,
         vol.Optional(ATTR_TODO_TYPE): vol.In(
             [TODO_TYPE_SIMPLE, TODO_TYPE_COMPLEX, TODO_TYPE_SHOPPING, TODO_TYPE_PACKING]
         ),
@@ -82,6 +163,9 @@ UPDATE_TODO_SCHEMA = vol.Schema(
         }),
         vol.Optional(ATTR_RESULT): cv.string,
         vol.Optional(ATTR_ITEMS): vol.All(cv.ensure_list),
+        vol.Optional(ATTR_EXPECTED_REVISION): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
     }
 )
 
@@ -98,6 +182,9 @@ TOGGLE_ITEM_SCHEMA = vol.Schema(
     {
         vol.Required(ATTR_TODO_ID): cv.string,
         vol.Required(ATTR_ITEM_ID): cv.string,
+        vol.Optional(ATTR_EXPECTED_REVISION): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
     }
 )
 
@@ -118,124 +205,224 @@ UPDATE_PERSON_SCHEMA = vol.Schema(
 
 DELETE_PERSON_SCHEMA = vol.Schema({vol.Required(ATTR_PERSON_ID): cv.string})
 
+BULK_CREATE_TODOS_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_TODOS): vol.All(cv.ensure_list, [CREATE_TODO_SCHEMA])}
+)
 
-def get_coordinator(hass: HomeAssistant) -> Any:
-    """Get the coordinator from hass data."""
-    from .coordinator import TodoCoordinator
-    
-    # Find the coordinator in hass.data
+BULK_UPDATE_TODOS_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_TODOS): vol.All(cv.ensure_list, [UPDATE_TODO_SCHEMA])}
+)
+
+BULK_COMPLETE_TODOS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TODO_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_RESULT): cv.string,
+    }
+)
+
+BULK_DELETE_TODOS_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_TODO_IDS): vol.All(cv.ensure_list, [cv.string])}
+)
+
+DELETE_COMPLETED_TODOS_SCHEMA = vol.Schema({vol.Required(ATTR_BEFORE): cv.date})
+
+PURGE_ARCHIVE_SCHEMA = vol.Schema({vol.Optional(ATTR_BEFORE): cv.date})
+
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_QUERY): cv.string,
+        vol.Optional(ATTR_PERSON_ID): cv.string,
+        vol.Optional(ATTR_COMPLETED): cv.boolean,
+        vol.Optional(ATTR_CURSOR, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+QUERY_TODOS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PERSON_ID): cv.string,
+        vol.Optional(ATTR_TODO_TYPE): vol.In(
+            [TODO_TYPE_SIMPLE, TODO_TYPE_COMPLEX, TODO_TYPE_SHOPPING, TODO_TYPE_PACKING]
+        ),
+        vol.Optional(ATTR_COMPLETED): cv.boolean,
+        vol.Optional(ATTR_OVERDUE): cv.boolean,
+        vol.Optional(ATTR_DUE_AFTER): cv.date,
+        vol.Optional(ATTR_DUE_BEFORE): cv.date,
+        vol.Optional(ATTR_RECURRING): cv.boolean,
+        vol.Optional(ATTR_OPEN_ITEMS): cv.boolean,
+        vol.Optional(ATTR_SORT, default=SORT_URGENCY): vol.In(
+            [SORT_URGENCY, SORT_DUE_DATE, SORT_TITLE, SORT_CREATED_AT]
+        ),
+        vol.Optional(ATTR_CURSOR, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+IMPORT_TODOS_SCHEMA = vol.Schema({vol.Required(ATTR_FILE): cv.string})
+
+EXPORT_TODOS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_OVERWRITE, default=False): cv.boolean,
+        vol.Optional(ATTR_INCLUDE_ARCHIVE, default=False): cv.boolean,
+    }
+)
+
+# A row of an imported file, as create_todo takes it plus the state of the
+# todo. Empty values are left out before.
+IMPORTED_TODO_SCHEMA = CREATE_TODO_SCHEMA.extend(
+    {
+        vol.Optional("id"): cv.string,
+        vol.Optional(ATTR_COMPLETED, default=False): cv.boolean,
+        vol.Optional(ATTR_COMPLETED_DATE): cv.datetime,
+        vol.Optional(ATTR_RESULT): cv.string,
+        vol.Optional("created_at"): cv.datetime,
+        vol.Optional("series_id"): cv.string,
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+
+def get_coordinator(
+    hass: HomeAssistant, data: Mapping[str, Any] | None = None
+) -> Any:
+    """Get the coordinator of the config entry a call is meant for.
+
+    Calls name their entry with entry_id, found with a single lookup.
+    Without it the only entry is used, or with several entries the one
+    holding the todo or person the call refers to. Bulk updates refer to
+    their todos through the todo_id of each update.
+    """
     domain_data = hass.data.get(DOMAIN, {})
-    
-    # Try to get from config entry first
-    config_entries = hass.config_entries.async_entries(DOMAIN)
-    if config_entries:
-        coordinator = domain_data.get(config_entries[0].entry_id)
-        if isinstance(coordinator, TodoCoordinator):
+    data = data or {}
+    if (entry_id := data.get(ATTR_ENTRY_ID)) is not None:
+        return domain_data.get(entry_id)
+    if len(domain_data) == 1:
+        return next(iter(domain_data.values()))
+
+    todo_ids = (
+        data.get(ATTR_TODO_IDS)
+        or [todo.get(ATTR_TODO_ID) for todo in data.get(ATTR_TODOS, ())]
+        or [data.get(ATTR_TODO_ID)]
+    )
+    person_id = data.get(ATTR_PERSON_ID)
+    for coordinator in domain_data.values():
+        if todo_ids[0] in coordinator.todos or person_id in coordinator.persons:
             return coordinator
-    
-    # Fallback: find any coordinator
-    for key, value in domain_data.items():
-        if isinstance(value, TodoCoordinator):
-            return value
-    
     return None
 
 
+def _build_items(
+    items: list[Any], current: list[TodoItem] | None = None
+) -> list[TodoItem]:
+    """Build list items from names or item dicts.
+
+    Items given without a checked state keep the one of the current item
+    with the same id, so editing a list doesn't undo items toggled since.
+    """
+    checked = {item.id: item.checked for item in current or ()}
+    built = []
+    for data in items:
+        item = TodoItem.from_dict(data)
+        if item.id in checked and not (isinstance(data, dict) and "checked" in data):
+            item.checked = checked[item.id]
+        built.append(item)
+    return built
+
+
+def _check_revision(todo: Todo, data: dict[str, Any]) -> None:
+    """Raise if the todo changed since the caller read the expected revision.
+
+    Handlers check and apply a change without awaiting in between, so no
+    other mutation can slip in after the check.
+    """
+    expected = data.get(ATTR_EXPECTED_REVISION)
+    if expected is not None and expected != todo.revision:
+        raise ServiceValidationError(
+            f"Todo {todo.id} was changed in the meantime "
+            f"(revision {todo.revision}, expected {expected})"
+        )
+
+
+def _build_todo(data: dict[str, Any]) -> Todo:
+    """Build a new todo from validated create_todo data."""
+    return Todo(
+        id=str(uuid.uuid4()),
+        title=data[ATTR_TITLE],
+        description=data.get(ATTR_DESCRIPTION, ""),
+        due_date=data.get(ATTR_DUE_DATE),
+        due_time=data.get(ATTR_DUE_TIME, END_OF_DAY),
+        todo_type=TodoType(data.get(ATTR_TODO_TYPE, TODO_TYPE_SIMPLE)),
+        persons=list(data.get(ATTR_PERSONS, [])),
+        recurring=data.get(ATTR_RECURRING, False),
+        recurring_rule=RecurringRule.from_dict(data.get(ATTR_RECURRING_RULE)),
+        items=_build_items(data.get(ATTR_ITEMS, [])),
+        created_at=local_now(),
+    )
+
+
+def _apply_todo_update(todo: Todo, data: dict[str, Any]) -> None:
+    """Apply validated update_todo data to a todo."""
+    # Update allowed fields
+    if ATTR_TITLE in data:
+        todo.title = data[ATTR_TITLE]
+    if ATTR_DESCRIPTION in data:
+        todo.description = data[ATTR_DESCRIPTION]
+    if ATTR_DUE_DATE in data:
+        todo.due_date = data[ATTR_DUE_DATE]
+    if ATTR_DUE_TIME in data:
+        todo.due_time = data[ATTR_DUE_TIME]
+    if ATTR_TODO_TYPE in data:
+        todo.todo_type = TodoType(data[ATTR_TODO_TYPE])
+    if ATTR_PERSONS in data:
+        todo.persons = list(data[ATTR_PERSONS])
+    if ATTR_RECURRING in data:
+        todo.recurring = data[ATTR_RECURRING]
+    if ATTR_RECURRING_RULE in data:
+        todo.recurring_rule = RecurringRule.from_dict(data[ATTR_RECURRING_RULE])
+    if ATTR_RESULT in data:
+        todo.result = data[ATTR_RESULT]
+    if ATTR_ITEMS in data:
+        todo.items = _build_items(data[ATTR_ITEMS], todo.items)
+    if "completed" in data:
+        todo.completed = data["completed"]
+        if not data["completed"]:
+            # Keeps the next occurrence, see Todo.set_completed
+            todo.completed_date = None
+
+
 @callback
 async def async_create_todo_service(service: ServiceCall) -> None:
     """Handle create todo service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
-
-    todo_id = str(uuid.uuid4())
-    todo_data = {
-        "id": todo_id,
-        "title": service.data[ATTR_TITLE],
-        "description": service.data.get(ATTR_DESCRIPTION, ""),
-        "due_date": service.data.get(ATTR_DUE_DATE),
-        "due_time": service.data.get(ATTR_DUE_TIME, "23:59"),
-        "todo_type": service.data.get(ATTR_TODO_TYPE, TODO_TYPE_SIMPLE),
-        "persons": service.data.get(ATTR_PERSONS, []),
-        "recurring": service.data.get(ATTR_RECURRING, False),
-        "recurring_rule": service.data.get(ATTR_RECURRING_RULE),
-        "completed": False,
-        "completed_date": None,
-        "result": None,
-        "items": service.data.get(ATTR_ITEMS, []),
-        "created_at": datetime.now().isoformat(),
-    }
-    
-    # Initialize items for shopping and packing lists
-    if todo_data["todo_type"] in [TODO_TYPE_SHOPPING, TODO_TYPE_PACKING]:
-        if not todo_data["items"]:
-            todo_data["items"] = []
-        else:
-            # Ensure items have the right structure
-            formatted_items = []
-            for item in todo_data["items"]:
-                if isinstance(item, dict):
-                    formatted_items.append({
-                        "id": item.get("id", str(uuid.uuid4())),
-                        "name": item.get("name", item.get(ATTR_ITEM_NAME, "")),
-                        "quantity": item.get("quantity", item.get(ATTR_ITEM_QUANTITY, "")),
-                        "checked": item.get("checked", False),
-                    })
-                else:
-                    formatted_items.append({
-                        "id": str(uuid.uuid4()),
-                        "name": str(item),
-                        "quantity": "",
-                        "checked": False,
-                    })
-            todo_data["items"] = formatted_items
-    
-    coordinator.todos[todo_id] = todo_data
+    coordinator = _get_service_coordinator(service)
+
+    todo = _build_todo(service.data)
+    coordinator.todos[todo.id] = todo
+    coordinator.async_todo_changed(todo.id, CHANGE_CREATED)
     await coordinator.async_save_data()
-    _LOGGER.info("Created todo: %s", todo_data["title"])
+    _LOGGER.info("Created todo: %s", todo.title)
 
 
 @callback
 async def async_update_todo_service(service: ServiceCall) -> None:
     """Handle update todo service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     todo_id = service.data[ATTR_TODO_ID]
-    todo = coordinator.todos.get(todo_id)
-    if not todo:
-        _LOGGER.error("Todo not found: %s", todo_id)
-        return
+    todo = _get_todo(coordinator, todo_id)
 
-    # Update allowed fields
-    if ATTR_TITLE in service.data:
-        todo["title"] = service.data[ATTR_TITLE]
-    if ATTR_DESCRIPTION in service.data:
-        todo["description"] = service.data[ATTR_DESCRIPTION]
-    if ATTR_DUE_DATE in service.data:
-        todo["due_date"] = service.data[ATTR_DUE_DATE]
-    if ATTR_DUE_TIME in service.data:
-        todo["due_time"] = service.data[ATTR_DUE_TIME]
-    if ATTR_TODO_TYPE in service.data:
-        todo["todo_type"] = service.data[ATTR_TODO_TYPE]
-    if ATTR_PERSONS in service.data:
-        todo["persons"] = service.data[ATTR_PERSONS]
-    if ATTR_RECURRING in service.data:
-        todo["recurring"] = service.data[ATTR_RECURRING]
-    if ATTR_RECURRING_RULE in service.data:
-        todo["recurring_rule"] = service.data[ATTR_RECURRING_RULE]
-    if ATTR_RESULT in service.data:
-        todo["result"] = service.data[ATTR_RESULT]
-    if ATTR_ITEMS in service.data:
-        todo["items"] = service.data[ATTR_ITEMS]
-    if "completed" in service.data:
-        todo["completed"] = service.data["completed"]
-        if not service.data["completed"]:
-            todo["completed_date"] = None
+    _check_revision(todo, service.data)
+    _apply_todo_update(todo, service.data)
 
+    coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
     await coordinator.async_save_data()
     _LOGGER.info("Updated todo: %s", todo_id)
 
@@ -243,50 +430,28 @@ async def async_update_todo_service(service: ServiceCall) -> None:
 @callback
 async def async_delete_todo_service(service: ServiceCall) -> None:
     """Handle delete todo service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     todo_id = service.data[ATTR_TODO_ID]
-    if todo_id in coordinator.todos:
-        del coordinator.todos[todo_id]
-        await coordinator.async_save_data()
-        _LOGGER.info("Deleted todo: %s", todo_id)
-    else:
-        _LOGGER.error("Todo not found: %s", todo_id)
+    _get_todo(coordinator, todo_id)
+    del coordinator.todos[todo_id]
+    coordinator.async_todo_changed(todo_id, CHANGE_DELETED)
+    await coordinator.async_save_data()
+    _LOGGER.info("Deleted todo: %s", todo_id)
 
 
 @callback
 async def async_complete_todo_service(service: ServiceCall) -> None:
     """Handle complete todo service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     todo_id = service.data[ATTR_TODO_ID]
-    todo = coordinator.todos.get(todo_id)
-    if not todo:
-        _LOGGER.error("Todo not found: %s", todo_id)
-        return
+    todo = _get_todo(coordinator, todo_id)
 
     # Toggle completion
-    was_completed = todo.get("completed", False)
-    todo["completed"] = not was_completed
-    
-    if todo["completed"]:
-        todo["completed_date"] = datetime.now().isoformat()
-        if ATTR_RESULT in service.data and service.data[ATTR_RESULT]:
-            todo["result"] = service.data[ATTR_RESULT]
-        # For complex todos, keep existing result if not provided
-        if todo.get("todo_type") == TODO_TYPE_COMPLEX and ATTR_RESULT not in service.data:
-            # Don't clear result if already exists
-            pass
-    else:
-        todo["completed_date"] = None
-        # Optionally keep result when uncompleting
+    todo.set_completed(not todo.completed, service.data.get(ATTR_RESULT))
 
+    coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
     await coordinator.async_save_data()
     _LOGGER.info("Completed todo: %s", todo_id)
 
@@ -294,27 +459,19 @@ async def async_complete_todo_service(service: ServiceCall) -> None:
 @callback
 async def async_toggle_item_service(service: ServiceCall) -> None:
     """Handle toggle item service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     todo_id = service.data[ATTR_TODO_ID]
     item_id = service.data[ATTR_ITEM_ID]
     
-    todo = coordinator.todos.get(todo_id)
-    if not todo:
-        _LOGGER.error("Todo not found: %s", todo_id)
-        return
-
-    items = todo.get("items", [])
-    item = next((i for i in items if i.get("id") == item_id), None)
-    
+    todo = _get_todo(coordinator, todo_id)
+    item = next((i for i in todo.items if i.id == item_id), None)
     if not item:
-        _LOGGER.error("Item not found: %s in todo %s", item_id, todo_id)
-        return
+        raise ServiceValidationError(f"Item not found: {item_id} in todo {todo_id}")
 
-    item["checked"] = not item.get("checked", False)
+    _check_revision(todo, service.data)
+    item.checked = not item.checked
+    coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
     await coordinator.async_save_data()
     _LOGGER.info("Toggled item %s in todo %s", item_id, todo_id)
 
@@ -322,42 +479,34 @@ async def async_toggle_item_service(service: ServiceCall) -> None:
 @callback
 async def async_create_person_service(service: ServiceCall) -> None:
     """Handle create person service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
-
-    person_id = str(uuid.uuid4())
-    person_data = {
-        "id": person_id,
-        "name": service.data[ATTR_PERSON_NAME],
-        "color": service.data.get(ATTR_PERSON_COLOR, "#1976d2"),
-    }
+    coordinator = _get_service_coordinator(service)
+
+    person = Person(
+        str(uuid.uuid4()),
+        service.data[ATTR_PERSON_NAME],
+        service.data.get(ATTR_PERSON_COLOR, "#1976d2"),
+    )
 
-    coordinator.persons[person_id] = person_data
+    coordinator.persons[person.id] = person
+    coordinator.async_person_changed(person.id, CHANGE_CREATED)
     await coordinator.async_save_data()
-    _LOGGER.info("Created person: %s", person_data["name"])
+    _LOGGER.info("Created person: %s", person.name)
 
 
 @callback
 async def async_update_person_service(service: ServiceCall) -> None:
     """Handle update person service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     person_id = service.data[ATTR_PERSON_ID]
-    person = coordinator.persons.get(person_id)
-    if not person:
-        _LOGGER.error("Person not found: %s", person_id)
-        return
+    person = _get_person(coordinator, person_id)
 
     if ATTR_PERSON_NAME in service.data:
-        person["name"] = service.data[ATTR_PERSON_NAME]
+        person.name = service.data[ATTR_PERSON_NAME]
     if ATTR_PERSON_COLOR in service.data:
-        person["color"] = service.data[ATTR_PERSON_COLOR]
+        person.color = service.data[ATTR_PERSON_COLOR]
 
+    coordinator.async_person_changed(person_id, CHANGE_UPDATED)
     await coordinator.async_save_data()
     _LOGGER.info("Updated person: %s", person_id)
 
@@ -365,48 +514,510 @@ async def async_update_person_service(service: ServiceCall) -> None:
 @callback
 async def async_delete_person_service(service: ServiceCall) -> None:
     """Handle delete person service call."""
-    coordinator = get_coordinator(service.hass)
-    if not coordinator:
-        _LOGGER.error("Coordinator not found")
-        return
+    coordinator = _get_service_coordinator(service)
 
     person_id = service.data[ATTR_PERSON_ID]
-    if person_id in coordinator.persons:
-        # Remove person from all todos
-        for todo in coordinator.todos.values():
-            if person_id in todo.get("persons", []):
-                todo["persons"].remove(person_id)
-        
-        del coordinator.persons[person_id]
-        await coordinator.async_save_data()
-        _LOGGER.info("Deleted person: %s", person_id)
+    _get_person(coordinator, person_id)
+    # Remove person from all todos
+    for todo_id in coordinator.get_person_todo_ids(person_id):
+        todo = coordinator.todos[todo_id]
+        todo.persons = [p for p in todo.persons if p != person_id]
+        coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
+
+    del coordinator.persons[person_id]
+    coordinator.async_person_changed(person_id, CHANGE_DELETED)
+    await coordinator.async_save_data()
+    _LOGGER.info("Deleted person: %s", person_id)
+
+
+def _get_service_coordinator(service: ServiceCall) -> Any:
+    """Get the coordinator for a service call or raise."""
+    coordinator = get_coordinator(service.hass, service.data)
+    if coordinator is not None:
+        return coordinator
+    if (entry_id := service.data.get(ATTR_ENTRY_ID)) is not None:
+        raise ServiceValidationError(f"ToDo Manager list not found: {entry_id}")
+    if not service.hass.data.get(DOMAIN):
+        raise ServiceValidationError("No ToDo Manager list is configured")
+    raise ServiceValidationError(
+        "entry_id is required when more than one list is configured"
+    )
+
+
+def _get_todo(coordinator: Any, todo_id: str) -> Todo:
+    """Get a todo of a service call or raise."""
+    if (todo := coordinator.todos.get(todo_id)) is None:
+        raise ServiceValidationError(f"Todo not found: {todo_id}")
+    return todo
+
+
+def _get_person(coordinator: Any, person_id: str) -> Person:
+    """Get a person of a service call or raise."""
+    if (person := coordinator.persons.get(person_id)) is None:
+        raise ServiceValidationError(f"Person not found: {person_id}")
+    return person
+
+
+def _ensure_todos_exist(coordinator: Any, todo_ids: list[str]) -> None:
+    """Raise before a bulk change touches anything if a todo is missing."""
+    missing = [todo_id for todo_id in todo_ids if todo_id not in coordinator.todos]
+    if missing:
+        raise ServiceValidationError(f"Todos not found: {', '.join(missing)}")
+
+
+async def async_bulk_create_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle bulk create todos service call."""
+    coordinator = _get_service_coordinator(service)
+
+    todos = [_build_todo(data) for data in service.data[ATTR_TODOS]]
+    for todo in todos:
+        coordinator.todos[todo.id] = todo
+        coordinator.async_todo_changed(todo.id, CHANGE_CREATED)
+
+    await coordinator.async_save_data()
+    _LOGGER.info("Created %d todos", len(todos))
+    return {ATTR_TODO_IDS: [todo.id for todo in todos]}
+
+
+async def async_bulk_update_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle bulk update todos service call."""
+    coordinator = _get_service_coordinator(service)
+
+    updates = service.data[ATTR_TODOS]
+    _ensure_todos_exist(coordinator, [data[ATTR_TODO_ID] for data in updates])
+    # Apply nothing if any todo was changed in the meantime
+    for data in updates:
+        _check_revision(coordinator.todos[data[ATTR_TODO_ID]], data)
+    for data in updates:
+        _apply_todo_update(coordinator.todos[data[ATTR_TODO_ID]], data)
+        coordinator.async_todo_changed(data[ATTR_TODO_ID], CHANGE_UPDATED)
+
+    await coordinator.async_save_data()
+    _LOGGER.info("Updated %d todos", len(updates))
+    return {ATTR_TODO_IDS: [data[ATTR_TODO_ID] for data in updates]}
+
+
+async def async_bulk_complete_todos_service(
+    service: ServiceCall,
+) -> ServiceResponse:
+    """Handle bulk complete todos service call.
+
+    Unlike complete_todo this doesn't toggle, todos that are already
+    completed stay untouched.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    todo_ids = service.data[ATTR_TODO_IDS]
+    _ensure_todos_exist(coordinator, todo_ids)
+    completed = []
+    for todo_id in dict.fromkeys(todo_ids):
+        todo = coordinator.todos[todo_id]
+        if todo.completed:
+            continue
+        todo.set_completed(True, service.data.get(ATTR_RESULT))
+        coordinator.async_todo_changed(todo_id, CHANGE_UPDATED)
+        completed.append(todo_id)
+
+    await coordinator.async_save_data()
+    _LOGGER.info("Completed %d todos", len(completed))
+    return {ATTR_TODO_IDS: completed}
+
+
+async def async_bulk_delete_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle bulk delete todos service call."""
+    coordinator = _get_service_coordinator(service)
+
+    todo_ids = list(dict.fromkeys(service.data[ATTR_TODO_IDS]))
+    _ensure_todos_exist(coordinator, todo_ids)
+    _delete_todos(coordinator, todo_ids)
+
+    await coordinator.async_save_data()
+    _LOGGER.info("Deleted %d todos", len(todo_ids))
+    return {ATTR_TODO_IDS: todo_ids}
+
+
+async def async_delete_completed_todos_service(
+    service: ServiceCall,
+) -> ServiceResponse:
+    """Handle delete completed todos service call."""
+    coordinator = _get_service_coordinator(service)
+
+    before = service.data[ATTR_BEFORE]
+    todo_ids = [
+        todo.id
+        for todo in coordinator.get_completed_todos()
+        if todo.completed_date and todo.completed_date.date() < before
+    ]
+    _delete_todos(coordinator, todo_ids)
+
+    await coordinator.async_save_data()
+    _LOGGER.info("Deleted %d todos completed before %s", len(todo_ids), before)
+    return {ATTR_TODO_IDS: todo_ids}
+
+
+async def async_purge_archive_service(service: ServiceCall) -> ServiceResponse:
+    """Handle purge archive service call.
+
+    Without a date the whole archive is emptied.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    before = service.data.get(ATTR_BEFORE)
+    purged = await coordinator.archive.async_purge(before)
+    if before:
+        _LOGGER.info("Purged %d archived todos completed before %s", purged, before)
     else:
-        _LOGGER.error("Person not found: %s", person_id)
+        _LOGGER.info("Purged %d archived todos", purged)
+    return {ATTR_PURGED: purged}
+
+
+async def async_search_service(service: ServiceCall) -> ServiceResponse:
+    """Handle search service call.
+
+    Returns one page of matches, best first, with the cursor of the next
+    page or None on the last page.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    query = service.data[ATTR_QUERY]
+    matches = coordinator.search_todos(
+        query,
+        person=service.data.get(ATTR_PERSON_ID),
+        completed=service.data.get(ATTR_COMPLETED),
+    )
+    start = service.data[ATTR_CURSOR]
+    end = start + service.data[ATTR_LIMIT]
+    return {
+        ATTR_TODOS: [
+            coordinator.search_result_to_dict(todo, score, query)
+            for todo, score in matches[start:end]
+        ],
+        "total": len(matches),
+        "next_cursor": end if end < len(matches) else None,
+    }
+
+
+async def async_query_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle query todos service call.
+
+    Returns one page of the todos matching all given filters with the
+    cursor of the next page or None on the last page.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    todos = coordinator.query_todos(
+        person=service.data.get(ATTR_PERSON_ID),
+        todo_type=service.data.get(ATTR_TODO_TYPE),
+        completed=service.data.get(ATTR_COMPLETED),
+        overdue=service.data.get(ATTR_OVERDUE),
+        due_after=service.data.get(ATTR_DUE_AFTER),
+        due_before=service.data.get(ATTR_DUE_BEFORE),
+        recurring=service.data.get(ATTR_RECURRING),
+        open_items=service.data.get(ATTR_OPEN_ITEMS),
+        sort=service.data[ATTR_SORT],
+    )
+    start = service.data[ATTR_CURSOR]
+    end = start + service.data[ATTR_LIMIT]
+    return {
+        ATTR_TODOS: [coordinator.todo_to_dict(todo) for todo in todos[start:end]],
+        "total": len(todos),
+        "next_cursor": end if end < len(todos) else None,
+    }
+
+
+def _build_imported_todo(data: dict[str, Any]) -> Todo:
+    """Build a todo from a validated row of an imported file.
+
+    The id of the row is kept, so importing a backup restores its links
+    between occurrences.
+    """
+    todo = _build_todo(data)
+    todo.id = data.get("id", todo.id)
+    todo.completed = data[ATTR_COMPLETED]
+    if todo.completed:
+        todo.completed_date = parse_datetime(data.get(ATTR_COMPLETED_DATE))
+        todo.completed_date = todo.completed_date or local_now()
+        todo.result = data.get(ATTR_RESULT)
+    if created_at := data.get("created_at"):
+        todo.created_at = parse_datetime(created_at)
+    todo.series_id = data.get("series_id")
+    return todo
+
+
+def _read_import(
+    config_dir: str, file: str, rejected: list[dict[str, Any]]
+) -> list[tuple[int, Todo]]:
+    """Read and validate the todos of a file, run in the executor."""
+
+    def reject(line: int, error: str) -> None:
+        rejected.append({"line": line, "error": error})
+
+    todos = []
+    for line, row in read_todos(resolve_path(config_dir, file), reject):
+        try:
+            data = IMPORTED_TODO_SCHEMA(
+                {key: value for key, value in row.items() if value not in (None, "")}
+            )
+        except vol.Invalid as err:
+            reject(line, str(err))
+            continue
+        todos.append((line, _build_imported_todo(data)))
+    return todos
+
+
+async def async_import_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle import todos service call.
+
+    The file is read and validated in the executor. Valid todos are added
+    with a single save, the others are reported with their line. Todos
+    whose id exists, also in the archive, are rejected. Persons are
+    matched by id or name, unknown ones are left out.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    file = service.data[ATTR_FILE]
+    rejected: list[dict[str, Any]] = []
+    try:
+        todos = await service.hass.async_add_executor_job(
+            _read_import, service.hass.config.config_dir, file, rejected
+        )
+    except (OSError, ValueError) as err:
+        raise ServiceValidationError(f"Can't import {file}: {err}") from err
+    # Re-importing an export with the archive must not revive archived todos
+    archived = await coordinator.archive.async_load()
+
+    person_ids = {
+        person.name.casefold(): person_id
+        for person_id, person in coordinator.persons.items()
+    }
+    imported = 0
+    for line, todo in todos:
+        # Also rejects a todo listed twice
+        if todo.id in coordinator.todos:
+            rejected.append({"line": line, "error": f"Todo exists: {todo.id}"})
+            continue
+        if todo.id in archived:
+            rejected.append({"line": line, "error": f"Todo is archived: {todo.id}"})
+            continue
+        persons: list[str] = []
+        for person in todo.persons:
+            if person not in coordinator.persons:
+                person = person_ids.get(person.casefold())
+            if person and person not in persons:
+                persons.append(person)
+        todo.persons = persons
+        coordinator.todos[todo.id] = todo
+        coordinator.async_todo_changed(todo.id, CHANGE_CREATED)
+        imported += 1
+
+    if imported:
+        await coordinator.async_save_data()
+    rejected.sort(key=lambda row: row["line"])
+    _LOGGER.info(
+        "Imported %d todos from %s, rejected %d", imported, file, len(rejected)
+    )
+    return {
+        ATTR_IMPORTED: imported,
+        ATTR_REJECTED: len(rejected),
+        ATTR_REJECTED_ROWS: rejected[:MAX_REJECTED_ROWS],
+    }
+
+
+async def async_export_todos_service(service: ServiceCall) -> ServiceResponse:
+    """Handle export todos service call.
+
+    The todos are copied as they are now and written in the executor.
+    """
+    coordinator = _get_service_coordinator(service)
+
+    file = service.data[ATTR_FILE]
+    todos = [todo.as_dict() for todo in coordinator.todos.values()]
+    if service.data[ATTR_INCLUDE_ARCHIVE]:
+        todos.extend((await coordinator.archive.async_load()).values())
+    person_names = {
+        person_id: person.name for person_id, person in coordinator.persons.items()
+    }
+
+    def export() -> int:
+        path = resolve_path(service.hass.config.config_dir, file)
+        return write_todos(path, todos, person_names, service.data[ATTR_OVERWRITE])
+
+    try:
+        exported = await service.hass.async_add_executor_job(export)
+    except (OSError, ValueError) as err:
+        raise ServiceValidationError(f"Can't export to {file}: {err}") from err
+    _LOGGER.info("Exported %d todos to %s", exported, file)
+    return {ATTR_EXPORTED: exported, ATTR_FILE: file}
+
+
+async def _async_wait_hydrated(service: ServiceCall) -> None:
+    """Wait until the todos of the entry a call is meant for are loaded.
+
+    Routing by todo or person with several entries needs the todos of all
+    of them.
+    """
+    coordinator = get_coordinator(service.hass, service.data)
+    if coordinator is None:
+        for other in list(service.hass.data.get(DOMAIN, {}).values()):
+            await other.async_wait_hydrated()
+        coordinator = get_coordinator(service.hass, service.data)
+    if coordinator is not None:
+        await coordinator.async_wait_hydrated()
+
+
+def _hydrated(
+    handler: Callable[[ServiceCall], Awaitable[ServiceResponse]],
+) -> Callable[[ServiceCall], Awaitable[ServiceResponse]]:
+    """Hold calls arriving during startup until the todos are loaded."""
+
+    @functools.wraps(handler)
+    async def hydrated_handler(service: ServiceCall) -> ServiceResponse:
+        await _async_wait_hydrated(service)
+        return await handler(service)
+
+    return hydrated_handler
+
+
+def _timed(
+    handler: Callable[[ServiceCall], Awaitable[ServiceResponse]],
+) -> Callable[[ServiceCall], Awaitable[ServiceResponse]]:
+    """Record the duration of a service handler in the coordinator stats."""
+
+    @functools.wraps(handler)
+    async def timed_handler(service: ServiceCall) -> ServiceResponse:
+        coordinator = get_coordinator(service.hass, service.data)
+        if not coordinator:
+            return await handler(service)
+        with coordinator.stats.measure(f"service.{service.service}"):
+            return await handler(service)
+
+    return timed_handler
+
+
+def _delete_todos(coordinator: Any, todo_ids: list[str]) -> None:
+    """Delete todos that are known to exist."""
+    for todo_id in todo_ids:
+        del coordinator.todos[todo_id]
+        coordinator.async_todo_changed(todo_id, CHANGE_DELETED)
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for ToDo Manager."""
     hass.services.async_register(
-        DOMAIN, SERVICE_CREATE_TODO, async_create_todo_service, schema=CREATE_TODO_SCHEMA
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        _hydrated(_timed(async_create_todo_service)),
+        schema=CREATE_TODO_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        _hydrated(_timed(async_update_todo_service)),
+        schema=UPDATE_TODO_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_TODO,
+        _hydrated(_timed(async_delete_todo_service)),
+        schema=DELETE_TODO_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPLETE_TODO,
+        _hydrated(_timed(async_complete_todo_service)),
+        schema=COMPLETE_TODO_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TOGGLE_ITEM,
+        _hydrated(_timed(async_toggle_item_service)),
+        schema=TOGGLE_ITEM_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_PERSON,
+        _hydrated(_timed(async_create_person_service)),
+        schema=CREATE_PERSON_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_PERSON,
+        _hydrated(_timed(async_update_person_service)),
+        schema=UPDATE_PERSON_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_PERSON,
+        _hydrated(_timed(async_delete_person_service)),
+        schema=DELETE_PERSON_SCHEMA.extend(ENTRY_ID_SCHEMA),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_CREATE_TODOS,
+        _hydrated(_timed(async_bulk_create_todos_service)),
+        schema=BULK_CREATE_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_UPDATE_TODOS,
+        _hydrated(_timed(async_bulk_update_todos_service)),
+        schema=BULK_UPDATE_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMPLETE_TODOS,
+        _hydrated(_timed(async_bulk_complete_todos_service)),
+        schema=BULK_COMPLETE_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_UPDATE_TODO, async_update_todo_service, schema=UPDATE_TODO_SCHEMA
+        DOMAIN,
+        SERVICE_BULK_DELETE_TODOS,
+        _hydrated(_timed(async_bulk_delete_todos_service)),
+        schema=BULK_DELETE_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_DELETE_TODO, async_delete_todo_service, schema=DELETE_TODO_SCHEMA
+        DOMAIN,
+        SERVICE_DELETE_COMPLETED_TODOS,
+        _hydrated(_timed(async_delete_completed_todos_service)),
+        schema=DELETE_COMPLETED_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_COMPLETE_TODO, async_complete_todo_service, schema=COMPLETE_TODO_SCHEMA
+        DOMAIN,
+        SERVICE_PURGE_ARCHIVE,
+        _hydrated(_timed(async_purge_archive_service)),
+        schema=PURGE_ARCHIVE_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_TOGGLE_ITEM, async_toggle_item_service, schema=TOGGLE_ITEM_SCHEMA
+        DOMAIN,
+        SERVICE_SEARCH,
+        _hydrated(_timed(async_search_service)),
+        schema=SEARCH_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_CREATE_PERSON, async_create_person_service, schema=CREATE_PERSON_SCHEMA
+        DOMAIN,
+        SERVICE_QUERY_TODOS,
+        _hydrated(_timed(async_query_todos_service)),
+        schema=QUERY_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_UPDATE_PERSON, async_update_person_service, schema=UPDATE_PERSON_SCHEMA
+        DOMAIN,
+        SERVICE_IMPORT_TODOS,
+        _hydrated(_timed(async_import_todos_service)),
+        schema=IMPORT_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_DELETE_PERSON, async_delete_person_service, schema=DELETE_PERSON_SCHEMA
+        DOMAIN,
+        SERVICE_EXPORT_TODOS,
+        _hydrated(_timed(async_export_todos_service)),
+        schema=EXPORT_TODOS_SCHEMA.extend(ENTRY_ID_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
     )
@@ -0,0 +1,75 @@
+"""Runtime timing of ToDo Manager operations."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+from time import perf_counter
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Timings kept per operation for the percentiles
+WINDOW = 200
+# Operations taking longer are logged and kept for diagnostics
+SLOW_OPERATION_MS = 100.0
+SLOW_OPERATION_COUNT = 20
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    """Return the nearest rank percentile of sorted values."""
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[rank - 1]
+
+
+class OperationStats:
+    """Rolling timings of services, saves, updates and sensor attributes."""
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self._timings: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+        self.slow_operations: deque[dict[str, Any]] = deque(
+            maxlen=SLOW_OPERATION_COUNT
+        )
+
+    def record(self, operation: str, duration_ms: float) -> None:
+        """Record how long an operation took."""
+        self._timings.setdefault(operation, deque(maxlen=WINDOW)).append(
+            duration_ms
+        )
+        self._counts[operation] = self._counts.get(operation, 0) + 1
+        if duration_ms >= SLOW_OPERATION_MS:
+            _LOGGER.debug("%s took %.1f ms", operation, duration_ms)
+            self.slow_operations.append(
+                {
+                    "operation": operation,
+                    "duration_ms": round(duration_ms, 1),
+                    "at": datetime.now().isoformat(),
+                }
+            )
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        """Time the body of a with block, also across awaits."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, (perf_counter() - start) * 1000)
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Return count, p50, p95 and max in milliseconds per operation."""
+        summary = {}
+        for operation, timings in sorted(self._timings.items()):
+            ordered = sorted(timings)
+            summary[operation] = {
+                "count": self._counts[operation],
+                "p50": round(_percentile(ordered, 50), 2),
+                "p95": round(_percentile(ordered, 95), 2),
+                "max": round(ordered[-1], 2),
+            }
+        return summary
+
@@ -0,0 +1,352 @@
+"""Storage for ToDo Manager."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+from typing import Any
+import uuid
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import storage
+from homeassistant.helpers.event import async_call_later
+
+from .journal import OP_DELETE, OP_PERSONS, OP_SET, TodoJournal
+from .models import Person, Todo
+
+from .const import (
+    STORAGE_KEY_PERSONS,
+    STORAGE_KEY_REVISION,
+    STORAGE_KEY_SUMMARY,
+    STORAGE_KEY_TODOS,
+    STORAGE_MINOR_VERSION,
+    STORAGE_VERSION,
+)
+from .recurrence import calculate_next_due
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TodoStore(storage.Store):
+    """Store that migrates older ToDo Manager data layouts."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate to the current version."""
+        if old_minor_version < 2:
+            _migrate_recurring_series(old_data.get(STORAGE_KEY_TODOS, {}))
+        # Before minor version 3 todos lived in this store as well. They stay until
+        # ShardedTodoStore has written them to the shards, so an interrupted
+        # migration can't lose them.
+        return old_data
+
+
+SHARD_COUNT = 16
+# Journal records after which they are folded into the shards
+COMPACT_AFTER = 500
+
+
+def shard_of(todo_id: str) -> int:
+    """Return the shard a todo is stored in."""
+    return zlib.crc32(todo_id.encode()) % SHARD_COUNT
+
+
+class ShardedTodoStore:
+    """Store todos in hash bucket shards next to a store for the persons.
+
+    Saves only write the shards holding todos that changed since the last
+    write, and the persons store only if a person changed. The interface
+    mirrors the parts of storage.Store used by the coordinator.
+
+    In journal mode saves append the changed todos to a journal instead,
+    which is folded into the shards every COMPACT_AFTER records and on load.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, key: str, journal_mode: bool = False
+    ) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.journal_mode = journal_mode
+        # Always read on load so switching journal mode off loses nothing
+        self.journal = TodoJournal(
+            hass, hass.config.path(storage.STORAGE_DIR, f"{key}_journal.jsonl")
+        )
+        self._meta = TodoStore(
+            hass, STORAGE_VERSION, key, minor_version=STORAGE_MINOR_VERSION
+        )
+        self._shards = [
+            storage.Store(hass, STORAGE_VERSION, f"{key}_shard_{index:02d}")
+            for index in range(SHARD_COUNT)
+        ]
+        # Counts read at startup before the shards
+        self._summary = storage.Store(hass, STORAGE_VERSION, f"{key}_summary")
+        self._shard_todos: list[set[str]] = [set() for _ in range(SHARD_COUNT)]
+        self._dirty_todos: set[str] = set()
+        self._persons_dirty = False
+        self._journal_todos: set[str] = set()
+        self._journal_persons = False
+        self._write_lock = asyncio.Lock()
+        self._data_func: Callable[[], dict[str, Any]] | None = None
+        self._unsub_write: CALLBACK_TYPE | None = None
+
+    @property
+    def dirty_shards(self) -> set[int]:
+        """Return the shards that will be written on the next save."""
+        return {shard_of(todo_id) for todo_id in self._dirty_todos}
+
+    @property
+    def paths(self) -> list[str]:
+        """Return the paths of all files the store writes."""
+        return [
+            self._meta.path,
+            *(shard.path for shard in self._shards),
+            self.journal.path,
+            self._summary.path,
+        ]
+
+    async def async_load_summary(self) -> dict[str, Any] | None:
+        """Load the counts written with the last save."""
+        return await self._summary.async_load()
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load persons and all shards concurrently and replay the journal.
+
+        Stored dicts are converted to model objects here.
+        """
+        meta, records = await asyncio.gather(
+            self._meta.async_load(), self.journal.async_load()
+        )
+        if meta is None and not records:
+            return None
+        meta = meta or {}
+
+        migrate = STORAGE_KEY_TODOS in meta
+        if migrate:
+            # Single file layout, move the todos to the shards
+            todos = meta.pop(STORAGE_KEY_TODOS)
+        else:
+            todos = {}
+            for index, shard_data in enumerate(
+                await asyncio.gather(*(shard.async_load() for shard in self._shards))
+            ):
+                shard_todos = (shard_data or {}).get(STORAGE_KEY_TODOS, {})
+                todos.update(shard_todos)
+                self._shard_todos[index].update(shard_todos)
+
+        data = {
+            STORAGE_KEY_TODOS: {
+                todo_id: Todo.from_dict(todo) for todo_id, todo in todos.items()
+            },
+            STORAGE_KEY_PERSONS: _persons_from_dict(meta.get(STORAGE_KEY_PERSONS, {})),
+        }
+        if migrate:
+            _LOGGER.info("Migrating %d todos to sharded storage", len(todos))
+            self._dirty_todos.update(todos)
+            self._persons_dirty = True
+            await self._async_write_snapshot(data)
+        if records:
+            self._replay(data, records)
+            await self._async_compact(data)
+        return data
+
+    def _replay(self, data: dict[str, Any], records: list[dict[str, Any]]) -> None:
+        """Apply journal records written after the last snapshot."""
+        todos = data[STORAGE_KEY_TODOS]
+        for record in records:
+            op = record.get("op")
+            if op == OP_SET:
+                todos[record["todo_id"]] = Todo.from_dict(record["todo"])
+                self._dirty_todos.add(record["todo_id"])
+            elif op == OP_DELETE:
+                todos.pop(record["todo_id"], None)
+                self._dirty_todos.add(record["todo_id"])
+            elif op == OP_PERSONS:
+                data[STORAGE_KEY_PERSONS] = _persons_from_dict(record["persons"])
+                self._persons_dirty = True
+        _LOGGER.info("Replayed %d journal records", len(records))
+
+    @callback
+    def async_mark_todo_dirty(self, todo_id: str) -> None:
+        """Write the shard of a created, updated or deleted todo on next save."""
+        self._dirty_todos.add(todo_id)
+        if self.journal_mode:
+            self._journal_todos.add(todo_id)
+
+    @callback
+    def async_mark_persons_dirty(self) -> None:
+        """Write the persons on next save."""
+        self._persons_dirty = True
+        if self.journal_mode:
+            self._journal_persons = True
+
+    @callback
+    def async_delay_save(
+        self, data_func: Callable[[], dict[str, Any]], delay: float = 0
+    ) -> None:
+        """Save the dirty partitions after a delay, restarting the delay."""
+        self._data_func = data_func
+        self._async_cancel_write()
+        self._unsub_write = async_call_later(
+            self.hass, delay, self._async_write_delayed
+        )
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Save the dirty partitions now."""
+        self._async_cancel_write()
+        await self._async_write(data)
+
+    async def async_remove(self) -> None:
+        """Delete all files of the store."""
+        self._async_cancel_write()
+        async with self._write_lock:
+            await self._meta.async_remove()
+            for shard in self._shards:
+                await shard.async_remove()
+            await self.journal.async_clear()
+            await self._summary.async_remove()
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Cancel a pending delayed write."""
+        if self._unsub_write:
+            self._unsub_write()
+            self._unsub_write = None
+        self._data_func = None
+
+    async def _async_write_delayed(self, _now: Any) -> None:
+        """Write after the delay has passed."""
+        self._unsub_write = None
+        if (data_func := self._data_func) is not None:
+            self._data_func = None
+            await self._async_write(data_func())
+
+    async def _async_write(self, data: dict[str, Any]) -> None:
+        """Write changes to the journal or the shards."""
+        async with self._write_lock:
+            if not self.journal_mode:
+                await self._async_write_snapshot(data)
+            else:
+                await self._async_append_journal(data)
+                if self.journal.records >= COMPACT_AFTER:
+                    await self._async_compact(data)
+            if (summary := data.get(STORAGE_KEY_SUMMARY)) is not None:
+                await self._summary.async_save(summary)
+
+    async def _async_append_journal(self, data: dict[str, Any]) -> None:
+        """Append the changed todos and persons to the journal."""
+        todos = data[STORAGE_KEY_TODOS]
+        records: list[dict[str, Any]] = [
+            {"op": OP_SET, "todo_id": todo_id, "todo": todos[todo_id].as_dict()}
+            if todo_id in todos
+            else {"op": OP_DELETE, "todo_id": todo_id}
+            for todo_id in self._journal_todos
+        ]
+        if self._journal_persons:
+            records.append(
+                {
+                    "op": OP_PERSONS,
+                    "persons": _persons_as_dict(data[STORAGE_KEY_PERSONS]),
+                }
+            )
+        self._journal_todos.clear()
+        self._journal_persons = False
+        if not records:
+            return
+        revision = data.get(STORAGE_KEY_REVISION)
+        for record in records:
+            record["revision"] = revision
+        await self.journal.async_append(records)
+
+    async def _async_compact(self, data: dict[str, Any]) -> None:
+        """Fold the journal into the shards."""
+        _LOGGER.debug("Compacting %d journal records", self.journal.records)
+        await self._async_write_snapshot(data)
+        await self.journal.async_clear()
+
+    async def _async_write_snapshot(self, data: dict[str, Any]) -> None:
+        """Write the dirty shards, then the persons."""
+        todos = data[STORAGE_KEY_TODOS]
+        dirty_shards: set[int] = set()
+        for todo_id in self._dirty_todos:
+            shard = shard_of(todo_id)
+            if todo_id in todos:
+                self._shard_todos[shard].add(todo_id)
+            else:
+                self._shard_todos[shard].discard(todo_id)
+            dirty_shards.add(shard)
+        self._dirty_todos.clear()
+
+        _LOGGER.debug("Writing %d of %d shards", len(dirty_shards), SHARD_COUNT)
+        await asyncio.gather(
+            *(
+                self._shards[shard].async_save(
+                    {
+                        STORAGE_KEY_TODOS: {
+                            todo_id: todos[todo_id].as_dict()
+                            for todo_id in self._shard_todos[shard]
+                        }
+                    }
+                )
+                for shard in sorted(dirty_shards)
+            )
+        )
+        # Written last so the single file layout is only dropped once all
+        # todos are in their shards
+        if self._persons_dirty:
+            self._persons_dirty = False
+            await self._meta.async_save(
+                {STORAGE_KEY_PERSONS: _persons_as_dict(data[STORAGE_KEY_PERSONS])}
+            )
+
+
+def _persons_from_dict(persons: dict[str, dict[str, Any]]) -> dict[str, Person]:
+    """Convert stored persons to model objects."""
+    return {
+        person_id: Person.from_dict(person) for person_id, person in persons.items()
+    }
+
+
+def _persons_as_dict(persons: dict[str, Person]) -> dict[str, dict[str, Any]]:
+    """Convert persons to their stored form."""
+    return {person_id: person.as_dict() for person_id, person in persons.items()}
+
+
+def _migrate_recurring_series(todos: dict[str, dict[str, Any]]) -> None:
+    """Group recurring todos into series.
+
+    Older versions had no series identity and matched occurrences on title
+    and rule, so todos sharing both become one series. Completed todos whose
+    next occurrence already exists get a pointer to it.
+    """
+    series_ids: dict[tuple[str, str], str] = {}
+    occurrences: dict[tuple[str, str], str] = {}
+    for todo in todos.values():
+        if not todo.get("recurring", False) or not todo.get("recurring_rule"):
+            continue
+        key = (
+            str(todo.get("title")),
+            json.dumps(todo["recurring_rule"], sort_keys=True),
+        )
+        series_id = series_ids.setdefault(key, str(uuid.uuid4()))
+        todo["series_id"] = series_id
+        todo.setdefault("next_occurrence_id", None)
+        if todo.get("due_date"):
+            occurrences.setdefault((series_id, todo["due_date"]), todo["id"])
+
+    for todo in todos.values():
+        if "series_id" not in todo:
+            continue
+        if not (next_due := calculate_next_due(Todo.from_dict(todo))):
+            continue
+        todo["next_occurrence_id"] = occurrences.get(
+            (todo["series_id"], next_due.strftime("%Y-%m-%d"))
+        )
+
+    _LOGGER.debug("Migrated %d recurring series", len(series_ids))
@@ -0,0 +1,383 @@
+"""Todo platform for ToDo Manager."""
+from __future__ import annotations
+
+from datetime import date, datetime
+import logging
+import uuid
+
+from homeassistant.components.todo import (
+    TodoItem as HaTodoItem,
+    TodoItemStatus,
+    TodoListEntity,
+    TodoListEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import CHANGE_CREATED, CHANGE_DELETED, CHANGE_UPDATED, DOMAIN
+from .coordinator import TodoCoordinator
+from .models import END_OF_DAY, Todo, TodoItem, TodoType, local_now
+
+_LOGGER = logging.getLogger(__name__)
+
+LIST_TYPES = (TodoType.SHOPPING, TodoType.PACKING)
+
+
+def _is_list(todo: Todo | None) -> bool:
+    """Return if a todo is a shopping or packing list."""
+    return todo is not None and todo.todo_type in LIST_TYPES
+
+
+def _list_unique_id(coordinator: TodoCoordinator, todo_id: str) -> str:
+    """Return the unique id of a list entity."""
+    return f"{coordinator.key}_list_{todo_id}"
+
+
+def _person_unique_id(coordinator: TodoCoordinator, person_id: str) -> str:
+    """Return the unique id of a person entity."""
+    return f"{coordinator.key}_person_{person_id}_todos"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up ToDo Manager todo list entities.
+
+    Every shopping and packing list and every person gets an entity. They
+    follow the change notifications of their own todos only, so a change
+    rewrites the state of the affected entities and no other. The entities
+    are added once the todos are loaded.
+    """
+    coordinator: TodoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    lists: set[str] = set()
+
+    @callback
+    def _async_add_entities() -> None:
+        lists.update(
+            todo_id
+            for todo_id, todo in coordinator.todos.items()
+            if _is_list(todo)
+        )
+        async_add_entities(
+            [TodoManagerListEntity(coordinator, todo_id) for todo_id in lists]
+            + [
+                TodoManagerPersonEntity(coordinator, person_id)
+                for person_id in coordinator.persons
+            ]
+        )
+
+    coordinator.async_on_hydrated(_async_add_entities)
+
+    @callback
+    def _async_remove(unique_id: str) -> None:
+        entity_registry = er.async_get(hass)
+        if entity_id := entity_registry.async_get_entity_id("todo", DOMAIN, unique_id):
+            entity_registry.async_remove(entity_id)
+
+    @callback
+    def _async_changed(
+        revision: int, change: str, todo_id: str | None, person_id: str | None
+    ) -> None:
+        if person_id is not None:
+            if change == CHANGE_CREATED:
+                async_add_entities([TodoManagerPersonEntity(coordinator, person_id)])
+            elif change == CHANGE_DELETED:
+                _async_remove(_person_unique_id(coordinator, person_id))
+            return
+        if todo_id is None:
+            return
+        # Todos can become lists and stop being lists through updates
+        is_list = _is_list(coordinator.todos.get(todo_id))
+        if is_list and todo_id not in lists:
+            lists.add(todo_id)
+            async_add_entities([TodoManagerListEntity(coordinator, todo_id)])
+        elif not is_list and todo_id in lists:
+            lists.discard(todo_id)
+            _async_remove(_list_unique_id(coordinator, todo_id))
+
+    entry.async_on_unload(coordinator.async_add_change_listener(_async_changed))
+
+
+class TodoManagerEntity(TodoListEntity):
+    """Base of the ToDo Manager todo lists."""
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: TodoCoordinator) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+
+    async def async_added_to_hass(self) -> None:
+        """Build the items and follow changes."""
+        await super().async_added_to_hass()
+        self._async_update_items()
+        self.async_on_remove(
+            self.coordinator.async_add_change_listener(self._async_changed)
+        )
+
+    @callback
+    def _async_changed(
+        self, revision: int, change: str, todo_id: str | None, person_id: str | None
+    ) -> None:
+        """Rebuild the items if the change affects this entity."""
+        if self._affected_by(todo_id, person_id):
+            self._async_update_items()
+            self.async_write_ha_state()
+
+    def _affected_by(self, todo_id: str | None, person_id: str | None) -> bool:
+        """Return if a change of a todo or person affects this entity."""
+        raise NotImplementedError
+
+    @callback
+    def _async_update_items(self) -> None:
+        """Build the todo items."""
+        raise NotImplementedError
+
+    def _get_todo(self, todo_id: str) -> Todo:
+        """Get a todo or raise."""
+        if (todo := self.coordinator.todos.get(todo_id)) is None:
+            raise ServiceValidationError(f"Todo not found: {todo_id}")
+        return todo
+
+    async def _async_save(self, todo_id: str, change: str) -> None:
+        """Report a change of a todo and save it."""
+        self.coordinator.async_todo_changed(todo_id, change)
+        await self.coordinator.async_save_data()
+
+
+class TodoManagerListEntity(TodoManagerEntity):
+    """The items of a shopping or packing list.
+
+    Item quantities are shown as descriptions.
+    """
+
+    _attr_icon = "mdi:format-list-checkbox"
+    _attr_supported_features = (
+        TodoListEntityFeature.CREATE_TODO_ITEM
+        | TodoListEntityFeature.UPDATE_TODO_ITEM
+        | TodoListEntityFeature.DELETE_TODO_ITEM
+        | TodoListEntityFeature.MOVE_TODO_ITEM
+        | TodoListEntityFeature.SET_DESCRIPTION_ON_ITEM
+    )
+
+    def __init__(self, coordinator: TodoCoordinator, todo_id: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._todo_id = todo_id
+        self._attr_unique_id = _list_unique_id(coordinator, todo_id)
+
+    @property
+    def name(self) -> str:
+        """Return the title of the list, following renames."""
+        todo = self.coordinator.todos.get(self._todo_id)
+        return todo.title if todo else self._todo_id
+
+    @property
+    def available(self) -> bool:
+        """Return if the list still exists."""
+        return _is_list(self.coordinator.todos.get(self._todo_id))
+
+    def _affected_by(self, todo_id: str | None, person_id: str | None) -> bool:
+        """Return if the change is one of this list."""
+        return todo_id == self._todo_id
+
+    @callback
+    def _async_update_items(self) -> None:
+        """Convert the list items."""
+        todo = self.coordinator.todos.get(self._todo_id)
+        self._attr_todo_items = [
+            HaTodoItem(
+                uid=item.id,
+                summary=item.name,
+                description=item.quantity or None,
+                status=(
+                    TodoItemStatus.COMPLETED
+                    if item.checked
+                    else TodoItemStatus.NEEDS_ACTION
+                ),
+            )
+            for item in (todo.items if todo else [])
+        ]
+
+    def _get_item(self, todo: Todo, uid: str) -> TodoItem:
+        """Get an item of the list or raise."""
+        if (item := next((i for i in todo.items if i.id == uid), None)) is None:
+            raise ServiceValidationError(f"Item not found: {uid} in todo {todo.id}")
+        return item
+
+    async def async_create_todo_item(self, item: HaTodoItem) -> None:
+        """Add an item to the list."""
+        todo = self._get_todo(self._todo_id)
+        todo.items.append(
+            TodoItem(
+                str(uuid.uuid4()),
+                item.summary or "",
+                item.description or "",
+                item.status == TodoItemStatus.COMPLETED,
+            )
+        )
+        await self._async_save(self._todo_id, CHANGE_UPDATED)
+
+    async def async_update_todo_item(self, item: HaTodoItem) -> None:
+        """Update an item of the list."""
+        todo = self._get_todo(self._todo_id)
+        list_item = self._get_item(todo, item.uid)
+        if item.summary is not None:
+            list_item.name = item.summary
+        list_item.quantity = item.description or ""
+        if item.status is not None:
+            list_item.checked = item.status == TodoItemStatus.COMPLETED
+        await self._async_save(self._todo_id, CHANGE_UPDATED)
+
+    async def async_delete_todo_items(self, uids: list[str]) -> None:
+        """Remove items from the list."""
+        todo = self._get_todo(self._todo_id)
+        for uid in uids:
+            self._get_item(todo, uid)
+        todo.items = [item for item in todo.items if item.id not in uids]
+        await self._async_save(self._todo_id, CHANGE_UPDATED)
+
+    async def async_move_todo_item(
+        self, uid: str, previous_uid: str | None = None
+    ) -> None:
+        """Move an item after another one, or to the top."""
+        todo = self._get_todo(self._todo_id)
+        item = self._get_item(todo, uid)
+        if previous_uid is not None:
+            self._get_item(todo, previous_uid)
+        todo.items.remove(item)
+        position = 0
+        if previous_uid is not None:
+            position = next(
+                index for index, i in enumerate(todo.items) if i.id == previous_uid
+            ) + 1
+        todo.items.insert(position, item)
+        await self._async_save(self._todo_id, CHANGE_UPDATED)
+
+
+class TodoManagerPersonEntity(TodoManagerEntity):
+    """The todos assigned to a person, most urgent first.
+
+    Todos created here are assigned to the person.
+    """
+
+    _attr_icon = "mdi:account-check"
+    _attr_supported_features = (
+        TodoListEntityFeature.CREATE_TODO_ITEM
+        | TodoListEntityFeature.UPDATE_TODO_ITEM
+        | TodoListEntityFeature.DELETE_TODO_ITEM
+        | TodoListEntityFeature.SET_DUE_DATE_ON_ITEM
+        | TodoListEntityFeature.SET_DUE_DATETIME_ON_ITEM
+        | TodoListEntityFeature.SET_DESCRIPTION_ON_ITEM
+    )
+
+    def __init__(self, coordinator: TodoCoordinator, person_id: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._person_id = person_id
+        self._todo_ids: set[str] = set()
+        self._attr_unique_id = _person_unique_id(coordinator, person_id)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the person, following renames."""
+        person = self.coordinator.get_person(self._person_id)
+        return f"{self.coordinator.name} {person.name if person else self._person_id}"
+
+    @property
+    def available(self) -> bool:
+        """Return if the person still exists."""
+        return self._person_id in self.coordinator.persons
+
+    def _affected_by(self, todo_id: str | None, person_id: str | None) -> bool:
+        """Return if the todo is or was assigned to the person."""
+        if person_id is not None:
+            return person_id == self._person_id
+        if todo_id in self._todo_ids:
+            return True
+        todo = self.coordinator.todos.get(todo_id) if todo_id else None
+        return todo is not None and self._person_id in todo.persons
+
+    @callback
+    def _async_update_items(self) -> None:
+        """Convert the todos of the person."""
+        todos = self.coordinator.filter_todos(person=self._person_id)
+        self._todo_ids = {todo.id for todo in todos}
+        self._attr_todo_items = [
+            HaTodoItem(
+                uid=todo.id,
+                summary=todo.title,
+                description=todo.description or None,
+                due=self._due(todo),
+                status=(
+                    TodoItemStatus.COMPLETED
+                    if todo.completed
+                    else TodoItemStatus.NEEDS_ACTION
+                ),
+            )
+            for todo in todos
+        ]
+
+    @staticmethod
+    def _due(todo: Todo) -> date | datetime | None:
+        """Return the due date, or the due time unless it is end of day."""
+        if todo.due_date is None or todo.due_time == END_OF_DAY:
+            return todo.due_date
+        return datetime.combine(
+            todo.due_date, todo.due_time, dt_util.get_default_time_zone()
+        )
+
+    @staticmethod
+    def _apply_due(todo: Todo, due: date | datetime | None) -> None:
+        """Set the due date and time of a todo."""
+        if isinstance(due, datetime):
+            due = dt_util.as_local(due)
+            todo.due_date = due.date()
+            todo.due_time = due.time().replace(second=0, microsecond=0)
+        else:
+            todo.due_date = due
+            todo.due_time = END_OF_DAY
+
+    async def async_create_todo_item(self, item: HaTodoItem) -> None:
+        """Create a todo assigned to the person."""
+        todo = Todo(
+            id=str(uuid.uuid4()),
+            title=item.summary or "",
+            description=item.description or "",
+            persons=[self._person_id],
+            created_at=local_now(),
+        )
+        self._apply_due(todo, item.due)
+        if item.status == TodoItemStatus.COMPLETED:
+            todo.set_completed(True)
+        self.coordinator.todos[todo.id] = todo
+        await self._async_save(todo.id, CHANGE_CREATED)
+
+    async def async_update_todo_item(self, item: HaTodoItem) -> None:
+        """Update a todo of the person."""
+        todo = self._get_todo(item.uid)
+        if item.summary is not None:
+            todo.title = item.summary
+        todo.description = item.description or ""
+        self._apply_due(todo, item.due)
+        if item.status is not None:
+            completed = item.status == TodoItemStatus.COMPLETED
+            if completed != todo.completed:
+                todo.set_completed(completed)
+        await self._async_save(todo.id, CHANGE_UPDATED)
+
+    async def async_delete_todo_items(self, uids: list[str]) -> None:
+        """Delete todos of the person."""
+        uids = list(dict.fromkeys(uids))
+        for uid in uids:
+            self._get_todo(uid)
+        for uid in uids:
+            del self.coordinator.todos[uid]
+            self.coordinator.async_todo_changed(uid, CHANGE_DELETED)
+        await self.coordinator.async_save_data()
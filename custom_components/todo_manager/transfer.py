@@ -0,0 +1,543 @@
+"""Import and export of todos as JSON lines, CSV and iCalendar files.
+
+Files are read and written one todo at a time, so a large file is never
+held in memory as a whole. All functions here block and run in the
+executor.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+import csv
+from datetime import date, datetime
+import json
+import logging
+import os
+from pathlib import Path
+import re
+from typing import Any, TextIO
+
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+
+from .models import END_OF_DAY, RecurrenceUnit
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_JSONL = ".jsonl"
+FORMAT_CSV = ".csv"
+FORMAT_ICS = ".ics"
+FORMATS = (FORMAT_JSONL, FORMAT_CSV, FORMAT_ICS)
+
+CSV_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "due_date",
+    "due_time",
+    "todo_type",
+    "persons",
+    "recurring_rule",
+    "completed",
+    "completed_date",
+    "result",
+    "items",
+    "created_at",
+)
+# Separator of the persons in a CSV cell, items take one line each
+CSV_PERSON_SEPARATOR = ";"
+ITEM_CHECKED = "[x] "
+ITEM_QUANTITY_SEPARATOR = " | "
+
+ICS_PRODID = "-//ToDo Manager//Home Assistant//EN"
+ICS_MAX_LINE = 75
+ICS_TYPE = "X-TODO-MANAGER-TYPE"
+ICS_RESULT = "X-TODO-MANAGER-RESULT"
+ICS_ITEM = "X-TODO-MANAGER-ITEM"
+
+FREQUENCIES = {
+    RecurrenceUnit.DAYS: "DAILY",
+    RecurrenceUnit.WEEKS: "WEEKLY",
+    RecurrenceUnit.MONTHS: "MONTHLY",
+}
+
+_PARAMETER = re.compile(r';([^=;:]+)=("[^"]*"|[^;:]*)')
+_ESCAPED = re.compile(r"\\(.)")
+
+# Called with the line number and the reason of a row that can't be read
+Reject = Callable[[int, str], None]
+
+
+def resolve_path(config_dir: str, file: str) -> Path:
+    """Return the path of a file in the config directory.
+
+    Raises ValueError for files outside of it, in .storage or with an
+    extension that isn't one of the formats.
+    """
+    root = Path(config_dir).resolve()
+    path = (root / file).resolve()
+    if path == root or not path.is_relative_to(root):
+        raise ValueError(f"{file} is not in the config directory")
+    if ".storage" in path.relative_to(root).parts:
+        raise ValueError("files in .storage are managed by Home Assistant")
+    if path.suffix.lower() not in FORMATS:
+        raise ValueError(f"unknown format, use one of {', '.join(FORMATS)}")
+    return path
+
+
+def read_todos(path: Path, reject: Reject) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield the todos of a file in the form of Todo.as_dict with their line.
+
+    Persons are given by id or name. Rows that can't be parsed are passed
+    to reject and skipped.
+    """
+    readers = {FORMAT_JSONL: _read_jsonl, FORMAT_CSV: _read_csv, FORMAT_ICS: _read_ics}
+    # utf-8-sig drops the byte order mark spreadsheets put in front of CSV
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        yield from readers[path.suffix.lower()](file, reject)
+
+
+def write_todos(
+    path: Path,
+    todos: Iterable[dict[str, Any]],
+    person_names: dict[str, str],
+    overwrite: bool = False,
+) -> int:
+    """Write todos in the form of Todo.as_dict, return how many.
+
+    The file is written next to the target and moved over it when done, so
+    a failed export leaves an existing file untouched.
+    """
+    if not overwrite and path.exists():
+        raise ValueError(f"{path.name} exists, pass overwrite to replace it")
+    writers = {
+        FORMAT_JSONL: _write_jsonl,
+        FORMAT_CSV: _write_csv,
+        FORMAT_ICS: _write_ics,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as file:
+            count = writers[path.suffix.lower()](file, todos, person_names)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    _LOGGER.debug("Wrote %d todos to %s", count, path)
+    return count
+
+
+def rule_to_rrule(rule: dict[str, Any]) -> str:
+    """Return the RRULE of a recurring rule."""
+    frequency = FREQUENCIES[RecurrenceUnit(rule["unit"])]
+    return f"FREQ={frequency};INTERVAL={rule['interval']}"
+
+
+def rrule_to_rule(value: str) -> dict[str, Any]:
+    """Return the recurring rule of an RRULE.
+
+    Only the frequency and the interval are used. Todos repeat a while
+    after they were completed, so parts like BYDAY or COUNT have no
+    counterpart. Yearly rules repeat every twelve months.
+    """
+    parts = dict(
+        part.partition("=")[::2]
+        for part in value.upper().removeprefix("RRULE:").split(";")
+        if part
+    )
+    try:
+        interval = int(parts.get("INTERVAL", 1))
+    except ValueError:
+        raise ValueError(f"invalid RRULE interval: {parts['INTERVAL']}") from None
+    if interval < 1:
+        raise ValueError(f"invalid RRULE interval: {interval}")
+    frequency = parts.get("FREQ")
+    if frequency == "YEARLY":
+        return {"interval": interval * 12, "unit": RecurrenceUnit.MONTHS.value}
+    for unit, name in FREQUENCIES.items():
+        if name == frequency:
+            return {"interval": interval, "unit": unit.value}
+    raise ValueError(f"unsupported RRULE frequency: {frequency}")
+
+
+def _person_names(
+    todo: dict[str, Any], person_names: dict[str, str]
+) -> list[str]:
+    """Return the names of the persons of a todo, ids if unknown."""
+    return [person_names.get(person_id, person_id) for person_id in todo["persons"]]
+
+
+def _recurring_rule(todo: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the rule of a todo if it repeats."""
+    return todo["recurring_rule"] if todo["recurring"] else None
+
+
+# JSON lines
+
+
+def _read_jsonl(
+    file: TextIO, reject: Reject
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Read one todo per line."""
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as err:
+            reject(number, f"invalid JSON: {err}")
+            continue
+        if not isinstance(data, dict):
+            reject(number, "not a JSON object")
+            continue
+        yield number, data
+
+
+def _write_jsonl(
+    file: TextIO, todos: Iterable[dict[str, Any]], person_names: dict[str, str]
+) -> int:
+    """Write one todo per line, with the ids of its persons."""
+    count = 0
+    for todo in todos:
+        file.write(f"{json_dumps(todo)}\n")
+        count += 1
+    return count
+
+
+# CSV
+
+
+def _format_item(item: dict[str, Any]) -> str:
+    """Return an item as a line of the items cell."""
+    line = f"{ITEM_CHECKED if item['checked'] else ''}{item['name']}"
+    if item["quantity"]:
+        line += f"{ITEM_QUANTITY_SEPARATOR}{item['quantity']}"
+    return line
+
+
+def _parse_item(line: str) -> dict[str, Any]:
+    """Return an item of a line of the items cell."""
+    checked = line[: len(ITEM_CHECKED)].lower() == ITEM_CHECKED
+    if checked:
+        line = line[len(ITEM_CHECKED) :]
+    name, _, quantity = line.partition(ITEM_QUANTITY_SEPARATOR)
+    return {"name": name.strip(), "quantity": quantity.strip(), "checked": checked}
+
+
+def _read_csv(file: TextIO, reject: Reject) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Read one todo per row, the columns named by the header."""
+    reader = csv.DictReader(file)
+    try:
+        for row in reader:
+            # Cells may span lines, report the line the row starts on
+            number = reader.line_num - sum(
+                value.count("\n") for value in row.values() if isinstance(value, str)
+            )
+            try:
+                data = _from_csv_row(row)
+            except ValueError as err:
+                reject(number, str(err))
+                continue
+            yield number, data
+    except csv.Error as err:
+        raise ValueError(f"line {reader.line_num}: {err}") from err
+
+
+def _from_csv_row(row: dict[str | None, Any]) -> dict[str, Any]:
+    """Convert a CSV row, leaving out empty cells."""
+    data: dict[str, Any] = {
+        key: value
+        for key, value in row.items()
+        if key in CSV_FIELDS and isinstance(value, str) and value.strip()
+    }
+    if "persons" in data:
+        data["persons"] = [
+            name.strip()
+            for name in data["persons"].split(CSV_PERSON_SEPARATOR)
+            if name.strip()
+        ]
+    if "recurring_rule" in data:
+        data["recurring_rule"] = rrule_to_rule(data["recurring_rule"])
+        data["recurring"] = True
+    if "items" in data:
+        data["items"] = [
+            _parse_item(line) for line in data["items"].splitlines() if line.strip()
+        ]
+    return data
+
+
+def _write_csv(
+    file: TextIO, todos: Iterable[dict[str, Any]], person_names: dict[str, str]
+) -> int:
+    """Write one todo per row with a header, persons by name."""
+    writer = csv.DictWriter(file, CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for todo in todos:
+        rule = _recurring_rule(todo)
+        writer.writerow(
+            {
+                "id": todo["id"],
+                "title": todo["title"],
+                "description": todo["description"],
+                "due_date": todo["due_date"],
+                "due_time": todo["due_time"] if todo["due_date"] else None,
+                "todo_type": todo["todo_type"],
+                "persons": f"{CSV_PERSON_SEPARATOR} ".join(
+                    _person_names(todo, person_names)
+                ),
+                "recurring_rule": rule_to_rrule(rule) if rule else None,
+                "completed": "true" if todo["completed"] else "false",
+                "completed_date": todo["completed_date"],
+                "result": todo["result"],
+                "items": "\n".join(_format_item(item) for item in todo["items"]),
+                "created_at": todo["created_at"],
+            }
+        )
+        count += 1
+    return count
+
+
+# iCalendar
+
+
+def _escape(text: str) -> str:
+    """Escape an iCalendar text value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _unescape(text: str) -> str:
+    """Unescape an iCalendar text value."""
+    return _ESCAPED.sub(
+        lambda match: "\n" if match.group(1) in "nN" else match.group(1), text
+    )
+
+
+def _quote(value: str) -> str:
+    """Quote an iCalendar parameter value, which can't hold quotes."""
+    return f'"{value.replace(chr(34), chr(39))}"'
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to lines of at most 75 octets."""
+    encoded = line.encode()
+    if len(encoded) <= ICS_MAX_LINE:
+        return f"{line}\r\n"
+    parts = []
+    start = 0
+    limit = ICS_MAX_LINE
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Don't split a multi-byte character
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+        # Continuation lines start with a space
+        limit = ICS_MAX_LINE - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _unfold(file: TextIO) -> Iterator[tuple[int, str]]:
+    """Yield the unfolded content lines with the line they start on."""
+    current: str | None = None
+    start = 0
+    for number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+        if current is not None and line[:1] in (" ", "\t"):
+            current += line[1:]
+            continue
+        if current:
+            yield start, current
+        current, start = line, number
+    if current:
+        yield start, current
+
+
+def _parse_content_line(line: str) -> tuple[str, dict[str, str], str]:
+    """Split a content line into name, parameters and value."""
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            break
+    else:
+        raise ValueError(f"invalid line: {line[:40]}")
+    head = line[:index]
+    name = head.split(";", 1)[0].upper()
+    parameters = {
+        key.upper(): value.strip('"') for key, value in _PARAMETER.findall(head)
+    }
+    return name, parameters, line[index + 1 :]
+
+
+def _to_utc(value: str) -> str:
+    """Return a stored local datetime as iCalendar UTC time."""
+    local = datetime.fromisoformat(value).replace(
+        tzinfo=dt_util.get_default_time_zone()
+    )
+    return dt_util.as_utc(local).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _parse_ics_datetime(value: str, parameters: dict[str, str]) -> date | datetime:
+    """Parse an iCalendar date or datetime, datetimes as local time."""
+    try:
+        if parameters.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d").date()
+        parsed = datetime.strptime(value.removesuffix("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        raise ValueError(f"invalid date: {value}") from None
+    if value.endswith("Z"):
+        time_zone = dt_util.UTC
+    elif "TZID" in parameters:
+        time_zone = dt_util.get_time_zone(parameters["TZID"])
+    else:
+        # Floating time is local time already
+        return parsed
+    if time_zone is None:
+        return parsed
+    return dt_util.as_local(parsed.replace(tzinfo=time_zone)).replace(tzinfo=None)
+
+
+def _vtodo(
+    todo: dict[str, Any], person_names: dict[str, str], stamp: str
+) -> Iterator[str]:
+    """Yield the content lines of a todo."""
+    yield "BEGIN:VTODO"
+    yield f"UID:{todo['id']}"
+    yield f"DTSTAMP:{stamp}"
+    yield f"SUMMARY:{_escape(todo['title'])}"
+    if todo["description"]:
+        yield f"DESCRIPTION:{_escape(todo['description'])}"
+    if todo["due_date"]:
+        due = date.fromisoformat(todo["due_date"])
+        if todo["due_time"] == END_OF_DAY.strftime("%H:%M"):
+            yield f"DUE;VALUE=DATE:{due:%Y%m%d}"
+        else:
+            yield f"DUE:{due:%Y%m%d}T{todo['due_time'].replace(':', '')}00"
+    yield f"STATUS:{'COMPLETED' if todo['completed'] else 'NEEDS-ACTION'}"
+    if todo["completed"] and todo["completed_date"]:
+        yield f"COMPLETED:{_to_utc(todo['completed_date'])}"
+    if todo["created_at"]:
+        yield f"CREATED:{_to_utc(todo['created_at'])}"
+    if rule := _recurring_rule(todo):
+        yield f"RRULE:{rule_to_rrule(rule)}"
+    for person_id, name in zip(todo["persons"], _person_names(todo, person_names)):
+        yield f"ATTENDEE;CN={_quote(name)}:urn:uuid:{person_id}"
+    yield f"{ICS_TYPE}:{todo['todo_type']}"
+    if todo["result"]:
+        yield f"{ICS_RESULT}:{_escape(todo['result'])}"
+    for item in todo["items"]:
+        parameters = f";X-CHECKED={'TRUE' if item['checked'] else 'FALSE'}"
+        if item["quantity"]:
+            parameters += f";X-QUANTITY={_quote(item['quantity'])}"
+        yield f"{ICS_ITEM}{parameters}:{_escape(item['name'])}"
+    yield "END:VTODO"
+
+
+def _from_vtodo(properties: list[tuple[str, dict[str, str], str]]) -> dict[str, Any]:
+    """Convert the properties of a VTODO, ignoring unknown ones."""
+    data: dict[str, Any] = {"persons": [], "items": []}
+    for name, parameters, value in properties:
+        if name == "UID":
+            data["id"] = value
+        elif name == "SUMMARY":
+            data["title"] = _unescape(value)
+        elif name == "DESCRIPTION":
+            data["description"] = _unescape(value)
+        elif name == "DUE":
+            due = _parse_ics_datetime(value, parameters)
+            if isinstance(due, datetime):
+                data["due_date"] = due.date().isoformat()
+                data["due_time"] = due.strftime("%H:%M")
+            else:
+                data["due_date"] = due.isoformat()
+        elif name == "STATUS":
+            data["completed"] = value.upper() == "COMPLETED"
+        elif name in ("COMPLETED", "CREATED"):
+            key = "completed_date" if name == "COMPLETED" else "created_at"
+            data[key] = _parse_ics_datetime(value, parameters).isoformat()
+        elif name == "RRULE":
+            data["recurring_rule"] = rrule_to_rule(value)
+            data["recurring"] = True
+        elif name == "ATTENDEE":
+            data["persons"].append(
+                parameters.get("CN") or value.removeprefix("urn:uuid:")
+            )
+        elif name == ICS_TYPE:
+            data["todo_type"] = value.lower()
+        elif name == ICS_RESULT:
+            data["result"] = _unescape(value)
+        elif name == ICS_ITEM:
+            data["items"].append(
+                {
+                    "name": _unescape(value),
+                    "quantity": parameters.get("X-QUANTITY", ""),
+                    "checked": parameters.get("X-CHECKED", "").upper() == "TRUE",
+                }
+            )
+    # A completion time alone marks a todo as completed
+    if "completed_date" in data:
+        data.setdefault("completed", True)
+    return data
+
+
+def _read_ics(file: TextIO, reject: Reject) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Read the VTODO components of a calendar, other components are skipped."""
+    properties: list[tuple[str, dict[str, str], str]] | None = None
+    error: str | None = None
+    start = depth = 0
+    for number, line in _unfold(file):
+        upper = line.upper()
+        if properties is None:
+            if upper == "BEGIN:VTODO":
+                properties, error, start, depth = [], None, number, 0
+            continue
+        # Alarms and other components nested in the todo
+        if upper.startswith("BEGIN:"):
+            depth += 1
+            continue
+        if upper.startswith("END:") and depth:
+            depth -= 1
+            continue
+        if upper == "END:VTODO":
+            data: dict[str, Any] | None = None
+            if error is None:
+                try:
+                    data = _from_vtodo(properties)
+                except ValueError as err:
+                    error = str(err)
+            properties = None
+            if data is None:
+                reject(start, error or "invalid todo")
+                continue
+            yield start, data
+            continue
+        if depth:
+            continue
+        try:
+            properties.append(_parse_content_line(line))
+        except ValueError as err:
+            error = error or str(err)
+    if properties is not None:
+        reject(start, "todo is not closed by END:VTODO")
+
+
+def _write_ics(
+    file: TextIO, todos: Iterable[dict[str, Any]], person_names: dict[str, str]
+) -> int:
+    """Write a calendar with one VTODO per todo."""
+    stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    file.write(f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\n")
+    count = 0
+    for todo in todos:
+        file.writelines(_fold(line) for line in _vtodo(todo, person_names, stamp))
+        count += 1
+    file.write("END:VCALENDAR\r\n")
+    return count
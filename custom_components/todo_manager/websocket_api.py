@@ -0,0 +1,324 @@
+"""Websocket API for ToDo Manager."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CHANGE_DELETED,
+    DOMAIN,
+    TODO_TYPE_SIMPLE,
+    TODO_TYPE_COMPLEX,
+    TODO_TYPE_SHOPPING,
+    TODO_TYPE_PACKING,
+)
+from .services import get_coordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the ToDo Manager websocket commands."""
+    websocket_api.async_register_command(hass, websocket_list_todos)
+    websocket_api.async_register_command(hass, websocket_get_todo)
+    websocket_api.async_register_command(hass, websocket_list_persons)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+    websocket_api.async_register_command(hass, websocket_list_archive)
+    websocket_api.async_register_command(hass, websocket_search_todos)
+
+
+def _project(todo: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+    """Reduce a todo to the requested fields, the id is always included."""
+    if not fields:
+        return todo
+    return {key: todo[key] for key in ("id", *fields) if key in todo}
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/list",
+        vol.Optional("entry_id"): str,
+        vol.Optional("cursor"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("person"): str,
+        vol.Optional("todo_type"): vol.In(
+            [TODO_TYPE_SIMPLE, TODO_TYPE_COMPLEX, TODO_TYPE_SHOPPING, TODO_TYPE_PACKING]
+        ),
+        vol.Optional("completed"): bool,
+        vol.Optional("due_after"): cv.date,
+        vol.Optional("due_before"): cv.date,
+        vol.Optional("fields"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_list_todos(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of todos sorted by urgency.
+
+    The cursor is the position of the first todo of the page, the response
+    carries the cursor of the next page or None on the last page.
+    """
+    coordinator = get_coordinator(hass, msg)
+    if not coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Coordinator not found"
+        )
+        return
+    await coordinator.async_wait_hydrated()
+
+    todos = coordinator.filter_todos(
+        person=msg.get("person"),
+        todo_type=msg.get("todo_type"),
+        completed=msg.get("completed"),
+        due_after=msg.get("due_after"),
+        due_before=msg.get("due_before"),
+    )
+    start = msg.get("cursor", 0)
+    end = start + msg["limit"]
+    fields = msg.get("fields")
+
+    connection.send_result(
+        msg["id"],
+        {
+            "todos": [
+                _project(coordinator.todo_to_dict(todo), fields)
+                for todo in todos[start:end]
+            ],
+            "total": len(todos),
+            "next_cursor": end if end < len(todos) else None,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/search",
+        vol.Optional("entry_id"): str,
+        vol.Required("query"): str,
+        vol.Optional("cursor"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("person"): str,
+        vol.Optional("completed"): bool,
+        vol.Optional("fields"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_search_todos(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of todos matching a search query, best first.
+
+    Every match carries its score and the ids of the matching items, also
+    when fields are selected.
+    """
+    coordinator = get_coordinator(hass, msg)
+    if not coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Coordinator not found"
+        )
+        return
+    await coordinator.async_wait_hydrated()
+
+    query = msg["query"]
+    matches = coordinator.search_todos(
+        query, person=msg.get("person"), completed=msg.get("completed")
+    )
+    start = msg.get("cursor", 0)
+    end = start + msg["limit"]
+    fields = msg.get("fields")
+    if fields:
+        fields = [*fields, "score", "matched_items"]
+
+    connection.send_result(
+        msg["id"],
+        {
+            "todos": [
+                _project(
+                    coordinator.search_result_to_dict(todo, score, query), fields
+                )
+                for todo, score in matches[start:end]
+            ],
+            "total": len(matches),
+            "next_cursor": end if end < len(matches) else None,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/archive",
+        vol.Optional("entry_id"): str,
+        vol.Optional("cursor"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("fields"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_list_archive(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of archived todos, latest completed first.
+
+    The archive is loaded from storage on the first request.
+    """
+    coordinator = get_coordinator(hass, msg)
+    if not coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Coordinator not found"
+        )
+        return
+
+    start = msg.get("cursor", 0)
+    todos, total = await coordinator.archive.async_query(start, msg["limit"])
+    end = start + len(todos)
+    fields = msg.get("fields")
+
+    connection.send_result(
+        msg["id"],
+        {
+            "todos": [_project(todo, fields) for todo in todos],
+            "total": total,
+            "next_cursor": end if end < total else None,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/get",
+        vol.Optional("entry_id"): str,
+        vol.Required("todo_id"): str,
+        vol.Optional("fields"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_get_todo(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a single todo."""
+    coordinator = get_coordinator(hass, msg)
+    if coordinator:
+        await coordinator.async_wait_hydrated()
+    todo = coordinator.get_todo(msg["todo_id"]) if coordinator else None
+    if not todo:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Todo not found"
+        )
+        return
+
+    connection.send_result(
+        msg["id"], _project(coordinator.todo_to_dict(todo), msg.get("fields"))
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/persons",
+        vol.Optional("entry_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_list_persons(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return all persons."""
+    coordinator = get_coordinator(hass, msg)
+    if not coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Coordinator not found"
+        )
+        return
+    await coordinator.async_wait_hydrated()
+
+    connection.send_result(msg["id"], {"persons": coordinator.get_persons()})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional("entry_id"): str,
+        vol.Optional("fields"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to todo changes.
+
+    The first event carries the current revision and the persons, every
+    later event a single created, updated or deleted todo or person.
+    Revisions increase by one per change so clients can detect gaps and
+    resubscribe. Clients page through todo_manager/list for the todos, the
+    changes since the subscription keep those pages current.
+    """
+    coordinator = get_coordinator(hass, msg)
+    if not coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Coordinator not found"
+        )
+        return
+    await coordinator.async_wait_hydrated()
+
+    fields = msg.get("fields")
+
+    @callback
+    def forward_change(
+        revision: int, change: str, todo_id: str | None, person_id: str | None
+    ) -> None:
+        """Forward a single change to the subscriber."""
+        event: dict[str, Any] = {"revision": revision, "change": change}
+        if todo_id is not None:
+            event["todo_id"] = todo_id
+            todo = coordinator.get_todo(todo_id)
+            if change != CHANGE_DELETED and todo:
+                event["todo"] = _project(coordinator.todo_to_dict(todo), fields)
+        else:
+            event["person_id"] = person_id
+            person = coordinator.get_person(person_id)
+            if change != CHANGE_DELETED and person:
+                event["person"] = person.as_dict()
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_change_listener(
+        forward_change
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "revision": coordinator.revision,
+                "snapshot": {"persons": coordinator.get_persons()},
+            },
+        )
+    )
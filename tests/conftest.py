@@ -0,0 +1,44 @@
+"""Fixtures for the ToDo Manager tests."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.todo_manager.const import CONF_SAVE_DELAY, DOMAIN
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def options() -> dict[str, Any]:
+    """Return the options of the config entry, saving right away."""
+    return {CONF_SAVE_DELAY: 0}
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant, options: dict[str, Any]) -> MockConfigEntry:
+    """Return a config entry added to Home Assistant."""
+    entry = MockConfigEntry(domain=DOMAIN, title="ToDo Manager", options=options)
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> TodoCoordinator:
+    """Set up the integration and wait until the todos are loaded."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return hass.data[DOMAIN][config_entry.entry_id]
@@ -0,0 +1,186 @@
+"""Tests for the archive of completed todos."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.todo_manager.const import (
+    CONF_ARCHIVE_RETENTION_DAYS,
+    CONF_SAVE_DELAY,
+    DOMAIN,
+    SERVICE_BULK_COMPLETE_TODOS,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_PURGE_ARCHIVE,
+    STORAGE_KEY_TODOS,
+    STORAGE_VERSION,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+from custom_components.todo_manager.models import Todo
+
+ARCHIVE_KEY = "todo_manager_archive"
+
+
+@pytest.fixture(autouse=True)
+def freeze_time(freezer: FrozenDateTimeFactory) -> None:
+    """Freeze the time at noon local time."""
+    freezer.move_to(
+        datetime(2026, 3, 10, 12, tzinfo=dt_util.get_default_time_zone())
+    )
+
+
+def _archived(todo_id: str, days_ago: int) -> dict[str, Any]:
+    """Return an archived todo completed some days ago."""
+    completed = datetime(2026, 3, 10, 12) - timedelta(days=days_ago)
+    return Todo(
+        id=todo_id, title=todo_id, completed=True, completed_date=completed
+    ).as_dict()
+
+
+def _store_archive(hass_storage: dict[str, Any], *todos: dict[str, Any]) -> None:
+    """Put archived todos into the storage."""
+    hass_storage[ARCHIVE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": ARCHIVE_KEY,
+        "data": {STORAGE_KEY_TODOS: {todo["id"]: todo for todo in todos}},
+    }
+
+
+async def _create(hass: HomeAssistant, *titles: str) -> list[str]:
+    """Create todos and return their IDs."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": [{"title": title} for title in titles]},
+        blocking=True,
+        return_response=True,
+    )
+    return response["todo_ids"]
+
+
+async def _complete(hass: HomeAssistant, *todo_ids: str) -> None:
+    """Complete todos."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_COMPLETE_TODOS,
+        {"todo_ids": list(todo_ids)},
+        blocking=True,
+    )
+
+
+async def _saved_archive(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> dict[str, Any]:
+    """Write the delayed save of the archive and return the stored todos."""
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    return hass_storage[ARCHIVE_KEY]["data"][STORAGE_KEY_TODOS]
+
+
+async def _list_archive(client, **msg: Any) -> dict[str, Any]:
+    """Return the result of an archive command."""
+    await client.send_json_auto_id({"type": "todo_manager/archive", **msg})
+    response = await client.receive_json()
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_archive_completed(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Todos completed longer than 30 days ago move to the archive."""
+    old, recent, todo_id = await _create(hass, "Alt", "Neu", "Offen")
+    await _complete(hass, old)
+    freezer.tick(timedelta(days=20))
+    await _complete(hass, recent)
+
+    freezer.tick(timedelta(days=11))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+    assert list(coordinator.todos) == [recent, todo_id]
+    todos, total = await coordinator.archive.async_query(0, 10)
+    assert [todo["title"] for todo in todos] == ["Alt"]
+    assert total == 1
+    assert list(await _saved_archive(hass, hass_storage)) == [old]
+
+
+async def test_archive_pages(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    coordinator: TodoCoordinator,
+    hass_ws_client,
+) -> None:
+    """The archive command pages through the latest completed todos first."""
+    _store_archive(
+        hass_storage, _archived("a", 3), _archived("b", 1), _archived("c", 2)
+    )
+    client = await hass_ws_client(hass)
+
+    result = await _list_archive(client, limit=2, fields=["id"])
+    assert result == {
+        "todos": [{"id": "b"}, {"id": "c"}],
+        "total": 3,
+        "next_cursor": 2,
+    }
+    result = await _list_archive(client, cursor=2, limit=2, fields=["id"])
+    assert result == {"todos": [{"id": "a"}], "total": 3, "next_cursor": None}
+
+
+@pytest.mark.parametrize(
+    "options", [{CONF_SAVE_DELAY: 0, CONF_ARCHIVE_RETENTION_DAYS: 100}]
+)
+async def test_retention(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Archiving drops archived todos older than the retention period."""
+    _store_archive(hass_storage, _archived("expired", 80), _archived("kept", 60))
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    (todo_id,) = await _create(hass, "Müll")
+    await _complete(hass, todo_id)
+
+    freezer.tick(timedelta(days=31))
+    assert await coordinator.async_archive_completed() == 1
+
+    assert sorted(await _saved_archive(hass, hass_storage)) == sorted(
+        ["kept", todo_id]
+    )
+
+
+async def test_purge_archive(
+    hass: HomeAssistant, hass_storage: dict[str, Any], coordinator: TodoCoordinator
+) -> None:
+    """Purging removes archived todos completed before a date, or all."""
+    _store_archive(hass_storage, _archived("old", 10), _archived("new", 1))
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PURGE_ARCHIVE,
+        {"before": "2026-03-05"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"purged": 1}
+    assert list(await _saved_archive(hass, hass_storage)) == ["new"]
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_PURGE_ARCHIVE, {}, blocking=True, return_response=True
+    )
+    assert response == {"purged": 1}
+    assert await _saved_archive(hass, hass_storage) == {}
@@ -0,0 +1,194 @@
+"""Tests for the ToDo Manager calendar."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_CREATE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+CALENDAR = "calendar.todo_manager"
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture(autouse=True)
+def freeze_noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Start at noon of a fixed day."""
+    freezer.move_to(
+        datetime(2026, 3, 10, 12, tzinfo=dt_util.get_default_time_zone())
+    )
+
+
+async def _create(hass: HomeAssistant, **data: Any) -> None:
+    """Create a todo."""
+    await hass.services.async_call(DOMAIN, SERVICE_CREATE_TODO, data, blocking=True)
+
+
+async def _events(hass: HomeAssistant, days: int = 7) -> list[dict[str, Any]]:
+    """Return the events from the start of today on."""
+    start = datetime.combine(TODAY, datetime.min.time())
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": CALENDAR,
+            "start_date_time": start,
+            "end_date_time": start + timedelta(days=days),
+        },
+        blocking=True,
+        return_response=True,
+    )
+    return response[CALENDAR]["events"]
+
+
+async def test_events(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Todos with a time last 30 minutes, the others the whole day."""
+    await _create(hass, title="Arzt", due_date=TODAY, due_time="15:00")
+    await _create(hass, title="Einkaufen", due_date=TODAY + timedelta(days=1))
+    await _create(hass, title="Später", due_date=TODAY + timedelta(days=30))
+    await _create(hass, title="Ohne Datum")
+
+    events = await _events(hass)
+
+    assert [
+        (event["summary"], event["start"], event["end"]) for event in events
+    ] == [
+        ("Arzt", "2026-03-10T15:00:00-07:00", "2026-03-10T15:30:00-07:00"),
+        ("Einkaufen", "2026-03-11", "2026-03-12"),
+    ]
+
+
+async def _refresh(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Let the debounced refresh after a save run."""
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def test_state(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """The calendar is on while an open todo is due."""
+    await _create(hass, title="Arzt", due_date=TODAY, due_time="12:15")
+    await _refresh(hass, freezer)
+    state = hass.states.get(CALENDAR)
+    assert state.state == STATE_OFF
+    assert state.attributes["message"] == "Arzt"
+
+    await _create(hass, title="Jetzt", due_date=TODAY, due_time="11:50")
+    await _refresh(hass, freezer)
+    state = hass.states.get(CALENDAR)
+    assert state.state == STATE_ON
+    assert state.attributes["message"] == "Jetzt"
+
+
+async def test_completed_todos(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Completed todos stay on their due day."""
+    await _create(hass, title="Erledigt", due_date=TODAY + timedelta(days=2))
+    todo_id = next(iter(coordinator.todos))
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": todo_id}, blocking=True
+    )
+
+    assert [event["summary"] for event in await _events(hass)] == ["Erledigt"]
+
+
+async def test_future_occurrences(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Recurring todos repeat after their due date within the range only."""
+    await _create(
+        hass,
+        title="Müll",
+        due_date=TODAY + timedelta(days=1),
+        recurring=True,
+        recurring_rule={"interval": 2, "unit": "days"},
+    )
+
+    assert [event["start"] for event in await _events(hass)] == [
+        "2026-03-11",
+        "2026-03-13",
+        "2026-03-15",
+    ]
+    # Occurrences share the uid of the todo
+    entity = hass.data["calendar"].get_entity(CALENDAR)
+    start = dt_util.start_of_local_day()
+    events = await entity.async_get_events(hass, start, start + timedelta(days=7))
+    assert len({event.uid for event in events}) == 1
+    assert [event.recurrence_id for event in events] == [
+        None,
+        "2026-03-13",
+        "2026-03-15",
+    ]
+
+
+async def test_series_with_two_open_todos(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A series shows each future date once when an older todo is open again."""
+    await _create(
+        hass,
+        title="Blumen",
+        due_date=TODAY,
+        recurring=True,
+        recurring_rule={"interval": 1, "unit": "days"},
+    )
+    first_id = next(iter(coordinator.todos))
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": first_id}, blocking=True
+    )
+    freezer.tick(timedelta(days=1))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert len(coordinator.todos) == 2
+
+    # Open the first todo again
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": first_id}, blocking=True
+    )
+    assert not any(todo.completed for todo in coordinator.todos.values())
+    events = await _events(hass)
+
+    starts = Counter(event["start"] for event in events)
+    assert starts["2026-03-10"] == 1
+    assert max(starts.values()) == 1
+    assert sorted(starts) == [f"2026-03-{day}" for day in range(10, 17)]
+
+
+async def test_monthly_occurrences(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Monthly occurrences keep the day of the todo, clamped to short months."""
+    await _create(
+        hass,
+        title="Miete",
+        due_date=date(2026, 1, 31),
+        recurring=True,
+        recurring_rule={"interval": 1, "unit": "months"},
+    )
+
+    assert [event["start"] for event in await _events(hass, days=90)] == [
+        "2026-03-31",
+        "2026-04-30",
+        "2026-05-31",
+    ]
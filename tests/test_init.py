@@ -0,0 +1,101 @@
+"""Tests for setting up the ToDo Manager."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_BULK_UPDATE_TODOS,
+    SERVICE_CREATE_TODO,
+    STORAGE_KEY_TODOS,
+    STORAGE_VERSION,
+)
+
+
+def _stored(key: str, data: dict[str, Any]) -> dict[str, Any]:
+    """Return a hass_storage entry."""
+    return {"version": STORAGE_VERSION, "minor_version": 1, "key": key, "data": data}
+
+
+async def test_unreadable_store(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Calls fail instead of waiting forever when the todos can't be loaded."""
+    hass_storage["todo_manager_storage_summary"] = _stored(
+        "todo_manager_storage_summary", {"todos": 1, "active": 1, "overdue": 0}
+    )
+    hass_storage["todo_manager_storage"] = _stored("todo_manager_storage", {})
+    hass_storage["todo_manager_storage_shard_00"] = _stored(
+        "todo_manager_storage_shard_00", {STORAGE_KEY_TODOS: {"broken": "todo"}}
+    )
+    entry = MockConfigEntry(domain=DOMAIN, title="ToDo Manager")
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert not coordinator.hydrated
+    assert coordinator.hydration_error is not None
+    assert hass.states.get("sensor.todo_manager_all").state == STATE_UNAVAILABLE
+    with pytest.raises(HomeAssistantError, match="failed to load"):
+        await coordinator.async_wait_hydrated()
+    with pytest.raises(HomeAssistantError, match="failed to load"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CREATE_TODO,
+            {"title": "Test", "due_date": "2026-01-01"},
+            blocking=True,
+        )
+
+
+async def test_several_entries(hass: HomeAssistant) -> None:
+    """Calls without entry_id fail unless the todos name the entry."""
+    first = MockConfigEntry(domain=DOMAIN, title="Haus", data={"name": "Haus"})
+    second = MockConfigEntry(
+        domain=DOMAIN,
+        title="Büro",
+        data={"name": "Büro", "storage_key": "todo_manager_buero"},
+    )
+    for entry in (first, second):
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    with pytest.raises(ServiceValidationError, match="entry_id is required"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_TODO, {"title": "Test"}, blocking=True
+        )
+    with pytest.raises(ServiceValidationError, match="not found"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CREATE_TODO,
+            {"title": "Test", "entry_id": "unknown"},
+            blocking=True,
+        )
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {"title": "Test", "entry_id": second.entry_id},
+        blocking=True,
+    )
+    coordinator = hass.data[DOMAIN][second.entry_id]
+    todo_id = next(iter(coordinator.todos))
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_UPDATE_TODOS,
+        {"todos": [{"todo_id": todo_id, "title": "Geändert"}]},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"todo_ids": [todo_id]}
+    assert coordinator.todos[todo_id].title == "Geändert"
@@ -0,0 +1,176 @@
+"""Tests for the query_todos service."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_BULK_COMPLETE_TODOS,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_QUERY_TODOS,
+    SERVICE_TOGGLE_ITEM,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+PERSON = "person"
+
+
+@pytest.fixture(autouse=True)
+def freeze_noon(freezer: FrozenDateTimeFactory) -> None:
+    """Start at noon of a fixed day."""
+    freezer.move_to(
+        datetime(2026, 3, 10, 12, tzinfo=dt_util.get_default_time_zone())
+    )
+
+
+@pytest.fixture
+async def todos(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Create todos covering every filter."""
+    person_id = next(iter(coordinator.persons))
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CREATE_TODOS,
+        {
+            "todos": [
+                {"title": "Arzt", "due_date": "2026-03-09", "persons": [person_id]},
+                {
+                    "title": "Einkauf",
+                    "due_date": "2026-03-12",
+                    "todo_type": "shopping",
+                    "items": ["Milch"],
+                    "persons": [person_id],
+                },
+                {
+                    "title": "Packen",
+                    "due_date": "2026-03-20",
+                    "todo_type": "packing",
+                    "items": ["Pass"],
+                },
+                {
+                    "title": "Blumen",
+                    "due_date": "2026-03-11",
+                    "recurring": True,
+                    "recurring_rule": {"interval": 1, "unit": "weeks"},
+                },
+                {"title": "Ohne Datum"},
+                {"title": "Erledigt", "due_date": "2026-03-13"},
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+    packing, done = response["todo_ids"][2], response["todo_ids"][5]
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TOGGLE_ITEM,
+        {"todo_id": packing, "item_id": coordinator.todos[packing].items[0].id},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN, SERVICE_BULK_COMPLETE_TODOS, {"todo_ids": [done]}, blocking=True
+    )
+
+
+async def _query(hass: HomeAssistant, **data: Any) -> dict[str, Any]:
+    """Return the response of the query service."""
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_QUERY_TODOS, data, blocking=True, return_response=True
+    )
+
+
+async def _titles(hass: HomeAssistant, **data: Any) -> list[str]:
+    """Return the titles of the todos matching a query."""
+    response = await _query(hass, **data)
+    return [todo["title"] for todo in response["todos"]]
+
+
+@pytest.mark.usefixtures("todos")
+@pytest.mark.parametrize(
+    ("filters", "titles"),
+    [
+        ({}, ["Arzt", "Blumen", "Einkauf", "Erledigt", "Ohne Datum", "Packen"]),
+        ({"person_id": PERSON}, ["Arzt", "Einkauf"]),
+        ({"todo_type": "shopping"}, ["Einkauf"]),
+        ({"completed": True}, ["Erledigt"]),
+        ({"completed": False}, ["Arzt", "Blumen", "Einkauf", "Ohne Datum", "Packen"]),
+        ({"overdue": True}, ["Arzt"]),
+        (
+            {"overdue": False},
+            ["Blumen", "Einkauf", "Erledigt", "Ohne Datum", "Packen"],
+        ),
+        (
+            {"due_after": "2026-03-11", "due_before": "2026-03-13"},
+            ["Blumen", "Einkauf", "Erledigt"],
+        ),
+        (
+            {"due_after": "2026-03-11", "due_before": "2026-03-13", "completed": False},
+            ["Blumen", "Einkauf"],
+        ),
+        ({"due_before": "2026-03-11", "overdue": False}, ["Blumen"]),
+        ({"recurring": True}, ["Blumen"]),
+        ({"open_items": True}, ["Einkauf"]),
+        ({"open_items": False, "todo_type": "packing"}, ["Packen"]),
+        ({"person_id": PERSON, "overdue": True}, ["Arzt"]),
+        ({"person_id": "unknown"}, []),
+    ],
+)
+async def test_filters(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    filters: dict[str, Any],
+    titles: list[str],
+) -> None:
+    """Filters combine, every todo matching all of them is returned."""
+    if filters.get("person_id") == PERSON:
+        filters["person_id"] = next(iter(coordinator.persons))
+
+    assert await _titles(hass, sort="title", **filters) == titles
+
+
+@pytest.mark.usefixtures("todos")
+async def test_sort(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Todos come sorted by urgency unless another order is asked for."""
+    titles = await _titles(hass)
+    assert titles[0] == "Arzt"
+    assert titles[-1] == "Erledigt"
+    assert await _titles(hass, sort="due_date") == [
+        "Arzt",
+        "Blumen",
+        "Einkauf",
+        "Erledigt",
+        "Packen",
+        "Ohne Datum",
+    ]
+
+
+@pytest.mark.usefixtures("todos")
+async def test_pages(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """The response holds one page and the cursor of the next."""
+    response = await _query(hass, sort="title", limit=4)
+    assert [todo["title"] for todo in response["todos"]] == [
+        "Arzt",
+        "Blumen",
+        "Einkauf",
+        "Erledigt",
+    ]
+    assert response["total"] == 6
+    assert response["next_cursor"] == 4
+    assert "urgency_score" in response["todos"][0]
+
+    response = await _query(hass, sort="title", limit=4, cursor=4)
+    assert [todo["title"] for todo in response["todos"]] == ["Ohne Datum", "Packen"]
+    assert response["next_cursor"] is None
+
+
+async def test_invalid_date(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Dates that can't be parsed are rejected."""
+    with pytest.raises(vol.Invalid, match="Could not parse date"):
+        await _query(hass, due_after="soon")
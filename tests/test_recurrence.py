@@ -0,0 +1,91 @@
+"""Tests for recurring todos."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_CREATE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+
+async def _complete(hass: HomeAssistant, todo_id: str) -> None:
+    """Toggle the completed state of a todo."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": todo_id}, blocking=True
+    )
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, days: int) -> None:
+    """Move the time forward and run what became due."""
+    freezer.tick(timedelta(days=days))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def test_next_occurrence(
+    hass: HomeAssistant, coordinator: TodoCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """A completed recurring todo comes back once the interval passed."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {
+            "title": "Blumen gießen",
+            "due_date": dt_util.now().date(),
+            "recurring": True,
+            "recurring_rule": {"interval": 2, "unit": "days"},
+        },
+        blocking=True,
+    )
+    first = next(iter(coordinator.todos.values()))
+    await _complete(hass, first.id)
+
+    await _tick(hass, freezer, 1)
+    assert len(coordinator.todos) == 1
+
+    await _tick(hass, freezer, 1)
+    assert len(coordinator.todos) == 2
+    assert first.next_occurrence_id in coordinator.todos
+    occurrence = coordinator.todos[first.next_occurrence_id]
+    assert not occurrence.completed
+    assert occurrence.series_id == first.series_id
+    assert occurrence.due_date == dt_util.now().date()
+
+
+async def test_reopened_todo_keeps_its_occurrence(
+    hass: HomeAssistant, coordinator: TodoCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """Completing a todo again doesn't fork its series."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {
+            "title": "Müll",
+            "due_date": dt_util.now().date(),
+            "recurring": True,
+            "recurring_rule": {"interval": 1, "unit": "days"},
+        },
+        blocking=True,
+    )
+    first = next(iter(coordinator.todos.values()))
+    await _complete(hass, first.id)
+    await _tick(hass, freezer, 2)
+    assert len(coordinator.todos) == 2
+
+    # Open the old occurrence and complete it again
+    await _complete(hass, first.id)
+    await _complete(hass, first.id)
+    await _tick(hass, freezer, 2)
+
+    open_todos = [todo for todo in coordinator.todos.values() if not todo.completed]
+    assert [todo.id for todo in open_todos] == [first.next_occurrence_id]
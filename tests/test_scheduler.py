@@ -0,0 +1,113 @@
+"""Tests for the due time scheduler."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    EVENT_TODO_DUE,
+    EVENT_TODO_OVERDUE,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_CREATE_TODO,
+    SERVICE_UPDATE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture(autouse=True)
+def freeze_evening(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Start in the evening of a fixed day."""
+    freezer.move_to(datetime(2026, 3, 10, 20, tzinfo=dt_util.get_default_time_zone()))
+
+
+async def _move_to(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, when: datetime
+) -> None:
+    """Move to a local time and run what became due."""
+    freezer.move_to(when.replace(tzinfo=dt_util.get_default_time_zone()))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def test_due_and_overdue(
+    hass: HomeAssistant, coordinator: TodoCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """A todo is due at the start of its day and overdue at its time."""
+    due_events = async_capture_events(hass, EVENT_TODO_DUE)
+    overdue_events = async_capture_events(hass, EVENT_TODO_OVERDUE)
+    tomorrow = TODAY + timedelta(days=1)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {"title": "Arzt", "due_date": tomorrow, "due_time": "09:30"},
+        blocking=True,
+    )
+    todo_id = next(iter(coordinator.todos))
+
+    await _move_to(hass, freezer, datetime(2026, 3, 10, 23, 59))
+    assert not due_events
+
+    await _move_to(hass, freezer, datetime(2026, 3, 11, 0, 0, 1))
+    assert len(due_events) == 1
+    assert due_events[0].data == {
+        "todo_id": todo_id,
+        "title": "Arzt",
+        "due_date": "2026-03-11",
+        "due_time": "09:30",
+        "persons": [],
+    }
+    assert not overdue_events
+    assert coordinator.get_overdue_count() == 0
+
+    await _move_to(hass, freezer, datetime(2026, 3, 11, 9, 30, 1))
+    assert len(overdue_events) == 1
+    assert overdue_events[0].data["todo_id"] == todo_id
+    assert coordinator.get_overdue_count() == 1
+
+    # Nothing fires twice
+    await _move_to(hass, freezer, datetime(2026, 3, 12, 12))
+    assert len(due_events) == 1
+    assert len(overdue_events) == 1
+
+
+async def test_changed_todos(
+    hass: HomeAssistant, coordinator: TodoCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """Moved todos fire at their new time, completed ones not at all."""
+    overdue_events = async_capture_events(hass, EVENT_TODO_OVERDUE)
+    for title in ("Verschoben", "Erledigt"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CREATE_TODO,
+            {"title": title, "due_date": TODAY, "due_time": "21:00"},
+            blocking=True,
+        )
+    moved_id, done_id = list(coordinator.todos)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": moved_id, "due_time": "22:00"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": done_id}, blocking=True
+    )
+
+    await _move_to(hass, freezer, datetime(2026, 3, 10, 21, 30))
+    assert not overdue_events
+
+    await _move_to(hass, freezer, datetime(2026, 3, 10, 22, 0, 1))
+    assert [event.data["todo_id"] for event in overdue_events] == [moved_id]
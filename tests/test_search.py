@@ -0,0 +1,164 @@
+"""Tests for the search of ToDo Manager."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_DELETE_TODO,
+    SERVICE_SEARCH,
+    SERVICE_UPDATE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+
+async def _create(hass: HomeAssistant, *todos: dict[str, Any]) -> list[str]:
+    """Create todos and return their IDs."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": list(todos)},
+        blocking=True,
+        return_response=True,
+    )
+    return response["todo_ids"]
+
+
+async def _search(hass: HomeAssistant, query: str, **data: Any) -> dict[str, Any]:
+    """Return the response of the search service."""
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SEARCH,
+        {"query": query, **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def _scores(hass: HomeAssistant, query: str, **data: Any) -> list[Any]:
+    """Return the titles and scores of the matches."""
+    response = await _search(hass, query, **data)
+    return [(todo["title"], todo["score"]) for todo in response["todos"]]
+
+
+async def test_search_ranking(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Matches in the title rank above items, whole tokens above prefixes."""
+    await _create(
+        hass,
+        {"title": "Milch kaufen"},
+        {"title": "Einkauf", "todo_type": "shopping", "items": ["Brot", "Milch"]},
+        {"title": "Kochen", "description": "Milchreis mit Zimt"},
+        {"title": "Bad putzen"},
+    )
+
+    assert await _scores(hass, "milch") == [
+        ("Milch kaufen", 4.0),
+        ("Einkauf", 2.0),
+        ("Kochen", 0.5),
+    ]
+    # Every query token has to match
+    assert await _scores(hass, "milch zimt") == [("Kochen", 1.5)]
+    assert await _scores(hass, "milch fenster") == []
+    assert await _scores(hass, "") == []
+
+
+async def test_search_folds_case_and_accents(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Queries match regardless of case and accents."""
+    await _create(hass, {"title": "Gemüse schneiden"})
+
+    assert await _scores(hass, "GEMUSE") == [("Gemüse schneiden", 4.0)]
+    assert await _scores(hass, "gemü") == [("Gemüse schneiden", 2.0)]
+
+
+async def test_search_matched_items(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Matches list the items that contain the query."""
+    (todo_id,) = await _create(
+        hass,
+        {
+            "title": "Einkauf",
+            "todo_type": "shopping",
+            "items": ["Vollmilch", "Milchreis", "Brot"],
+        },
+    )
+
+    response = await _search(hass, "milch")
+
+    milchreis = coordinator.todos[todo_id].items[1].id
+    assert [todo["matched_items"] for todo in response["todos"]] == [[milchreis]]
+
+
+async def test_search_follows_changes(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Updated, completed and deleted todos are found as they are now."""
+    first, second = await _create(hass, {"title": "Fenster"}, {"title": "Fenster"})
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": first, "title": "Balkon"},
+        blocking=True,
+    )
+    assert await _scores(hass, "balkon") == [("Balkon", 4.0)]
+    assert await _scores(hass, "fenster") == [("Fenster", 4.0)]
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": first}, blocking=True
+    )
+    assert await _scores(hass, "balkon", completed=False) == []
+    assert await _scores(hass, "balkon", completed=True) == [("Balkon", 4.0)]
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_DELETE_TODO, {"todo_id": second}, blocking=True
+    )
+    assert await _scores(hass, "fenster") == []
+
+
+async def test_search_pages(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """The search service pages through the matches."""
+    await _create(hass, *({"title": f"Wäsche {index}"} for index in range(5)))
+
+    response = await _search(hass, "wasche", limit=2)
+    assert len(response["todos"]) == 2
+    assert response["total"] == 5
+    assert response["next_cursor"] == 2
+    response = await _search(hass, "wasche", cursor=4, limit=2)
+    assert len(response["todos"]) == 1
+    assert response["next_cursor"] is None
+
+
+async def test_websocket_search(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """Selected fields keep the id, the score and the matched items."""
+    todo_id, _ = await _create(hass, {"title": "Milch kaufen"}, {"title": "Bad putzen"})
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "todo_manager/search", "query": "milch", "fields": ["title"]}
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"] == {
+        "todos": [
+            {
+                "id": todo_id,
+                "title": "Milch kaufen",
+                "score": 4.0,
+                "matched_items": [],
+            }
+        ],
+        "total": 1,
+        "next_cursor": None,
+    }
@@ -0,0 +1,330 @@
+"""Tests for the ToDo Manager services."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, datetime
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_BULK_COMPLETE_TODOS,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_BULK_DELETE_TODOS,
+    SERVICE_BULK_UPDATE_TODOS,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_CREATE_TODO,
+    SERVICE_DELETE_COMPLETED_TODOS,
+    SERVICE_DELETE_PERSON,
+    SERVICE_DELETE_TODO,
+    SERVICE_IMPORT_TODOS,
+    SERVICE_TOGGLE_ITEM,
+    SERVICE_UPDATE_PERSON,
+    SERVICE_UPDATE_TODO,
+    STORAGE_KEY_TODOS,
+    STORAGE_VERSION,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+from custom_components.todo_manager.models import Todo
+
+
+async def _call(hass: HomeAssistant, service: str, data: dict[str, Any]) -> Any:
+    """Call a service of the integration and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, service, data, blocking=True, return_response=True
+    )
+
+
+@pytest.mark.parametrize(
+    ("service", "data", "error"),
+    [
+        (SERVICE_UPDATE_TODO, {"todo_id": "missing", "title": "x"}, "Todo not found"),
+        (SERVICE_DELETE_TODO, {"todo_id": "missing"}, "Todo not found"),
+        (SERVICE_COMPLETE_TODO, {"todo_id": "missing"}, "Todo not found"),
+        (
+            SERVICE_TOGGLE_ITEM,
+            {"todo_id": "missing", "item_id": "missing"},
+            "Todo not found",
+        ),
+        (
+            SERVICE_UPDATE_PERSON,
+            {"person_id": "missing", "person_name": "x"},
+            "Person not found",
+        ),
+        (SERVICE_DELETE_PERSON, {"person_id": "missing"}, "Person not found"),
+    ],
+)
+async def test_unknown_ids(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    service: str,
+    data: dict[str, Any],
+    error: str,
+) -> None:
+    """Services fail for todos and persons that don't exist."""
+    with pytest.raises(ServiceValidationError, match=error):
+        await hass.services.async_call(DOMAIN, service, data, blocking=True)
+
+
+async def test_unknown_item(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Toggling an item that doesn't exist fails."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {"title": "Einkauf", "todo_type": "shopping", "items": ["Milch"]},
+        blocking=True,
+    )
+    todo_id = next(iter(coordinator.todos))
+    with pytest.raises(ServiceValidationError, match="Item not found"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_TOGGLE_ITEM,
+            {"todo_id": todo_id, "item_id": "missing"},
+            blocking=True,
+        )
+
+
+async def test_import_rejects_archived_todos(
+    hass: HomeAssistant, hass_storage: dict[str, Any], tmp_path: Path
+) -> None:
+    """Re-importing an export with the archive doesn't revive archived todos."""
+    archived = Todo(
+        id="archived",
+        title="Alt",
+        due_date=date(2020, 1, 1),
+        completed=True,
+        completed_date=datetime(2020, 1, 1, 12),
+    )
+    hass_storage["todo_manager_archive"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": "todo_manager_archive",
+        "data": {STORAGE_KEY_TODOS: {archived.id: archived.as_dict()}},
+    }
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "todos.jsonl").write_text(
+        json.dumps(archived.as_dict())
+        + "\n"
+        + json.dumps({"id": "new", "title": "Neu"})
+        + "\n"
+    )
+    entry = MockConfigEntry(domain=DOMAIN, title="ToDo Manager")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_TODOS,
+        {"file": "todos.jsonl"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "imported": 1,
+        "rejected": 1,
+        "rejected_rows": [{"line": 1, "error": "Todo is archived: archived"}],
+    }
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert list(coordinator.todos) == ["new"]
+
+
+async def test_bulk_services(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Bulk services create, update, complete and delete several todos."""
+    response = await _call(
+        hass,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": [{"title": "Müll"}, {"title": "Bad"}, {"title": "Fenster"}]},
+    )
+    first, second, third = response["todo_ids"]
+    assert [coordinator.todos[todo_id].title for todo_id in response["todo_ids"]] == [
+        "Müll",
+        "Bad",
+        "Fenster",
+    ]
+
+    response = await _call(
+        hass,
+        SERVICE_BULK_UPDATE_TODOS,
+        {
+            "todos": [
+                {"todo_id": first, "title": "Restmüll"},
+                {"todo_id": second, "due_date": "2026-03-12"},
+            ]
+        },
+    )
+    assert response == {"todo_ids": [first, second]}
+    assert coordinator.todos[first].title == "Restmüll"
+    assert coordinator.todos[second].due_date == date(2026, 3, 12)
+
+    await _call(hass, SERVICE_BULK_COMPLETE_TODOS, {"todo_ids": [second]})
+    # Todos that are already completed stay completed
+    response = await _call(
+        hass,
+        SERVICE_BULK_COMPLETE_TODOS,
+        {"todo_ids": [first, second, first], "result": "erledigt"},
+    )
+    assert response == {"todo_ids": [first]}
+    assert coordinator.todos[first].completed
+    assert coordinator.todos[first].result == "erledigt"
+    assert coordinator.todos[second].completed
+
+    response = await _call(hass, SERVICE_BULK_DELETE_TODOS, {"todo_ids": [third]})
+    assert response == {"todo_ids": [third]}
+    assert list(coordinator.todos) == [first, second]
+
+
+@pytest.mark.parametrize(
+    ("service", "data"),
+    [
+        (
+            SERVICE_BULK_UPDATE_TODOS,
+            lambda todo_id: {
+                "todos": [
+                    {"todo_id": todo_id, "title": "x"},
+                    {"todo_id": "missing", "title": "x"},
+                ]
+            },
+        ),
+        (
+            SERVICE_BULK_COMPLETE_TODOS,
+            lambda todo_id: {"todo_ids": [todo_id, "missing"]},
+        ),
+        (
+            SERVICE_BULK_DELETE_TODOS,
+            lambda todo_id: {"todo_ids": [todo_id, "missing"]},
+        ),
+    ],
+)
+async def test_bulk_unknown_ids(
+    hass: HomeAssistant,
+    coordinator: TodoCoordinator,
+    service: str,
+    data: Callable[[str], dict[str, Any]],
+) -> None:
+    """A bulk change with an unknown todo changes nothing."""
+    response = await _call(hass, SERVICE_BULK_CREATE_TODOS, {"todos": [{"title": "a"}]})
+    todo_id = response["todo_ids"][0]
+    todo = coordinator.todos[todo_id].as_dict()
+
+    with pytest.raises(ServiceValidationError, match="Todos not found: missing"):
+        await _call(hass, service, data(todo_id))
+
+    assert coordinator.todos[todo_id].as_dict() == todo
+
+
+async def test_delete_completed_todos(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Only todos completed before the given date are deleted."""
+    response = await _call(
+        hass,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": [{"title": "Müll"}, {"title": "Bad"}]},
+    )
+    done, todo_id = response["todo_ids"]
+    await _call(hass, SERVICE_BULK_COMPLETE_TODOS, {"todo_ids": [done]})
+
+    response = await _call(
+        hass, SERVICE_DELETE_COMPLETED_TODOS, {"before": "2000-01-01"}
+    )
+    assert response == {"todo_ids": []}
+
+    response = await _call(
+        hass, SERVICE_DELETE_COMPLETED_TODOS, {"before": "2100-01-01"}
+    )
+    assert response == {"todo_ids": [done]}
+    assert list(coordinator.todos) == [todo_id]
+
+
+async def test_expected_revision(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Changes based on an outdated revision of a todo are rejected."""
+    response = await _call(
+        hass,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": [{"title": "Einkauf", "todo_type": "shopping", "items": ["Brot"]}]},
+    )
+    todo = coordinator.todos[response["todo_ids"][0]]
+    revision = todo.revision
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": todo.id, "title": "Wocheneinkauf", "expected_revision": revision},
+        blocking=True,
+    )
+    assert todo.title == "Wocheneinkauf"
+    assert todo.revision > revision
+
+    with pytest.raises(ServiceValidationError, match="changed in the meantime"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_TODO,
+            {"todo_id": todo.id, "title": "Einkauf", "expected_revision": revision},
+            blocking=True,
+        )
+    with pytest.raises(ServiceValidationError, match="changed in the meantime"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_TOGGLE_ITEM,
+            {
+                "todo_id": todo.id,
+                "item_id": todo.items[0].id,
+                "expected_revision": revision,
+            },
+            blocking=True,
+        )
+    assert todo.title == "Wocheneinkauf"
+    assert not todo.items[0].checked
+
+
+async def test_bulk_update_expected_revision(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """A bulk update with one outdated todo changes none of them."""
+    response = await _call(
+        hass,
+        SERVICE_BULK_CREATE_TODOS,
+        {"todos": [{"title": "Müll"}, {"title": "Bad"}]},
+    )
+    first, second = (coordinator.todos[todo_id] for todo_id in response["todo_ids"])
+    outdated = second.revision
+    await _call(
+        hass,
+        SERVICE_BULK_UPDATE_TODOS,
+        {"todos": [{"todo_id": second.id, "title": "x"}]},
+    )
+
+    with pytest.raises(ServiceValidationError, match=f"Todo {second.id} was changed"):
+        await _call(
+            hass,
+            SERVICE_BULK_UPDATE_TODOS,
+            {
+                "todos": [
+                    {
+                        "todo_id": first.id,
+                        "title": "Restmüll",
+                        "expected_revision": first.revision,
+                    },
+                    {
+                        "todo_id": second.id,
+                        "title": "Badezimmer",
+                        "expected_revision": outdated,
+                    },
+                ]
+            },
+        )
+
+    assert first.title == "Müll"
+    assert second.title == "x"
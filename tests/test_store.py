@@ -0,0 +1,249 @@
+"""Tests for the storage of ToDo Manager."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.todo_manager.const import (
+    CONF_JOURNAL,
+    CONF_SAVE_DELAY,
+    DOMAIN,
+    SERVICE_CREATE_TODO,
+    SERVICE_UPDATE_TODO,
+    STORAGE_KEY_PERSONS,
+    STORAGE_KEY_TODOS,
+    STORAGE_VERSION,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+from custom_components.todo_manager.models import Person, Todo
+from custom_components.todo_manager.store import SHARD_COUNT, shard_of
+
+STORAGE_KEY = "todo_manager_storage"
+JOURNAL_OPTIONS = {CONF_SAVE_DELAY: 0, CONF_JOURNAL: True}
+
+
+def _shard_key(index: int) -> str:
+    """Return the storage key of a shard."""
+    return f"{STORAGE_KEY}_shard_{index:02d}"
+
+
+def _stored_todos(hass_storage: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the todos of all stored shards."""
+    todos: dict[str, dict[str, Any]] = {}
+    for index in range(SHARD_COUNT):
+        if _shard_key(index) in hass_storage:
+            todos.update(hass_storage[_shard_key(index)]["data"][STORAGE_KEY_TODOS])
+    return todos
+
+
+def _store_shards(hass_storage: dict[str, Any], todos: list[Todo]) -> None:
+    """Put todos into the shards and an empty persons store."""
+    for index in range(SHARD_COUNT):
+        hass_storage[_shard_key(index)] = {
+            "version": STORAGE_VERSION,
+            "minor_version": 1,
+            "key": _shard_key(index),
+            "data": {
+                STORAGE_KEY_TODOS: {
+                    todo.id: todo.as_dict()
+                    for todo in todos
+                    if shard_of(todo.id) == index
+                }
+            },
+        }
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 3,
+        "key": STORAGE_KEY,
+        "data": {STORAGE_KEY_PERSONS: {}},
+    }
+
+
+def _journal(hass: HomeAssistant) -> Path:
+    """Return the path of the journal."""
+    return Path(hass.config.path(".storage", f"{STORAGE_KEY}_journal.jsonl"))
+
+
+async def _setup(hass: HomeAssistant, config_entry: MockConfigEntry) -> TodoCoordinator:
+    """Set up the integration and wait until the todos are loaded."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return hass.data[DOMAIN][config_entry.entry_id]
+
+
+async def test_migrate_single_file(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Todos of the single file layout move to the shards."""
+    todos = [Todo(id=f"todo-{index}", title=f"ToDo {index}") for index in range(20)]
+    person = Person(id="anna", name="Anna", color="#ff0000")
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 2,
+        "key": STORAGE_KEY,
+        "data": {
+            STORAGE_KEY_TODOS: {todo.id: todo.as_dict() for todo in todos},
+            STORAGE_KEY_PERSONS: {person.id: person.as_dict()},
+        },
+    }
+
+    coordinator = await _setup(hass, config_entry)
+
+    assert list(coordinator.todos) == [todo.id for todo in todos]
+    assert list(coordinator.persons) == ["anna"]
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        STORAGE_KEY_PERSONS: {"anna": person.as_dict()}
+    }
+    assert _stored_todos(hass_storage) == {todo.id: todo.as_dict() for todo in todos}
+    for todo in todos:
+        shard = hass_storage[_shard_key(shard_of(todo.id))]
+        assert todo.id in shard["data"][STORAGE_KEY_TODOS]
+
+
+async def test_only_dirty_shards_written(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Changing a todo writes its shard and leaves the others alone."""
+    _store_shards(
+        hass_storage,
+        [Todo(id=f"todo-{index}", title=f"ToDo {index}") for index in range(20)],
+    )
+    coordinator = await _setup(hass, config_entry)
+    assert len(coordinator.todos) == 20
+    for index in range(SHARD_COUNT):
+        del hass_storage[_shard_key(index)]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": "todo-3", "title": "Geändert"},
+        blocking=True,
+    )
+
+    shard = _shard_key(shard_of("todo-3"))
+    assert [key for key in hass_storage if "_shard_" in key] == [shard]
+    # Persons didn't change
+    assert hass_storage[STORAGE_KEY]["data"] == {STORAGE_KEY_PERSONS: {}}
+    assert hass_storage[shard]["data"][STORAGE_KEY_TODOS]["todo-3"]["title"] == (
+        "Geändert"
+    )
+
+
+@pytest.mark.parametrize("options", [JOURNAL_OPTIONS])
+async def test_journal_appends(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+    tmp_path: Path,
+) -> None:
+    """In journal mode changes are appended instead of writing the shards."""
+    hass.config.config_dir = str(tmp_path)
+    _store_shards(hass_storage, [Todo(id="alt", title="Alt")])
+    coordinator = await _setup(hass, config_entry)
+    for index in range(SHARD_COUNT):
+        del hass_storage[_shard_key(index)]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": "alt", "title": "Neu"},
+        blocking=True,
+    )
+
+    assert not [key for key in hass_storage if "_shard_" in key]
+    records = [json.loads(line) for line in _journal(hass).read_text().splitlines()]
+    assert records == [
+        {
+            "op": "set",
+            "todo_id": "alt",
+            "todo": coordinator.todos["alt"].as_dict(),
+            "revision": coordinator.revision,
+        }
+    ]
+
+
+@pytest.mark.parametrize("options", [JOURNAL_OPTIONS])
+async def test_journal_replay(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+    tmp_path: Path,
+) -> None:
+    """Loading replays the journal over the shards and compacts it."""
+    hass.config.config_dir = str(tmp_path)
+    _store_shards(
+        hass_storage, [Todo(id="changed", title="Alt"), Todo(id="deleted", title="Weg")]
+    )
+    changed = Todo(id="changed", title="Neu")
+    created = Todo(id="created", title="Neu angelegt")
+    person = Person(id="anna", name="Anna", color="#ff0000")
+    records = [
+        {"op": "set", "todo_id": "changed", "todo": changed.as_dict()},
+        {"op": "set", "todo_id": "created", "todo": created.as_dict()},
+        {"op": "delete", "todo_id": "deleted"},
+        {"op": "persons", "persons": {"anna": person.as_dict()}},
+    ]
+    _journal(hass).parent.mkdir()
+    _journal(hass).write_text(
+        "".join(f"{json.dumps(record)}\n" for record in records)
+        # A crash while appending leaves a partial last line
+        + '{"op": "set", "todo_'
+    )
+
+    coordinator = await _setup(hass, config_entry)
+
+    assert {todo_id: todo.title for todo_id, todo in coordinator.todos.items()} == {
+        "changed": "Neu",
+        "created": "Neu angelegt",
+    }
+    assert list(coordinator.persons) == ["anna"]
+    assert not _journal(hass).exists()
+    assert _stored_todos(hass_storage) == {
+        "changed": changed.as_dict(),
+        "created": created.as_dict(),
+    }
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        STORAGE_KEY_PERSONS: {"anna": person.as_dict()}
+    }
+
+
+@pytest.mark.parametrize("options", [JOURNAL_OPTIONS])
+async def test_journal_compaction(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+    tmp_path: Path,
+) -> None:
+    """The journal is folded into the shards once it is long enough."""
+    hass.config.config_dir = str(tmp_path)
+    _store_shards(hass_storage, [])
+    coordinator = await _setup(hass, config_entry)
+
+    with patch("custom_components.todo_manager.store.COMPACT_AFTER", 3):
+        for title in ("Müll", "Bad"):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_CREATE_TODO, {"title": title}, blocking=True
+            )
+        assert len(_journal(hass).read_text().splitlines()) == 2
+        assert not _stored_todos(hass_storage)
+
+        await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_TODO, {"title": "Fenster"}, blocking=True
+        )
+
+    assert not _journal(hass).exists()
+    assert _stored_todos(hass_storage) == {
+        todo_id: todo.as_dict() for todo_id, todo in coordinator.todos.items()
+    }
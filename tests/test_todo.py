@@ -0,0 +1,139 @@
+"""Tests for the todo platform of ToDo Manager."""
+from __future__ import annotations
+
+from datetime import date, time
+from typing import Any
+
+from homeassistant.components.todo import DOMAIN as TODO_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_CREATE_PERSON,
+    SERVICE_CREATE_TODO,
+    SERVICE_DELETE_PERSON,
+    SERVICE_UPDATE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+
+def _entity_id(hass: HomeAssistant, unique_id: str) -> str | None:
+    """Return the entity id of a todo entity of the integration."""
+    return er.async_get(hass).async_get_entity_id("todo", DOMAIN, unique_id)
+
+
+async def _items(hass: HomeAssistant, entity_id: str) -> list[dict[str, Any]]:
+    """Return the items of a todo entity."""
+    response = await hass.services.async_call(
+        TODO_DOMAIN,
+        "get_items",
+        {},
+        target={"entity_id": entity_id},
+        blocking=True,
+        return_response=True,
+    )
+    return response[entity_id]["items"]
+
+
+async def _call(
+    hass: HomeAssistant, service: str, entity_id: str, **data: Any
+) -> None:
+    """Call a service of the todo platform."""
+    await hass.services.async_call(
+        TODO_DOMAIN, service, data, target={"entity_id": entity_id}, blocking=True
+    )
+
+
+async def test_list_entity(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Shopping lists get an entity whose items are the list items."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_TODO,
+        {"title": "Einkauf", "todo_type": "shopping", "items": ["Milch"]},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    todo = next(iter(coordinator.todos.values()))
+    entity_id = _entity_id(hass, f"todo_manager_list_{todo.id}")
+    assert entity_id
+    assert hass.states.get(entity_id).state == "1"
+
+    await _call(hass, "add_item", entity_id, item="Brot", description="2 Stück")
+    await _call(hass, "update_item", entity_id, item="Milch", status="completed")
+
+    assert [(item.name, item.quantity, item.checked) for item in todo.items] == [
+        ("Milch", "", True),
+        ("Brot", "2 Stück", False),
+    ]
+    assert [
+        (item["summary"], item["status"]) for item in await _items(hass, entity_id)
+    ] == [("Milch", "completed"), ("Brot", "needs_action")]
+    assert hass.states.get(entity_id).state == "1"
+
+    await _call(hass, "remove_item", entity_id, item=["Milch"])
+    assert [item.name for item in todo.items] == ["Brot"]
+
+    # The entity goes away once the todo is no list anymore
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_TODO,
+        {"todo_id": todo.id, "todo_type": "simple"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert _entity_id(hass, f"todo_manager_list_{todo.id}") is None
+
+
+async def test_person_entity(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Todos created, updated and deleted through a person's entity."""
+    person_id = next(iter(coordinator.persons))
+    entity_id = _entity_id(hass, f"todo_manager_person_{person_id}_todos")
+    assert entity_id
+
+    await _call(hass, "add_item", entity_id, item="Arzt", due_date="2026-03-12")
+    await _call(
+        hass, "add_item", entity_id, item="Zahnarzt", due_datetime="2026-03-13 09:30"
+    )
+    arzt, zahnarzt = coordinator.todos.values()
+    assert arzt.persons == [person_id]
+    assert (arzt.due_date, arzt.due_time) == (date(2026, 3, 12), time(23, 59))
+    assert (zahnarzt.due_date, zahnarzt.due_time) == (date(2026, 3, 13), time(9, 30))
+    assert hass.states.get(entity_id).state == "2"
+    items = await _items(hass, entity_id)
+    assert {item["summary"]: item.get("due") for item in items} == {
+        "Arzt": "2026-03-12",
+        "Zahnarzt": "2026-03-13T09:30:00-07:00",
+    }
+
+    await _call(hass, "update_item", entity_id, item="Arzt", status="completed")
+    assert arzt.completed
+    assert hass.states.get(entity_id).state == "1"
+
+    await _call(hass, "remove_item", entity_id, item=["Zahnarzt"])
+    assert list(coordinator.todos) == [arzt.id]
+
+
+async def test_person_entities_follow_persons(
+    hass: HomeAssistant, coordinator: TodoCoordinator
+) -> None:
+    """Persons get an entity when created and lose it when deleted."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_CREATE_PERSON, {"person_name": "Anna"}, blocking=True
+    )
+    await hass.async_block_till_done()
+    person_id = next(
+        person.id for person in coordinator.persons.values() if person.name == "Anna"
+    )
+    unique_id = f"todo_manager_person_{person_id}_todos"
+    entity_id = _entity_id(hass, unique_id)
+    assert entity_id
+    assert hass.states.get(entity_id).state == "0"
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_DELETE_PERSON, {"person_id": person_id}, blocking=True
+    )
+    await hass.async_block_till_done()
+    assert _entity_id(hass, unique_id) is None
@@ -0,0 +1,191 @@
+"""Tests for importing and exporting todos."""
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_BULK_COMPLETE_TODOS,
+    SERVICE_BULK_CREATE_TODOS,
+    SERVICE_BULK_DELETE_TODOS,
+    SERVICE_EXPORT_TODOS,
+    SERVICE_IMPORT_TODOS,
+    SERVICE_TOGGLE_ITEM,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+from custom_components.todo_manager.models import Todo
+
+
+@pytest.fixture(autouse=True)
+def freeze_noon(freezer: FrozenDateTimeFactory) -> None:
+    """Start at noon of a fixed day."""
+    freezer.move_to(
+        datetime(2026, 3, 10, 12, tzinfo=dt_util.get_default_time_zone())
+    )
+
+
+@pytest.fixture(autouse=True)
+def config_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Read and write the files in a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+
+
+async def _call(hass: HomeAssistant, service: str, data: dict[str, Any]) -> Any:
+    """Call a service of the integration and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, service, data, blocking=True, return_response=True
+    )
+
+
+async def _create_todos(hass: HomeAssistant, coordinator: TodoCoordinator) -> None:
+    """Create todos using every field that is exported."""
+    person_id = next(iter(coordinator.persons))
+    response = await _call(
+        hass,
+        SERVICE_BULK_CREATE_TODOS,
+        {
+            "todos": [
+                {
+                    "title": "Arzt, Termin",
+                    "description": 'Karte "mitnehmen"\nund Überweisung',
+                    "due_date": "2026-03-12",
+                    "due_time": "09:30",
+                    "persons": [person_id],
+                },
+                {
+                    "title": "Einkauf",
+                    "todo_type": "shopping",
+                    "items": [
+                        {"name": "Milch", "quantity": "2 l"},
+                        {"name": "Brot"},
+                    ],
+                },
+                {
+                    "title": "Blumen gießen",
+                    "due_date": "2026-03-11",
+                    "recurring": True,
+                    "recurring_rule": {"interval": 2, "unit": "weeks"},
+                },
+                {"title": "Steuer", "due_date": "2026-03-01"},
+            ]
+        },
+    )
+    shopping, done = response["todo_ids"][1], response["todo_ids"][3]
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TOGGLE_ITEM,
+        {"todo_id": shopping, "item_id": coordinator.todos[shopping].items[1].id},
+        blocking=True,
+    )
+    await _call(
+        hass,
+        SERVICE_BULK_COMPLETE_TODOS,
+        {"todo_ids": [done], "result": "Abgegeben"},
+    )
+
+
+def _comparable(todo: Todo, keeps_ids: bool) -> dict[str, Any]:
+    """Return what a round trip keeps of a todo.
+
+    CSV and iCalendar files don't hold the ids of items and series, they
+    get new ones on import.
+    """
+    data = todo.as_dict()
+    data.pop("revision")
+    if not keeps_ids:
+        data.pop("series_id")
+        for item in data["items"]:
+            item.pop("id")
+    return data
+
+
+@pytest.mark.parametrize(
+    ("file", "keeps_ids"),
+    [("todos.jsonl", True), ("todos.csv", False), ("todos.ics", False)],
+)
+async def test_round_trip(
+    hass: HomeAssistant, coordinator: TodoCoordinator, file: str, keeps_ids: bool
+) -> None:
+    """Exported todos come back unchanged when imported again."""
+    await _create_todos(hass, coordinator)
+    exported = {
+        todo_id: _comparable(todo, keeps_ids)
+        for todo_id, todo in coordinator.todos.items()
+    }
+
+    response = await _call(hass, SERVICE_EXPORT_TODOS, {"file": file})
+    assert response == {"exported": 4, "file": file}
+    await _call(hass, SERVICE_BULK_DELETE_TODOS, {"todo_ids": list(exported)})
+    response = await _call(hass, SERVICE_IMPORT_TODOS, {"file": file})
+
+    assert response == {"imported": 4, "rejected": 0, "rejected_rows": []}
+    assert {
+        todo_id: _comparable(todo, keeps_ids)
+        for todo_id, todo in coordinator.todos.items()
+    } == exported
+
+
+async def test_export_keeps_existing_file(
+    hass: HomeAssistant, coordinator: TodoCoordinator, tmp_path: Path
+) -> None:
+    """Existing files are only replaced when asked to."""
+    await _create_todos(hass, coordinator)
+    (tmp_path / "todos.csv").write_text("alt")
+
+    with pytest.raises(ServiceValidationError, match="exists"):
+        await _call(hass, SERVICE_EXPORT_TODOS, {"file": "todos.csv"})
+    assert (tmp_path / "todos.csv").read_text() == "alt"
+
+    response = await _call(
+        hass, SERVICE_EXPORT_TODOS, {"file": "todos.csv", "overwrite": True}
+    )
+    assert response == {"exported": 4, "file": "todos.csv"}
+    assert (tmp_path / "todos.csv").read_text().startswith("id,")
+
+
+@pytest.mark.parametrize(
+    ("file", "error"),
+    [
+        ("../todos.jsonl", "not in the config directory"),
+        (".storage/todos.jsonl", "managed by Home Assistant"),
+        ("todos.txt", "unknown format"),
+    ],
+)
+async def test_rejected_paths(
+    hass: HomeAssistant, coordinator: TodoCoordinator, file: str, error: str
+) -> None:
+    """Files outside the config directory, in .storage or unknown fail."""
+    with pytest.raises(ServiceValidationError, match=error):
+        await _call(hass, SERVICE_EXPORT_TODOS, {"file": file})
+    with pytest.raises(ServiceValidationError, match=error):
+        await _call(hass, SERVICE_IMPORT_TODOS, {"file": file})
+
+
+async def test_import_rejects_rows(
+    hass: HomeAssistant, coordinator: TodoCoordinator, tmp_path: Path
+) -> None:
+    """Rows that can't be imported are reported, the others are imported."""
+    (tmp_path / "todos.jsonl").write_text(
+        '{"id": "neu", "title": "Neu", "persons": ["Standard", "Unbekannt"]}\n'
+        "kein json\n"
+        '{"title": "Falsch", "due_date": "morgen"}\n'
+        '{"id": "neu", "title": "Doppelt"}\n'
+    )
+
+    response = await _call(hass, SERVICE_IMPORT_TODOS, {"file": "todos.jsonl"})
+
+    assert response["imported"] == 1
+    assert response["rejected"] == 3
+    assert [row["line"] for row in response["rejected_rows"]] == [2, 3, 4]
+    assert response["rejected_rows"][2] == {"line": 4, "error": "Todo exists: neu"}
+    # Persons are matched by name, unknown ones are left out
+    assert coordinator.todos["neu"].persons == list(coordinator.persons)
@@ -0,0 +1,222 @@
+"""Tests for the ToDo Manager websocket commands."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.todo_manager.const import (
+    DOMAIN,
+    SERVICE_COMPLETE_TODO,
+    SERVICE_CREATE_PERSON,
+    SERVICE_CREATE_TODO,
+    SERVICE_DELETE_TODO,
+)
+from custom_components.todo_manager.coordinator import TodoCoordinator
+
+
+async def _create(hass: HomeAssistant, **data: Any) -> None:
+    """Create a todo."""
+    await hass.services.async_call(DOMAIN, SERVICE_CREATE_TODO, data, blocking=True)
+
+
+async def _list(client, **filters: Any) -> dict[str, Any]:
+    """Return the result of a list command."""
+    await client.send_json_auto_id({"type": "todo_manager/list", **filters})
+    response = await client.receive_json()
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_list_filters(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """Filters combine, fields reduce the todos to what is asked for."""
+    person_id = next(iter(coordinator.persons))
+    await _create(hass, title="Einkauf", todo_type="shopping", persons=[person_id])
+    await _create(hass, title="Packen", todo_type="packing")
+    await _create(hass, title="Erledigt", persons=[person_id])
+    done_id = next(
+        todo.id for todo in coordinator.todos.values() if todo.title == "Erledigt"
+    )
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": done_id}, blocking=True
+    )
+    client = await hass_ws_client(hass)
+
+    result = await _list(client, person=person_id, fields=["title"])
+    assert [todo["title"] for todo in result["todos"]] == ["Einkauf", "Erledigt"]
+    assert set(result["todos"][0]) == {"id", "title"}
+
+    result = await _list(client, person=person_id, completed=False)
+    assert [todo["title"] for todo in result["todos"]] == ["Einkauf"]
+
+    result = await _list(client, todo_type="packing")
+    assert [todo["title"] for todo in result["todos"]] == ["Packen"]
+    assert result["total"] == 1
+    assert result["next_cursor"] is None
+
+    result = await _list(client, completed=True, todo_type="packing")
+    assert result == {"todos": [], "total": 0, "next_cursor": None}
+
+
+async def test_get_and_persons(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """Single todos are found by id, the persons are listed."""
+    await _create(hass, title="Arzt", due_date="2030-01-01", due_time="09:30")
+    todo_id = next(iter(coordinator.todos))
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "todo_manager/get", "todo_id": todo_id, "fields": ["due_time"]}
+    )
+    response = await client.receive_json()
+    assert response["result"] == {"id": todo_id, "due_time": "09:30"}
+
+    await client.send_json_auto_id({"type": "todo_manager/get", "todo_id": "x"})
+    response = await client.receive_json()
+    assert response["error"]["code"] == "not_found"
+
+    await client.send_json_auto_id({"type": "todo_manager/persons"})
+    response = await client.receive_json()
+    assert response["result"] == {"persons": coordinator.get_persons()}
+
+
+async def test_list_due_range(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """The due range is inclusive and invalid dates are rejected."""
+    for day in range(1, 5):
+        await _create(hass, title=f"Tag {day}", due_date=f"2030-01-0{day}")
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {
+            "type": "todo_manager/list",
+            "due_after": "2030-01-02",
+            "due_before": "2030-01-03",
+            "fields": ["title"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert sorted(todo["title"] for todo in response["result"]["todos"]) == [
+        "Tag 2",
+        "Tag 3",
+    ]
+
+    await client.send_json_auto_id(
+        {"type": "todo_manager/list", "due_after": "2030-13-01"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_subscribe_and_page(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """The subscription carries changes only, the todos come page by page."""
+    for day in range(1, 6):
+        await _create(hass, title=f"Tag {day}", due_date=f"2030-01-0{day}")
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "todo_manager/subscribe"})
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]
+    assert snapshot["revision"] == coordinator.revision
+    assert "todos" not in snapshot["snapshot"]
+    assert [person["name"] for person in snapshot["snapshot"]["persons"]] == [
+        "Standard"
+    ]
+
+    titles = []
+    cursor = 0
+    while cursor is not None:
+        await client.send_json_auto_id(
+            {"type": "todo_manager/list", "cursor": cursor, "limit": 2}
+        )
+        result = (await client.receive_json())["result"]
+        assert result["total"] == 5
+        titles.extend(todo["title"] for todo in result["todos"])
+        cursor = result["next_cursor"]
+    # Most urgent, so earliest due first
+    assert titles == [f"Tag {day}" for day in range(1, 6)]
+
+    await _create(hass, title="Neu")
+    event = (await client.receive_json())["event"]
+    assert event["revision"] == snapshot["revision"] + 1
+    assert event["change"] == "created"
+    assert event["todo"]["title"] == "Neu"
+
+
+async def test_subscribe_changes(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """Every change is one event with the next revision, fields apply."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "todo_manager/subscribe", "fields": ["title", "completed"]}
+    )
+    assert (await client.receive_json())["success"]
+    subscription = await client.receive_json()
+    revision = subscription["event"]["revision"]
+
+    await _create(hass, title="Arzt")
+    created = (await client.receive_json())["event"]
+    todo_id = created["todo_id"]
+    assert created == {
+        "revision": revision + 1,
+        "change": "created",
+        "todo_id": todo_id,
+        "todo": {"id": todo_id, "title": "Arzt", "completed": False},
+    }
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_COMPLETE_TODO, {"todo_id": todo_id}, blocking=True
+    )
+    updated = (await client.receive_json())["event"]
+    assert updated["revision"] == revision + 2
+    assert updated["change"] == "updated"
+    assert updated["todo"]["completed"]
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_DELETE_TODO, {"todo_id": todo_id}, blocking=True
+    )
+    deleted = (await client.receive_json())["event"]
+    assert deleted == {
+        "revision": revision + 3,
+        "change": "deleted",
+        "todo_id": todo_id,
+    }
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_PERSON,
+        {"person_name": "Anna", "person_color": "#ff0000"},
+        blocking=True,
+    )
+    person = (await client.receive_json())["event"]
+    assert person["revision"] == revision + 4
+    assert person["change"] == "created"
+    assert person["person"]["name"] == "Anna"
+    assert person["person"]["color"] == "#ff0000"
+
+
+async def test_unsubscribe(
+    hass: HomeAssistant, coordinator: TodoCoordinator, hass_ws_client
+) -> None:
+    """Closing the subscription removes its change listener."""
+    listeners = len(coordinator._change_listeners)
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "todo_manager/subscribe"})
+    subscribed = await client.receive_json()
+    await client.receive_json()
+    assert len(coordinator._change_listeners) == listeners + 1
+
+    await client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": subscribed["id"]}
+    )
+    assert (await client.receive_json())["success"]
+    assert len(coordinator._change_listeners) == listeners
@@ -1,8 +1,25 @@
+// Summary sensors, named after the list: sensor.<list>_all and so on
+const SENSORS = ['all', 'active', 'overdue'];
+
+// Item lists longer than this are virtualized
+const VIRTUAL_THRESHOLD = 50;
+const VIRTUAL_ROW_HEIGHT = 32;
+const VIRTUAL_VISIBLE_ROWS = 12;
+const VIRTUAL_OVERSCAN = 4;
+
+const TODO_FIELDS = [
+  'title', 'description', 'due_date', 'due_time', 'todo_type', 'persons',
+  'recurring', 'recurring_rule', 'completed', 'result', 'items', 'revision'
+];
+
 class TodoManagerCard extends HTMLElement {
   setConfig(config) {
     this.config = {
       title: config.title || 'ToDo Manager',
       show_completed: config.show_completed !== false,
+      page_size: config.page_size || 50,
+      // entry_id and sensor_prefix are only needed with several lists
+      sensor_prefix: config.sensor_prefix || 'sensor.todo_manager',
       ...config
     };
     if (this.content) {
@@ -11,16 +28,45 @@ class TodoManagerCard extends HTMLElement {
   }
 
   set hass(hass) {
+    // Home Assistant calls this on every state change of any entity, so
+    // bail out early unless the revision or one of the counters changed
     this._hass = hass;
-    if (this.content) {
-      this.updateCard();
+    if (!this.content) return;
+    if (!this._unsubscribe) {
+      this.subscribe();
+    }
+    const revision = hass.states[this.sensor('active')]?.attributes.revision;
+    const counters = SENSORS.map(kind => hass.states[this.sensor(kind)]?.state).join();
+    if (revision === this._sensorRevision && counters === this._counters) return;
+    this._sensorRevision = revision;
+    this._counters = counters;
+    // Todo changes arrive through the subscription, only re-render here if
+    // the card is already up to date, e.g. when a todo became overdue
+    if (this._todoMap && (revision === undefined || revision <= this._revision)) {
+      this.scheduleUpdate();
     }
   }
 
+  sensor(kind) {
+    return `${this.config.sensor_prefix}_${kind}`;
+  }
+
+  withEntry(data) {
+    return this.config.entry_id ? { ...data, entry_id: this.config.entry_id } : data;
+  }
+
+  callService(service, data) {
+    return this._hass.callService('todo_manager', service, this.withEntry(data));
+  }
+
   connectedCallback() {
     this.renderCard();
   }
 
+  disconnectedCallback() {
+    this.unsubscribe();
+  }
+
   renderCard() {
     if (!this.content) {
       const card = document.createElement('ha-card');
@@ -30,17 +76,161 @@ class TodoManagerCard extends HTMLElement {
       card.appendChild(this.content);
       this.appendChild(card);
     }
-    this.updateCard();
+    if (this._unsubscribe) {
+      this.updateCard();
+    } else {
+      this.subscribe();
+    }
+  }
+
+  async subscribe() {
+    if (!this._hass || this._subscribing) return;
+    this._subscribing = true;
+    try {
+      this._unsubscribe = await this._hass.connection.subscribeMessage(
+        event => this.handleChange(event),
+        this.withEntry({ type: 'todo_manager/subscribe', fields: TODO_FIELDS })
+      );
+    } catch (error) {
+      console.error('Error subscribing to todos:', error);
+      this.content.innerHTML = '<p>Fehler beim Laden der ToDos</p>';
+    } finally {
+      this._subscribing = false;
+    }
+  }
+
+  unsubscribe() {
+    if (this._unsubscribe) {
+      this._unsubscribe();
+      this._unsubscribe = null;
+    }
+  }
+
+  handleChange(event) {
+    if (event.snapshot) {
+      // The subscription only carries changes, the todos are fetched page
+      // by page and kept current by the changes arriving meanwhile
+      this._todoMap = new Map();
+      this._cursor = 0;
+      this._persons = event.snapshot.persons;
+      this._revision = event.revision;
+      this.loadPage();
+      return;
+    } else if (!this._todoMap || event.revision !== this._revision + 1) {
+      // Missed a change, start over
+      this.unsubscribe();
+      this.subscribe();
+      return;
+    } else if (event.todo_id) {
+      if (event.todo && (this.config.show_completed || !event.todo.completed)) {
+        this._todoMap.set(event.todo_id, event.todo);
+      } else {
+        this._todoMap.delete(event.todo_id);
+      }
+    } else if (event.person_id) {
+      const persons = (this._persons || []).filter(p => p.id !== event.person_id);
+      if (event.person) {
+        persons.push(event.person);
+      }
+      this._persons = persons;
+    }
+    this._revision = event.revision;
+    this.scheduleUpdate();
+  }
+
+  async loadPage() {
+    // The next page of todos by urgency, the first one after subscribing
+    const todoMap = this._todoMap;
+    if (this._loadingMap === todoMap || this._cursor === null) return;
+    this._loadingMap = todoMap;
+    try {
+      const request = {
+        type: 'todo_manager/list',
+        cursor: this._cursor,
+        limit: this.config.page_size,
+        fields: TODO_FIELDS
+      };
+      if (!this.config.show_completed) {
+        request.completed = false;
+      }
+      const page = await this._hass.callWS(this.withEntry(request));
+      // Resubscribed meanwhile, the page belongs to the old subscription
+      if (todoMap !== this._todoMap) return;
+      for (const todo of page.todos) {
+        // A change that arrived first may be newer than the page
+        const current = todoMap.get(todo.id);
+        if (!current || current.revision <= todo.revision) {
+          todoMap.set(todo.id, todo);
+        }
+      }
+      this._cursor = page.next_cursor;
+    } catch (error) {
+      console.error('Error loading todos:', error);
+    } finally {
+      if (this._loadingMap === todoMap) {
+        this._loadingMap = null;
+      }
+    }
+    this.scheduleUpdate();
+  }
+
+  scheduleUpdate() {
+    // Coalesce bursts of changes into a single render
+    if (this._updateScheduled) return;
+    this._updateScheduled = true;
+    requestAnimationFrame(() => {
+      this._updateScheduled = false;
+      this.updateCard();
+    });
+  }
+
+  sortedTodos() {
+    return Array.from(this._todoMap?.values() || [])
+      .sort((a, b) => this.urgencyScore(b) - this.urgencyScore(a));
+  }
+
+  urgencyScore(todo) {
+    // Mirrors the urgency score of the integration
+    if (todo.completed) return 0;
+    if (!todo.due_date) return 0.5;
+    const dueDt = new Date(`${todo.due_date}T${todo.due_time || '23:59'}:00`);
+    if (isNaN(dueDt)) return 0.5;
+    const hours = (dueDt - new Date()) / (1000 * 60 * 60);
+    if (hours < 0) return 1000 - hours;
+    if (hours < 24) return 100 - hours;
+    if (hours < 168) return 50 - hours / 7;
+    return 10 - hours / 168;
+  }
+
+  loadMore() {
+    this._visibleCount = this.visibleCount() + this.config.page_size;
+    if (this.hasMorePages() && this._todoMap.size < this._visibleCount) {
+      this.loadPage();
+    } else {
+      this.updateCard();
+    }
+  }
+
+  hasMorePages() {
+    return Boolean(this._todoMap) && this._cursor !== null && this._cursor !== undefined;
+  }
+
+  visibleCount() {
+    return this._visibleCount || this.config.page_size;
   }
 
   async updateCard() {
     if (!this._hass) return;
 
     try {
-      // Get todos and persons from sensor attributes
-      const activeSensor = this._hass.states['sensor.todo_manager_active'];
-      const todos = activeSensor?.attributes?.todos || [];
-      const persons = activeSensor?.attributes?.persons || [];
+      const todos = this.sortedTodos();
+      const persons = this._persons || [];
+
+      // Header, filters and modals only change with the persons, so open
+      // modals survive todo changes
+      if (!this._shell || this._shellPersons !== persons) {
+        this.renderShell(persons);
+      }
 
       const showCompleted = this.config.show_completed;
       let displayTodos = showCompleted ? todos : todos.filter(t => !t.completed);
@@ -56,58 +246,147 @@ class TodoManagerCard extends HTMLElement {
           displayTodos = displayTodos.filter(t => !t.completed && t.due_date === today);
         }
       }
+      const hasMore = displayTodos.length > this.visibleCount() || this.hasMorePages();
+      displayTodos = displayTodos.slice(0, this.visibleCount());
 
       const activeTodos = todos.filter(t => !t.completed);
-      const overdueTodos = activeTodos.filter(t => this.isOverdue(t));
       const urgentTodos = activeTodos.filter(t => this.isUrgent(t) && !this.isOverdue(t));
-      const overdueSensor = this._hass.states['sensor.todo_manager_overdue'];
-      const overdueCount = overdueSensor?.state || overdueTodos.length;
-
-      let html = this.getStyles() + `
-        <div class="todo-manager">
-          <div class="todo-header">
-            <div class="stats">
-              <span class="stat-item">📋 Total: ${todos.length}</span>
-              <span class="stat-item stat-active">✅ Aktiv: ${activeTodos.length}</span>
-              <span class="stat-item stat-overdue">🔴 Überfällig: ${overdueCount}</span>
-              ${urgentTodos.length > 0 ? `<span class="stat-item stat-urgent">⚡ Dringend: ${urgentTodos.length}</span>` : ''}
-            </div>
-            <div class="header-actions">
-              <button class="btn btn-secondary" onclick="this.getRootNode().host.openPersonModal()" title="Personen verwalten">
-                👥 Personen
-              </button>
-              <button class="btn btn-primary" onclick="this.getRootNode().host.openModal()">
-                + Neues ToDo
-              </button>
-            </div>
-          </div>
-          ${this.renderUrgencyFilters()}
-          <div class="todo-list">
-      `;
-
-      if (displayTodos.length === 0) {
-        html += '<p class="empty-state">Keine ToDos vorhanden</p>';
-      } else {
-        displayTodos.forEach(todo => {
-          html += this.renderTodoItem(todo, persons);
-        });
-      }
+      const totalCount = this._hass.states[this.sensor('all')]?.state ?? todos.length;
+      const activeCount = this._hass.states[this.sensor('active')]?.state ?? activeTodos.length;
+      const overdueSensor = this._hass.states[this.sensor('overdue')];
+      const overdueCount = overdueSensor?.state || activeTodos.filter(t => this.isOverdue(t)).length;
+
+      this.patchHtml(this._shell.stats, `
+        <span class="stat-item">📋 Total: ${totalCount}</span>
+        <span class="stat-item stat-active">✅ Aktiv: ${activeCount}</span>
+        <span class="stat-item stat-overdue">🔴 Überfällig: ${overdueCount}</span>
+        ${urgentTodos.length > 0 ? `<span class="stat-item stat-urgent">⚡ Dringend: ${urgentTodos.length}</span>` : ''}
+      `);
+      this.patchHtml(this._shell.filters, this.renderUrgencyFilters());
+      this.patchList(displayTodos, persons);
+      this.patchHtml(this._shell.loadMore, hasMore ? `
+        <button class="btn btn-secondary" onclick="this.getRootNode().host.loadMore()">Mehr laden</button>
+      ` : '');
+    } catch (error) {
+      console.error('Error updating card:', error);
+      this._shell = null;
+      this.content.innerHTML = '<p>Fehler beim Laden der ToDos</p>';
+    }
+  }
 
-      html += `
+  renderShell(persons) {
+    this.content.innerHTML = this.getStyles() + `
+      <div class="todo-manager">
+        <div class="todo-header">
+          <div class="stats"></div>
+          <div class="header-actions">
+            <button class="btn btn-secondary" onclick="this.getRootNode().host.openPersonModal()" title="Personen verwalten">
+              👥 Personen
+            </button>
+            <button class="btn btn-primary" onclick="this.getRootNode().host.openModal()">
+              + Neues ToDo
+            </button>
           </div>
         </div>
-        ${this.renderModal(persons)}
-        ${this.renderPersonModal(persons)}
-      `;
+        <div class="filters"></div>
+        <div class="todo-list"></div>
+        <div class="load-more"></div>
+      </div>
+      ${this.renderModal(persons)}
+      ${this.renderPersonModal(persons)}
+    `;
+    this._shell = {
+      stats: this.content.querySelector('.stats'),
+      filters: this.content.querySelector('.filters'),
+      list: this.content.querySelector('.todo-list'),
+      loadMore: this.content.querySelector('.load-more')
+    };
+    this._shellPersons = persons;
+    this._rows = new Map();
+    this.attachEventListeners();
+  }
 
-      this.content.innerHTML = html;
-      this.attachEventListeners();
-    } catch (error) {
-      console.error('Error updating card:', error);
-      this.content.innerHTML = '<p>Fehler beim Laden der ToDos</p>';
+  patchHtml(element, html) {
+    // Skip DOM work if the markup didn't change
+    if (element._html !== html) {
+      element._html = html;
+      element.innerHTML = html;
     }
   }
 
+  patchList(todos, persons) {
+    const list = this._shell.list;
+    if (todos.length === 0) {
+      this._rows = new Map();
+      this.patchHtml(list, '<p class="empty-state">Keine ToDos vorhanden</p>');
+      return;
+    }
+    if (list._html) {
+      list._html = null;
+      list.innerHTML = '';
+    }
+
+    // Rows are keyed by todo id and only rebuilt if the todo object was
+    // replaced by a change or its markup changed, e.g. the hours overdue
+    const rows = new Map();
+    let previous = null;
+    todos.forEach(todo => {
+      let row = this._rows.get(todo.id);
+      const html = this.renderTodoItem(todo, persons);
+      if (!row || row.todo !== todo || row.html !== html) {
+        const element = this.createRow(html, todo, row?.element);
+        row?.element.remove();
+        row = { todo, html, element };
+      }
+      const expected = previous ? previous.nextSibling : list.firstChild;
+      if (row.element !== expected) {
+        list.insertBefore(row.element, expected);
+      }
+      previous = row.element;
+      rows.set(todo.id, row);
+    });
+    this._rows.forEach((row, todoId) => {
+      if (!rows.has(todoId)) row.element.remove();
+    });
+    this._rows = rows;
+  }
+
+  createRow(html, todo, oldElement) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    const element = template.content.firstElementChild;
+    const viewport = element.querySelector('.virtual-items');
+    if (viewport) {
+      // Keep the scroll position of a long list across updates
+      const oldViewport = oldElement?.querySelector('.virtual-items');
+      this.mountVirtualItems(viewport, todo, oldViewport?.scrollTop || 0);
+    }
+    return element;
+  }
+
+  mountVirtualItems(viewport, todo, scrollTop) {
+    // Long lists only render the rows in view, plus some overscan
+    const spacer = viewport.firstElementChild;
+    let first = -1;
+    const render = () => {
+      const start = Math.max(
+        0, Math.floor(viewport.scrollTop / VIRTUAL_ROW_HEIGHT) - VIRTUAL_OVERSCAN
+      );
+      if (start === first) return;
+      first = start;
+      const end = Math.min(
+        todo.items.length,
+        start + VIRTUAL_VISIBLE_ROWS + 2 * VIRTUAL_OVERSCAN
+      );
+      spacer.innerHTML = todo.items.slice(start, end)
+        .map((item, index) => this.renderListItem(todo, item, start + index))
+        .join('');
+    };
+    viewport.addEventListener('scroll', () => requestAnimationFrame(render));
+    viewport.scrollTop = scrollTop;
+    render();
+  }
+
   getStyles() {
     return `
       <style>
@@ -202,6 +481,11 @@ class TodoManagerCard extends HTMLElement {
           flex-direction: column;
           gap: 12px;
         }
+        .load-more {
+          display: flex;
+          justify-content: center;
+          margin-top: 16px;
+        }
         .empty-state {
           text-align: center;
           color: var(--secondary-text-color);
@@ -295,6 +579,19 @@ class TodoManagerCard extends HTMLElement {
           text-decoration: line-through;
           opacity: 0.6;
         }
+        .virtual-items {
+          position: relative;
+          overflow-y: auto;
+          margin-top: 8px;
+        }
+        .virtual-spacer {
+          position: relative;
+        }
+        .virtual-items .todo-item-row {
+          box-sizing: border-box;
+          height: 32px;
+          padding: 0;
+        }
         .result-box {
           margin-top: 12px;
           padding: 12px;
@@ -522,18 +819,18 @@ class TodoManagerCard extends HTMLElement {
     }
 
     let itemsHtml = '';
-    if (todo.items && Array.isArray(todo.items) && todo.items.length > 0) {
+    if (todo.items && Array.isArray(todo.items) && todo.items.length > VIRTUAL_THRESHOLD) {
+      // Rows are filled in by mountVirtualItems
+      const checkedCount = todo.items.filter(item => item.checked).length;
+      itemsHtml = `<div class="todo-items"><strong>Items (${checkedCount}/${todo.items.length}):</strong>
+        <div class="virtual-items" style="height: ${VIRTUAL_VISIBLE_ROWS * VIRTUAL_ROW_HEIGHT}px;">
+          <div class="virtual-spacer" style="height: ${todo.items.length * VIRTUAL_ROW_HEIGHT}px;"></div>
+        </div>
+      </div>`;
+    } else if (todo.items && Array.isArray(todo.items) && todo.items.length > 0) {
       itemsHtml = '<div class="todo-items"><strong>Items:</strong>';
       todo.items.forEach(item => {
-        const checked = item.checked ? 'checked' : '';
-        const checkedClass = item.checked ? 'checked' : '';
-        itemsHtml += `
-          <div class="todo-item-row ${checkedClass}">
-            <input type="checkbox" ${checked}
-              onchange="this.getRootNode().host.toggleItem('${todo.id}', '${item.id}')">
-            <span>${this.escapeHtml(item.name || '')}${item.quantity ? ` (${this.escapeHtml(item.quantity)})` : ''}</span>
-          </div>
-        `;
+        itemsHtml += this.renderListItem(todo, item);
       });
       itemsHtml += '</div>';
     }
@@ -585,6 +882,21 @@ class TodoManagerCard extends HTMLElement {
     `;
   }
 
+  renderListItem(todo, item, index = null) {
+    const checked = item.checked ? 'checked' : '';
+    const checkedClass = item.checked ? 'checked' : '';
+    const position = index === null
+      ? ''
+      : `style="position: absolute; top: ${index * VIRTUAL_ROW_HEIGHT}px; left: 0; right: 0;"`;
+    return `
+      <div class="todo-item-row ${checkedClass}" ${position}>
+        <input type="checkbox" ${checked}
+          onchange="this.getRootNode().host.toggleItem('${todo.id}', '${item.id}')">
+        <span>${this.escapeHtml(item.name || '')}${item.quantity ? ` (${this.escapeHtml(item.quantity)})` : ''}</span>
+      </div>
+    `;
+  }
+
   escapeHtml(text) {
     const div = document.createElement('div');
     div.textContent = text;
@@ -734,6 +1046,8 @@ class TodoManagerCard extends HTMLElement {
 
   openModal(todoId = null) {
     this.editingTodoId = todoId;
+    // revision the form was filled from, the save fails if it changed since
+    this.editingRevision = todoId ? this._todoMap?.get(todoId)?.revision : undefined;
     const modal = this.content.querySelector('#todoModal');
     const title = this.content.querySelector('#modalTitle');
     const form = this.content.querySelector('#todoForm');
@@ -746,10 +1060,7 @@ class TodoManagerCard extends HTMLElement {
     }
 
     if (todoId) {
-      // Load todo data from sensor
-      const activeSensor = this._hass?.states['sensor.todo_manager_active'];
-      const todos = activeSensor?.attributes?.todos || [];
-      const todo = todos.find(t => t.id === todoId);
+      const todo = this._todoMap?.get(todoId);
       
       if (todo) {
         this.populateForm(todo);
@@ -880,11 +1191,11 @@ class TodoManagerCard extends HTMLElement {
       const nameInput = row.querySelector('.item-name');
       const quantityInput = row.querySelector('.item-quantity');
       if (nameInput?.value) {
+        // without a checked state existing items keep the one they have now
         formData.items.push({
           id: nameInput.dataset.itemId,
           name: nameInput.value,
-          quantity: quantityInput?.value || '',
-          checked: false
+          quantity: quantityInput?.value || ''
         });
       }
     });
@@ -902,13 +1213,12 @@ class TodoManagerCard extends HTMLElement {
       const serviceData = this.editingTodoId
         ? { todo_id: this.editingTodoId, ...formData }
         : formData;
+      if (this.editingTodoId && this.editingRevision !== undefined) {
+        serviceData.expected_revision = this.editingRevision;
+      }
 
-      await this._hass.callService('todo_manager', service, serviceData);
+      await this.callService(service, serviceData);
       this.closeModal();
-      // Refresh after a short delay
-      setTimeout(() => {
-        this.updateCard();
-      }, 500);
     } catch (error) {
       console.error('Error saving todo:', error);
       alert('Fehler beim Speichern: ' + (error.message || 'Unbekannter Fehler'));
@@ -918,10 +1228,7 @@ class TodoManagerCard extends HTMLElement {
   async deleteTodo(todoId) {
     if (confirm('ToDo wirklich löschen?')) {
       try {
-        await this._hass.callService('todo_manager', 'delete_todo', { todo_id: todoId });
-        setTimeout(() => {
-          this.updateCard();
-        }, 500);
+        await this.callService('delete_todo', { todo_id: todoId });
       } catch (error) {
         console.error('Error deleting todo:', error);
         alert('Fehler beim Löschen');
@@ -931,10 +1238,7 @@ class TodoManagerCard extends HTMLElement {
 
   async completeTodo(todoId) {
     try {
-      await this._hass.callService('todo_manager', 'complete_todo', { todo_id: todoId });
-      setTimeout(() => {
-        this.updateCard();
-      }, 500);
+      await this.callService('complete_todo', { todo_id: todoId });
     } catch (error) {
       console.error('Error completing todo:', error);
     }
@@ -942,13 +1246,10 @@ class TodoManagerCard extends HTMLElement {
 
   async toggleItem(todoId, itemId) {
     try {
-      await this._hass.callService('todo_manager', 'toggle_item', {
+      await this.callService('toggle_item', {
         todo_id: todoId,
         item_id: itemId
       });
-      setTimeout(() => {
-        this.updateCard();
-      }, 500);
     } catch (error) {
       console.error('Error toggling item:', error);
       alert('Fehler beim Aktualisieren des Items');
@@ -1040,9 +1341,7 @@ class TodoManagerCard extends HTMLElement {
     }
 
     if (personId) {
-      const activeSensor = this._hass?.states['sensor.todo_manager_active'];
-      const persons = activeSensor?.attributes?.persons || [];
-      const person = persons.find(p => p.id === personId);
+      const person = (this._persons || []).find(p => p.id === personId);
       
       if (person) {
         this.content.querySelector('#personName').value = person.name || '';
@@ -1099,12 +1398,9 @@ class TodoManagerCard extends HTMLElement {
         ? { person_id: this.editingPersonId, person_name: name, person_color: color }
         : { person_name: name, person_color: color };
 
-      await this._hass.callService('todo_manager', service, serviceData);
+      await this.callService(service, serviceData);
       this.closePersonEditModal();
       this.closePersonModal();
-      setTimeout(() => {
-        this.updateCard();
-      }, 500);
     } catch (error) {
       console.error('Error saving person:', error);
       alert('Fehler beim Speichern: ' + (error.message || 'Unbekannter Fehler'));
@@ -1114,10 +1410,7 @@ class TodoManagerCard extends HTMLElement {
   async deletePerson(personId) {
     if (confirm('Person wirklich löschen? Alle ToDo-Zuweisungen werden entfernt.')) {
       try {
-        await this._hass.callService('todo_manager', 'delete_person', { person_id: personId });
-        setTimeout(() => {
-          this.updateCard();
-        }, 500);
+        await this.callService('delete_person', { person_id: personId });
       } catch (error) {
         console.error('Error deleting person:', error);
         alert('Fehler beim Löschen');